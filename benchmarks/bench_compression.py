@@ -0,0 +1,50 @@
+"""
+Benchmark throughput and response size of the compression middleware with different compression levels.
+
+Run from the repository root with: python -m benchmarks.bench_compression
+"""
+
+from io import BytesIO
+from timeit import timeit
+
+from jetweb import JetWeb
+from jetweb.middlewares import CompressionMiddleware
+
+NUMBER = 500
+ITEMS = [{"id": index, "name": f"User {index}", "email": f"user{index}@example.com"} for index in range(2000)]
+
+
+def create_app(level: int = None) -> JetWeb:
+    app = JetWeb()
+    if level is not None:
+        app.add_middleware(CompressionMiddleware(level=level))
+
+    @app.get("/users")
+    def get_users() -> list:
+        return ITEMS
+
+    return app
+
+
+def request(app: JetWeb) -> int:
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": "/users",
+        "QUERY_STRING": "",
+        "HTTP_ACCEPT_ENCODING": "gzip",
+        "wsgi.input": BytesIO(),
+    }
+    return sum(map(len, app(environ, lambda status, headers: None)))
+
+
+def main() -> None:
+    for level in (None, 1, 6, 9):
+        app = create_app(level)
+        size = request(app)
+        elapsed = timeit(lambda: request(app), number=NUMBER)
+        name = "none" if level is None else f"level {level}"
+        print(f"{name:>8}: {NUMBER / elapsed:>8.0f} req/s, {size:>7} bytes per response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark per-request context construction depending on the size of global context.
+
+Compares copying global context into a dictionary per request with the layered context, which references it.
+
+Run from the repository root with: python -m benchmarks.bench_context
+"""
+
+from collections import UserDict
+from timeit import timeit
+
+from jetweb import Context, Request
+
+GLOBAL_SIZES = [1, 10, 100, 1000]
+NUMBER = 50_000
+
+
+def handler(request: Request, app: object, service0: int, user_id: int) -> None:
+    pass
+
+
+def copied_request(global_context: dict) -> None:
+    context = UserDict(request=None, app=None, **global_context)
+    context.update({"user_id": 1})
+    {name: context.data[name] for name in ("request", "app", "service0", "user_id") if name in context.data}
+    context.clear()
+
+
+def layered_request(global_context: dict) -> None:
+    context = Context(global_context, request=None, app=None)
+    context.update({"user_id": 1})
+    context.params_for(handler)
+    context.clear()
+
+
+def main() -> None:
+    print(f"{'global values':>14} {'copied':>10} {'layered':>10}")
+    for size in GLOBAL_SIZES:
+        global_context = {f"service{index}": index for index in range(size)}
+        copied = timeit(lambda: copied_request(global_context), number=NUMBER) / NUMBER
+        layered = timeit(lambda: layered_request(global_context), number=NUMBER) / NUMBER
+        print(f"{size:>14} {copied * 1e6:>8.2f}us {layered * 1e6:>8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
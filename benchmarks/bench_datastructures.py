@@ -0,0 +1,71 @@
+"""
+Benchmark CaseInsensitiveDict against the previous UserDict-based implementation on header-heavy requests.
+
+Run from the repository root with: python -m benchmarks.bench_datastructures
+"""
+
+from collections import UserDict
+from timeit import timeit
+
+from jetweb.utils import parse_headers
+
+NUMBER = 100_000
+
+
+class UserDictCaseInsensitiveDict(UserDict):
+    def __getitem__(self, key: str) -> str:
+        return super().__getitem__(key.lower())
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key.lower(), value)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key.lower())
+
+
+def parse_headers_with_user_dict(environ: dict) -> UserDictCaseInsensitiveDict:
+    filtered_headers = filter(
+        lambda item: item[0].startswith("HTTP_") or item[0] in ("CONTENT_TYPE", "CONTENT_LENGTH"),
+        environ.items(),
+    )
+    formatted_headers = map(
+        lambda item: ("-".join(item[0].replace("HTTP_", "").split("_")), item[1]),
+        filtered_headers,
+    )
+    return UserDictCaseInsensitiveDict(formatted_headers)
+
+
+ENVIRON = {
+    "REQUEST_METHOD": "GET",
+    "PATH_INFO": "/",
+    "CONTENT_TYPE": "application/json",
+    "HTTP_HOST": "example.com",
+    "HTTP_ACCEPT": "application/json",
+    "HTTP_AUTHORIZATION": "Bearer token",
+    **{f"HTTP_X_CUSTOM_HEADER_{index}": "value" for index in range(30)},
+    **{f"SERVER_VAR_{index}": "value" for index in range(20)},
+}
+LOOKUPS = ("Host", "accept", "Authorization", "X-Custom-Header-10", "content-type")
+
+
+def lookup(headers: dict) -> None:
+    for name in LOOKUPS:
+        headers[name]
+        headers.get(name)
+
+
+def main() -> None:
+    results = {
+        "UserDict": timeit(lambda: lookup(parse_headers_with_user_dict(ENVIRON)), number=NUMBER),
+        "dict": timeit(lambda: lookup(parse_headers(ENVIRON)), number=NUMBER),
+    }
+    for name, elapsed in results.items():
+        print(f"{name:>8}: {elapsed / NUMBER * 1e6:.2f} us per request (parse + {len(LOOKUPS) * 2} lookups)")
+
+    for name, headers in (("UserDict", parse_headers_with_user_dict(ENVIRON)), ("dict", parse_headers(ENVIRON))):
+        elapsed = timeit(lambda: lookup(headers), number=NUMBER * 10)
+        print(f"{name:>8}: {elapsed / NUMBER / 10 * 1e9:.0f} ns per {len(LOOKUPS) * 2} lookups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark requests failing with a domain exception through the WSGI entry point of a debug app.
+
+Compares an exception class handler, resolved through the cached MRO lookup, to a status 500 handler,
+which receives the converted exception with its traceback formatted lazily, and to eager traceback formatting.
+
+Run from the repository root with: python -m benchmarks.bench_exception_handlers
+"""
+
+from timeit import timeit
+from typing import Callable
+
+from jetweb import HTTPException, JetWeb
+from jetweb.utils import format_exception
+
+NUMBER = 20_000
+
+
+class DomainError(Exception):
+    pass
+
+
+class NotFoundError(DomainError):
+    pass
+
+
+class UserNotFoundError(NotFoundError):
+    pass
+
+
+def fail(depth: int) -> None:
+    if depth:
+        fail(depth - 1)
+    raise UserNotFoundError("User was not found")
+
+
+def create_app() -> JetWeb:
+    app = JetWeb(debug=True)
+    app.add_route("/users/{user_id:int}", lambda: fail(10))
+    return app
+
+
+def create_wsgi_environ(endpoint: str) -> dict:
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": endpoint,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "8000",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.url_scheme": "http",
+    }
+
+
+def start_response(status: str, headers: list) -> None:
+    pass
+
+
+def request(app: Callable, environ: dict) -> None:
+    for _ in app(dict(environ), start_response):
+        pass
+
+
+def main() -> None:
+    class_app = create_app()
+    class_app.exception_handler(NotFoundError)(lambda: HTTPException(status=404))
+
+    status_app = create_app()
+    status_app.exception_handler(500)(lambda: HTTPException(status=404))
+
+    eager_app = create_app()
+    eager_app.exception_handler(500)(lambda exception: HTTPException(status=404, content=str(exception.content)))
+
+    environ = create_wsgi_environ("/users/1")
+    print(f"{'class handler':>16} {'500 handler':>16} {'formatted':>16}")
+    timings = [
+        timeit(lambda app=app: request(app, environ), number=NUMBER) / NUMBER
+        for app in (class_app, status_app, eager_app)
+    ]
+    print("".join(f" {timing * 1e6:>13.2f}us" for timing in timings))
+
+    try:
+        fail(10)
+    except UserNotFoundError as exception:
+        error = exception
+    formatting = timeit(lambda: format_exception(error), number=NUMBER) / NUMBER
+    print(f"traceback formatting alone: {formatting * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark the overhead of request timing through the WSGI entry point.
+
+Run from the repository root with: python -m benchmarks.bench_instrumentation
+"""
+
+from timeit import timeit
+from typing import Callable
+
+from jetweb import Instrumentation, JetWeb
+
+NUMBER = 50_000
+
+
+def create_app(instrumentation: Instrumentation = None, middlewares: int = 0) -> JetWeb:
+    app = JetWeb(instrumentation=instrumentation)
+    for _ in range(middlewares):
+        app.add_middleware(lambda next_handler: next_handler())
+    app.add_route("/users/{user_id:int}", lambda user_id: {"id": user_id, "name": "John"})
+    return app
+
+
+def create_environ() -> dict:
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": "/users/1",
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "8000",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.url_scheme": "http",
+    }
+
+
+def start_response(status: str, headers: list) -> None:
+    pass
+
+
+def call(app: Callable, environ: dict) -> None:
+    for _ in app(dict(environ), start_response):
+        pass
+
+
+def main() -> None:
+    environ = create_environ()
+    print(f"{'middlewares':>12} {'disabled':>12} {'header':>12} {'sink':>12}")
+    for middlewares in [0, 3]:
+        apps = [
+            create_app(None, middlewares),
+            create_app(Instrumentation(), middlewares),
+            create_app(Instrumentation(server_timing=False, sink=lambda request, timings: None), middlewares),
+        ]
+        timings = [timeit(lambda app=app: call(app, environ), number=NUMBER) / NUMBER for app in apps]
+        print(f"{middlewares:>12}" + "".join(f" {timing * 1e6:>10.2f}us" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
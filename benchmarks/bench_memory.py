@@ -0,0 +1,79 @@
+"""
+Benchmark memory allocated per in-flight request by request and response objects, with and without slots.
+
+Run from the repository root with: python -m benchmarks.bench_memory
+"""
+
+import tracemalloc
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Callable
+
+from jetweb import HTTPException, Request, Response
+
+NUMBER = 10_000
+
+
+@dataclass
+class DictRequest:
+    method: str
+    endpoint: str
+    query_params: dict
+    headers: dict
+    body: bytes
+    environ: dict = field(default=None, repr=False, compare=False)
+    max_body_size: int = field(default=None, repr=False, compare=False)
+    spool_threshold: int = field(default=1024 * 1024, repr=False, compare=False)
+
+
+@dataclass
+class DictResponse:
+    headers: dict = field(default_factory=dict)
+    content: Any = ""
+    status: int = 200
+    content_type: str = None
+
+    def __post_init__(self):
+        self.content_type = self.content_type or "text/plain"
+        self.headers["Content-Type"] = self.content_type
+        self.reason = HTTPStatus(self.status).phrase
+
+
+@dataclass
+class DictHTTPException(DictResponse, Exception):  # noqa: N818
+    status: int = 400
+
+
+def measure(create: Callable[[int], object]) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create(index) for index in range(NUMBER)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return allocated / NUMBER
+
+
+def main() -> None:
+    environ = {"REQUEST_METHOD": "GET", "PATH_INFO": "/users/1", "QUERY_STRING": ""}
+    cases = {
+        "request": (
+            lambda index: DictRequest("GET", "/users/1", None, None, None, environ),
+            lambda index: Request.from_environ(environ),
+        ),
+        "response": (
+            lambda index: DictResponse(content="Hello"),
+            lambda index: Response(content="Hello"),
+        ),
+        "exception": (
+            lambda index: DictHTTPException(status=404),
+            lambda index: HTTPException(status=404),
+        ),
+    }
+    for name, (create_before, create_after) in cases.items():
+        before, after = measure(create_before), measure(create_after)
+        print(f"{name:>9}: {before:>6.0f} -> {after:>6.0f} bytes per object ({after / before - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    main()
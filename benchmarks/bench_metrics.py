@@ -0,0 +1,66 @@
+"""
+Benchmark the per-request cost of the metrics middleware through the WSGI entry point.
+
+Run from the repository root with: python -m benchmarks.bench_metrics
+"""
+
+import tempfile
+from timeit import timeit
+from typing import Callable
+
+from jetweb import JetWeb
+from jetweb.middlewares import MetricsMiddleware
+
+NUMBER = 50_000
+
+
+def create_app(middleware: Callable) -> JetWeb:
+    app = JetWeb()
+    app.add_middleware(middleware)
+    app.add_route("/users/{user_id:int}", lambda user_id: {"id": user_id, "name": "John"})
+    return app
+
+
+def create_environ(user_id: int) -> dict:
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": f"/users/{user_id}",
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "8000",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.url_scheme": "http",
+    }
+
+
+def start_response(status: str, headers: list) -> None:
+    pass
+
+
+def call(app: Callable, environs: list) -> None:
+    for environ in environs:
+        for _ in app(dict(environ), start_response):
+            pass
+
+
+def main() -> None:
+    environs = [create_environ(user_id) for user_id in range(100)]
+    number = NUMBER // len(environs)
+    with tempfile.TemporaryDirectory() as directory:
+        apps = {
+            "no-op middleware": create_app(lambda next_handler: next_handler()),
+            "metrics": create_app(MetricsMiddleware()),
+            "metrics, directory": create_app(MetricsMiddleware(directory=directory)),
+        }
+        for name, app in apps.items():
+            elapsed = timeit(lambda app=app: call(app, environs), number=number) / (number * len(environs))
+            print(f"{name:>20} {elapsed * 1e6:>8.2f}us")
+
+        metrics = apps["metrics"].middlewares[0]
+        series = len(metrics.collect())
+        render = timeit(metrics.render, number=100) / 100
+        print(f"{'render':>20} {render * 1e6:>8.2f}us ({series} series for {len(environs)} endpoints)")
+
+
+if __name__ == "__main__":
+    main()
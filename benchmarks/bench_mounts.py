@@ -0,0 +1,55 @@
+"""
+Benchmark building and route lookup of a modular app with included and mounted routers.
+
+Run from the repository root with: python -m benchmarks.bench_mounts
+"""
+
+from time import perf_counter
+from timeit import timeit
+
+from jetweb import JetWeb, Router
+
+MODULES = [10, 100, 500]
+ROUTES_PER_MODULE = 20
+NUMBER = 20_000
+
+
+def handler() -> None:
+    pass
+
+
+def create_app(modules: int, mount: bool) -> JetWeb:
+    app = JetWeb()
+    api = Router("/api")
+    for module in range(modules):
+        router = Router(f"/module{module}")
+        for index in range(ROUTES_PER_MODULE):
+            router.add_route(f"/items{index}/{{item_id:int}}", handler)
+        api.include(router, mount=mount)
+    app.include(api, mount=mount)
+    return app
+
+
+def main() -> None:
+    print(f"{'routes':>8} {'include':>10} {'mount':>10} {'lookup':>12} {'mounted lookup':>16}")
+    for modules in MODULES:
+        apps = []
+        build_times = []
+        for mount in (False, True):
+            started = perf_counter()
+            apps.append(create_app(modules, mount))
+            build_times.append(perf_counter() - started)
+
+        endpoint = f"/api/module{modules - 1}/items{ROUTES_PER_MODULE - 1}/1"
+        lookups = [
+            timeit(lambda app=app: app.route_table.match_route(endpoint, "GET"), number=NUMBER) / NUMBER
+            for app in apps
+        ]
+        print(
+            f"{modules * ROUTES_PER_MODULE:>8} {build_times[0] * 1e3:>8.1f}ms {build_times[1] * 1e3:>8.1f}ms"
+            f" {lookups[0] * 1e6:>10.2f}us {lookups[1] * 1e6:>14.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark a flood of requests to missing endpoints through the WSGI entry point.
+
+Compares the pre-encoded 404/405 responses sent without raising exceptions to the regular path,
+which is taken when a middleware or a 404 exception handler is registered.
+
+Run from the repository root with: python -m benchmarks.bench_not_found
+"""
+
+from timeit import timeit
+from typing import Callable
+
+from jetweb import JetWeb
+
+NUMBER = 50_000
+ROUTE_COUNT = 100
+
+
+def create_app() -> JetWeb:
+    app = JetWeb()
+    for index in range(ROUTE_COUNT):
+        app.add_route(f"/api/v1/resource{index}/items/{{id:int}}", lambda: "item")
+    return app
+
+
+def create_wsgi_environ(method: str, endpoint: str) -> dict:
+    return {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": endpoint,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "8000",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_USER_AGENT": "scanner",
+        "wsgi.url_scheme": "http",
+    }
+
+
+def start_response(status: str, headers: list) -> None:
+    pass
+
+
+def flood(app: Callable, environ: dict) -> None:
+    for _ in app(dict(environ), start_response):
+        pass
+
+
+def main() -> None:
+    plain_app = create_app()
+
+    middleware_app = create_app()
+    middleware_app.add_middleware(lambda next_handler: next_handler())
+
+    handler_app = create_app()
+    handler_app.exception_handler(404)(lambda exception: exception)
+
+    print(f"{'request':>20} {'fast path':>12} {'middleware':>12} {'404 handler':>12}")
+    for name, method, endpoint in [
+        ("404 /wp-login.php", "GET", "/wp-login.php"),
+        ("404 deep", "GET", "/api/v1/resource99/missing/.env"),
+        ("405", "POST", "/api/v1/resource99/items/1"),
+    ]:
+        environ = create_wsgi_environ(method, endpoint)
+        timings = [
+            timeit(lambda app=app: flood(app, environ), number=NUMBER) / NUMBER
+            for app in (plain_app, middleware_app, handler_app)
+        ]
+        print(f"{name:>20}" + "".join(f" {timing * 1e6:>10.2f}us" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
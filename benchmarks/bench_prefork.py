@@ -0,0 +1,93 @@
+"""
+Benchmark throughput of the prefork server with different numbers of workers.
+
+Load is generated by more client processes than workers over keep-alive connections.
+Idle connections are polled by workers instead of holding a thread, so every client is served:
+the slowest and the fastest client are reported next to throughput, which grows with workers
+as long as client processes leave free cores.
+
+Run from the repository root with: python -m benchmarks.bench_prefork
+"""
+
+import os
+import signal
+import socket
+import time
+from http.client import HTTPConnection
+from multiprocessing import get_context
+
+from jetweb import JetWeb
+from jetweb.server import PreforkServer
+
+DURATION = 3.0
+CLIENTS = 2 * max(4, os.cpu_count() or 1)
+
+app = JetWeb()
+
+
+@app.get("/users/{user_id:int}")
+def get_user(user_id: int) -> dict:
+    return {"id": user_id, "name": "John", "scores": list(range(20))}
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_client(port: int, deadline: float, results: object) -> None:
+    connection = HTTPConnection("127.0.0.1", port)
+    requests = 0
+    while time.monotonic() < deadline:
+        connection.request("GET", f"/users/{requests}")
+        connection.getresponse().read()
+        requests += 1
+    connection.close()
+    results.put(requests)
+
+
+def measure(workers: int) -> list[int]:
+    context = get_context("fork")
+    port = get_free_port()
+    server = context.Process(
+        target=PreforkServer(app, host="127.0.0.1", port=port, workers=workers, graceful_timeout=1).serve_forever
+    )
+    server.start()
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    time.sleep(0.5)
+
+    results = context.Queue()
+    deadline = time.monotonic() + DURATION
+    clients = [context.Process(target=run_client, args=(port, deadline, results)) for _ in range(CLIENTS)]
+    for client in clients:
+        client.start()
+    requests = [results.get() for _ in clients]
+    for client in clients:
+        client.join()
+
+    os.kill(server.pid, signal.SIGTERM)
+    server.join()
+    return requests
+
+
+def main() -> None:
+    baseline = None
+    print(f"{CLIENTS} clients")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        requests = measure(workers)
+        throughput = sum(requests) / DURATION
+        baseline = baseline or throughput
+        print(
+            f"{workers:>3} workers: {throughput:>10.0f} req/s ({throughput / baseline:.2f}x),"
+            f" requests per client {min(requests)}..{max(requests)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark request construction with eager and lazy parsing.
+
+Run from the repository root with: python -m benchmarks.bench_request
+"""
+
+from io import BytesIO
+from timeit import timeit
+
+from jetweb import JetWeb, Request
+
+NUMBER = 50_000
+
+
+def create_environ(endpoint: str) -> dict:
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": endpoint,
+        "QUERY_STRING": "page=1&size=20&sort=name",
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": "1024",
+        "wsgi.input": BytesIO(b"x" * 1024),
+        **{f"HTTP_X_HEADER_{index}": "value" for index in range(20)},
+        **{f"SERVER_VAR_{index}": "value" for index in range(20)},
+    }
+    return environ
+
+
+def start_response(status: str, headers: list) -> None:
+    pass
+
+
+def main() -> None:
+    app = JetWeb()
+
+    @app.post("/headers")
+    def handle_headers(request: Request) -> str:
+        return request.headers["x-header-0"]
+
+    for name, endpoint in [("404", "/missing"), ("header-only", "/headers")]:
+        for lazy in (False, True):
+            def call() -> None:
+                environ = create_environ(endpoint)
+                request = Request.from_environ(environ, lazy=lazy)
+                if endpoint == "/headers":
+                    request.headers["x-header-0"]
+
+            duration = timeit(call, number=NUMBER) / NUMBER
+            print(f"{name:>12} request, lazy={lazy!s:<5}: {duration * 1e6:.2f}us")
+
+    for name, endpoint in [("404", "/missing"), ("header-only", "/headers")]:
+        duration = timeit(lambda: app(create_environ(endpoint), start_response), number=NUMBER) / NUMBER
+        print(f"{name:>12} app call:              {duration * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    main()
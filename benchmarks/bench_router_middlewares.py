@@ -0,0 +1,67 @@
+"""
+Benchmark requests to a public route while a heavy middleware is registered on another router.
+
+Compares router middlewares, attached to routes of their router, with the same middleware registered on the app.
+
+Run from the repository root with: python -m benchmarks.bench_router_middlewares
+"""
+
+from hashlib import sha256
+from timeit import timeit
+from typing import Callable
+
+from jetweb import JetWeb, Router
+
+NUMBER = 20_000
+
+
+def heavy_middleware(next_handler: Callable) -> object:
+    sha256(b"x" * 64 * 1024).digest()
+    return next_handler()
+
+
+def create_app(scoped: bool) -> JetWeb:
+    app = JetWeb()
+    admin = Router("/admin")
+    admin.add_route("/stats", lambda: {"requests": 1})
+    if scoped:
+        admin.add_middleware(heavy_middleware)
+    else:
+        app.add_middleware(heavy_middleware)
+    app.include(admin)
+    app.add_route("/public", lambda: {"status": "ok"})
+    return app
+
+
+def create_environ(endpoint: str) -> dict:
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": endpoint,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "8000",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.url_scheme": "http",
+    }
+
+
+def start_response(status: str, headers: list) -> None:
+    pass
+
+
+def call(app: Callable, environ: dict) -> None:
+    for _ in app(dict(environ), start_response):
+        pass
+
+
+def main() -> None:
+    print(f"{'endpoint':>10} {'app middleware':>16} {'router middleware':>18}")
+    apps = [create_app(scoped=False), create_app(scoped=True)]
+    for endpoint in ["/public", "/admin/stats"]:
+        environ = create_environ(endpoint)
+        timings = [timeit(lambda app=app: call(app, environ), number=NUMBER) / NUMBER for app in apps]
+        print(f"{endpoint:>10} {timings[0] * 1e6:>14.2f}us {timings[1] * 1e6:>16.2f}us")
+
+
+if __name__ == "__main__":
+    main()
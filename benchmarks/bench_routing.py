@@ -0,0 +1,59 @@
+"""
+Benchmark route lookup cost depending on the number of registered routes.
+
+Run from the repository root with: python -m benchmarks.bench_routing
+"""
+
+from timeit import timeit
+
+from jetweb import HTTPException
+from jetweb.routing import RouteTable
+
+ROUTE_COUNTS = [10, 100, 1000, 5000]
+NUMBER = 20_000
+
+
+def handler() -> None:
+    pass
+
+
+def create_route_table(count: int) -> RouteTable:
+    route_table = RouteTable()
+    for index in range(count):
+        route_table.add_route(f"/api/v1/resource{index}", "/items/{id:int}", handler)
+        route_table.add_route(f"/api/v1/resource{index}", "/status", handler)
+    return route_table
+
+
+def find_linear(route_table: RouteTable, endpoint: str, method: str) -> None:
+    for route in route_table.routes:
+        matched, _ = route.match_endpoint(endpoint)
+        if matched:
+            route.match_method(method)
+            return
+
+
+def find_handler(route_table: RouteTable, endpoint: str, method: str) -> None:
+    try:
+        route_table.find_handler(endpoint, method)
+    except HTTPException:
+        pass
+
+
+def main() -> None:
+    print(f"{'routes':>8} {'lookup':>10} {'linear':>12} {'tree':>10}")
+    for count in ROUTE_COUNTS:
+        route_table = create_route_table(count)
+        for name, endpoint in [
+            ("static", f"/api/v1/resource{count - 1}/status"),
+            ("dynamic", f"/api/v1/resource{count - 1}/items/1"),
+            ("404", "/missing/endpoint"),
+        ]:
+            linear = timeit(lambda: find_linear(route_table, endpoint, "GET"), number=NUMBER // count or 1)
+            linear_per_call = linear / (NUMBER // count or 1)
+            tree = timeit(lambda: find_handler(route_table, endpoint, "GET"), number=NUMBER) / NUMBER
+            print(f"{count:>8} {name:>10} {linear_per_call * 1e6:>10.2f}us {tree * 1e6:>8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
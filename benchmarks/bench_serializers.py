@@ -0,0 +1,37 @@
+"""
+Benchmark response body serialization with the default and compact JSON encoders.
+
+Run from the repository root with: python -m benchmarks.bench_serializers
+"""
+
+from json import dumps
+from timeit import timeit
+
+from jetweb import JSONSerializer, Response
+
+NUMBER = 20_000
+PAYLOADS = {
+    "small": {"status": "ok", "id": 1},
+    "medium": {"items": [{"id": index, "name": f"Item {index}", "tags": ["a", "b"]} for index in range(50)]},
+    "large": {"items": [{"id": index, "name": f"Item {index}", "price": index * 1.5} for index in range(1000)]},
+}
+
+
+def main() -> None:
+    serializer = JSONSerializer()
+    print(f"{'payload':>10} {'json.dumps':>12} {'serializer':>12} {'Response':>12} {'bytes':>10}")
+    for name, payload in PAYLOADS.items():
+        number = NUMBER // len(str(payload)) * 100 or 1
+        default = timeit(lambda: dumps(payload).encode(), number=number) / number
+        compact = timeit(lambda: serializer.serialize(payload), number=number) / number
+        response = timeit(lambda: Response(content=payload).body, number=number) / number
+        encoded = serializer.serialize(payload)
+        raw = timeit(lambda: Response(content=encoded).body, number=number) / number
+        print(
+            f"{name:>10} {default * 1e6:>10.2f}us {compact * 1e6:>10.2f}us"
+            f" {response * 1e6:>10.2f}us {raw * 1e6:>8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,30 @@
-from .application import JetWeb
-from .context import Context
-from .converters import BaseConverter, converter
-from .exceptions import HTTPException
-from .handlers import BaseHandler
-from .http import Request, Response
-from .routing import Router
-from .utils import CaseInsensitiveDict
-
-__all__ = [
-    "JetWeb",
-    "Context",
-    "BaseConverter",
-    "converter",
-    "HTTPException",
-    "BaseHandler",
-    "Request",
-    "Response",
-    "Router",
-    "CaseInsensitiveDict",
-]
+from .application import JetWeb
+from .context import Context
+from .converters import BaseConverter, converter
+from .exceptions import HTTPException
+from .handlers import BaseHandler
+from .http import FileResponse, Request, Response, StreamingResponse
+from .instrumentation import Instrumentation, Timings
+from .routing import Router
+from .serializers import JSONSerializer, Serializer, SerializerRegistry
+from .utils import CaseInsensitiveDict
+
+__all__ = [
+    "JetWeb",
+    "Context",
+    "BaseConverter",
+    "converter",
+    "HTTPException",
+    "BaseHandler",
+    "Instrumentation",
+    "Timings",
+    "Request",
+    "Response",
+    "StreamingResponse",
+    "FileResponse",
+    "Router",
+    "Serializer",
+    "JSONSerializer",
+    "SerializerRegistry",
+    "CaseInsensitiveDict",
+]
@@ -1,116 +1,587 @@
-"""
-Provides central WSGI application.
-"""
-
-import sys
-from typing import Callable, Iterable
-from wsgiref.simple_server import make_server
-
-from .context import Context
-from .exceptions import HTTPException
-from .http import Request, Response
-from .routing import Router
-
-
-class JetWeb(Router):
-    """
-    Main application class, built on top of Router.
-
-    Handles incoming WSGI requests, applies middlewares, dispatches routes,
-    and manages exception handling. Provides a simple development server runner.
-
-    :param prefix: Optional URL prefix for all routes.
-    :param debug: Enables detailed exception output in responses if True.
-    :param global_context: Context values for each request.
-    """
-
-    def __init__(self, prefix: str = None, debug: bool = False, global_context: dict = None):
-        super().__init__(prefix=prefix)
-        self.debug = debug
-        self.global_context = global_context or {}
-
-    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
-        """
-        WSGI entry point for handling a request.
-
-        :param environ: WSGI environment dictionary.
-        :param start_response: WSGI callback to start the HTTP response.
-        :returns: Response body as an iterable of bytes.
-        """
-        request = Request.from_environ(environ)
-        context = Context(request=request, app=self, **self.global_context)
-        try:
-            response = self.proceed_middlewares(context)
-        except BaseException as exception:
-            response = self.handle_exception(exception, context)
-
-        context.clear()
-        start_response(f"{response.status} {response.reason}", list(response.headers.items()))
-        return [response.body]
-
-    def run(self, host: str = "0.0.0.0", port: int = 8000) -> None:
-        """
-        Start a simple development WSGI server.
-
-        :param host: Host address to bind to.
-        :param port: Port number to listen on.
-        """
-        with make_server(host=host, port=port, app=self) as server:
-            print(f"Running on http://{host}:{port}/", file=sys.stderr)
-            print("Do not use this server in production", file=sys.stderr)
-            server.serve_forever()
-
-    def proceed_middlewares(self, context: Context) -> Response:
-        """
-        Apply middlewares sequentially and resolve the final response.
-
-        :param context: Context values for current request.
-        :returns: Response object.
-        """
-        def wrap(middleware: Callable, next_handler: Callable) -> Callable:
-            def handler() -> Response:
-                return Response.ensure_response(middleware(next_handler, **context.params_for(middleware)))
-            return handler
-
-        next_handler = None
-        for middleware in reversed(self.middlewares + [self.handle_request]):
-            next_handler = wrap(middleware, next_handler)
-
-        return next_handler()
-
-    def handle_request(self, next_handler: Callable, context: Context) -> Response:
-        """
-        Resolve the request handler for the given endpoint and method.
-
-        :param next_handler: Not used, required for middleware signature.
-        :param context: Context values for current request.
-        :returns: Response object.
-        """
-        request = context["request"]
-        handler, path_params = self.route_table.find_handler(request.endpoint, request.method)
-        context.update(**path_params)
-        return handler(**context.params_for(handler))
-
-    def handle_exception(self, exception: BaseException, context: Context) -> Response:
-        """
-        Convert an exception into a proper HTTP response.
-
-        :param exception: The raised exception.
-        :param context: Context values for current request.
-        :returns: Response object.
-        """
-        http_exception = HTTPException.from_exception(exception, catch_traceback=self.debug)
-        context.update(exception=http_exception)
-
-        exception_handler = self.exception_handlers.get(http_exception.status)
-        if not exception_handler:
-            return http_exception
-
-        try:
-            return Response.ensure_response(
-                exception_handler(**context.params_for(exception_handler))
-            )
-        except BaseException as inner_exception:
-            combined_exception = inner_exception.with_traceback(inner_exception.__traceback__)
-            combined_exception.__cause__ = exception
-            return HTTPException.from_exception(combined_exception, catch_traceback=self.debug)
+"""
+Provides central WSGI and ASGI application.
+"""
+
+import logging
+import sys
+from tempfile import SpooledTemporaryFile
+from typing import IO, Callable, Iterable, Union
+from wsgiref.simple_server import make_server
+
+from .context import Context
+from .exceptions import HTTPException, encode_http_exception
+from .http import FileResponse, Request, Response, StreamingResponse
+from .http.request import SPOOL_THRESHOLD
+from .http.response import RAW_CONTENT_TYPES
+from .http.status import get_status_line
+from .instrumentation import Instrumentation, Timings
+from .pipeline import compile_async_pipeline, compile_pipeline
+from .routing import Route, Router
+from .serializers import JSON_CONTENT_TYPE, SerializerRegistry
+from .server import EventLoopServer, PreforkServer
+from .utils import ClosingIterable, add_vary, create_environ, encode_headers, read_first_chunk, run_sync
+
+logger = logging.getLogger(__name__)
+
+
+class JetWeb(Router):
+    """
+    Main application class, built on top of Router.
+
+    Handles incoming WSGI requests, applies middlewares, dispatches routes,
+    and manages exception handling. Provides a simple development server runner.
+    ASGI servers can serve the application through its `asgi` entry point.
+
+    :param prefix: Optional URL prefix for all routes.
+    :param debug: Enables detailed exception output in responses if True.
+    :param global_context: Context values for each request.
+    :param max_body_size: Maximum allowed request body size in bytes, unlimited if None.
+    :param spool_threshold: Request body size in bytes above which `request.file` is spooled to disk.
+    :param serializers: Serializers of response content, negotiated by Accept header (default: compact JSON only).
+    :param instrumentation: Timing of request handling stages, disabled if None.
+    """
+
+    def __init__(
+        self,
+        prefix: str = None,
+        debug: bool = False,
+        global_context: dict = None,
+        max_body_size: int = None,
+        spool_threshold: int = SPOOL_THRESHOLD,
+        serializers: SerializerRegistry = None,
+        instrumentation: Instrumentation = None,
+    ):
+        super().__init__(prefix=prefix)
+        self.debug = debug
+        self.global_context = global_context or {}
+        self.max_body_size = max_body_size
+        self.spool_threshold = spool_threshold
+        self.serializers = serializers if serializers is not None else SerializerRegistry()
+        self.instrumentation = instrumentation
+        self._pipeline = None
+        self._async_pipeline = None
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        """
+        WSGI entry point for handling a request.
+
+        :param environ: WSGI environment dictionary.
+        :param start_response: WSGI callback to start the HTTP response.
+        :returns: Response body as an iterable of bytes.
+        """
+        timings = Timings() if self.instrumentation is not None else None
+        request = Request.from_environ(
+            environ, max_body_size=self.max_body_size, spool_threshold=self.spool_threshold
+        )
+        route, path_params, status = self.match_request(request)
+        if status is not None:
+            error = encode_http_exception(status)
+            start_response(error.status_line, list(error.headers))
+            return [error.body]
+
+        context = Context(self.global_context, providers=self.providers, request=request, app=self)
+        if route is not None:
+            context["route"] = route
+            context.update(path_params)
+        if timings is not None:
+            context["timings"] = timings
+        try:
+            response = self.proceed_middlewares(context)
+            if timings is not None:
+                timings.next("body")
+            body = response.iter_body(environ.get("wsgi.file_wrapper"))
+        except BaseException as exception:
+            if timings is not None:
+                timings.next("exception")
+            response = self.handle_exception(exception, context)
+            try:
+                body = response.iter_body()
+            except Exception:
+                logger.exception("Rendering error response failed")
+                response = HTTPException(status=500)
+                body = response.iter_body()
+
+        if timings is not None:
+            self.instrumentation.finish(request, timings, response.headers)
+        start_response(get_status_line(response.status, response.reason), list(response.headers.items()))
+        if isinstance(response, StreamingResponse):
+            return ClosingIterable(body, lambda: self.finish_request(context, request))
+        self.finish_request(context, request)
+        return body
+
+    async def asgi(self, scope: dict, receive: Callable, send: Callable) -> None:
+        """
+        ASGI entry point for handling a request.
+
+        Supports async handlers, middlewares and exception handlers; sync ones run in the thread pool.
+        Request body is received before the middlewares run, limited by the maximum body size of the route it matches,
+        and is spooled to disk above `spool_threshold`.
+
+        :param scope: ASGI connection scope.
+        :param receive: ASGI callable to receive events.
+        :param send: ASGI callable to send events.
+        :raises ValueError: If scope type is not supported.
+        """
+        if scope["type"] == "lifespan":
+            return await self.handle_lifespan(receive, send)
+        if scope["type"] != "http":
+            raise ValueError("Scope type must be http or lifespan")
+
+        timings = Timings() if self.instrumentation is not None else None
+        readable = SpooledTemporaryFile(max_size=self.spool_threshold)
+        environ = create_environ(scope, readable)
+        request = Request.from_environ(
+            environ, max_body_size=self.max_body_size, spool_threshold=self.spool_threshold
+        )
+        route, path_params, status = self.match_request(request)
+        if status is not None:
+            readable.close()
+            error = encode_http_exception(status)
+            await send({"type": "http.response.start", "status": error.status, "headers": list(error.asgi_headers)})
+            await send({"type": "http.response.body", "body": error.body, "more_body": False})
+            return
+
+        context = Context(self.global_context, providers=self.providers, request=request, app=self)
+        if route is not None:
+            context["route"] = route
+            context.update(path_params)
+        if timings is not None:
+            context["timings"] = timings
+            timings.enter("receive")
+        try:
+            body_route = route or self.route_table.match_route(request.endpoint, request.method)[0]
+            if body_route is not None and body_route.max_body_size is not None:
+                request.max_body_size = body_route.max_body_size
+            await self.receive_body(receive, readable, request)
+            if timings is not None:
+                timings.exit()
+            response = await self.proceed_middlewares_async(context)
+            if timings is not None:
+                timings.next("body")
+            body = response.aiter_body()
+            first_chunk = await read_first_chunk(body)
+        except Exception as exception:
+            if timings is not None:
+                timings.next("exception")
+            response = await self.handle_exception_async(exception, context)
+            try:
+                body = response.aiter_body()
+                first_chunk = await read_first_chunk(body)
+            except Exception:
+                logger.exception("Rendering error response failed")
+                response = HTTPException(status=500)
+                body = response.aiter_body()
+                first_chunk = await read_first_chunk(body)
+
+        if timings is not None:
+            self.instrumentation.finish(request, timings, response.headers)
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status,
+                "headers": encode_headers(response.headers),
+            })
+            await send({"type": "http.response.body", "body": first_chunk, "more_body": True})
+            async for chunk in body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            if context.teardowns:
+                await run_sync(self.finish_request, context, request)
+            else:
+                self.finish_request(context, request)
+            readable.close()
+
+    async def handle_lifespan(self, receive: Callable, send: Callable) -> None:
+        """
+        Acknowledge ASGI lifespan startup and shutdown events, tearing down app-scoped providers on shutdown.
+
+        :param receive: ASGI callable to receive events.
+        :param send: ASGI callable to send events.
+        """
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await run_sync(self.close)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def receive_body(self, receive: Callable, readable: IO[bytes], request: Request) -> None:
+        """
+        Receive ASGI request body into a file-like object.
+
+        :param receive: ASGI callable to receive events.
+        :param readable: File-like object for received body.
+        :param request: Current request, its maximum body size limits received data.
+        :raises HTTPException(413): If body size exceeds maximum body size.
+        """
+        request.limit_body_size(request.max_body_size)
+
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if request.max_body_size is not None and size > request.max_body_size:
+                raise HTTPException(status=413)
+            readable.write(chunk)
+            more_body = message.get("more_body", False)
+        readable.seek(0)
+
+    def finish_request(self, context: Context, request: Request) -> None:
+        """
+        Tear down request-scoped values and release the request body after the response is prepared or sent.
+
+        Streaming responses are sent before teardown, so their chunks can be produced with request-scoped values.
+        Teardown errors are logged instead of failing the request.
+
+        :param context: Context values for current request.
+        :param request: Current request.
+        """
+        try:
+            context.clear()
+        except Exception:
+            logger.exception("Request teardown failed")
+        finally:
+            request.close()
+
+    def close(self) -> None:
+        """
+        Tear down values of app-scoped providers.
+        """
+        for provider in self.providers.values():
+            provider.close()
+
+    def run(
+        self, host: str = "0.0.0.0", port: int = 8000, workers: int = None, event_loop: bool = False, **options
+    ) -> None:
+        """
+        Start a simple development WSGI server, or a production server if `workers` or `event_loop` is set.
+
+        :param host: Host address to bind to.
+        :param port: Port number to listen on.
+        :param workers: Number of worker processes of the prefork server.
+        :param event_loop: Serve with the single-process event-loop server, which runs the application on a thread pool.
+        :param options: Other options of the prefork server (see `PreforkServer`) or event-loop server
+            (see `EventLoopServer`).
+        :raises ValueError: If both `workers` and `event_loop` are set.
+        """
+        if workers is not None and event_loop:
+            raise ValueError("Workers and event loop cannot be used together")
+        if workers is not None:
+            PreforkServer(self, host=host, port=port, workers=workers, **options).serve_forever()
+            return
+        if event_loop:
+            EventLoopServer(self, host=host, port=port, **options).serve_forever()
+            return
+
+        with make_server(host=host, port=port, app=self) as server:
+            print(f"Running on http://{host}:{port}/", file=sys.stderr)
+            print("Do not use this server in production", file=sys.stderr)
+            server.serve_forever()
+
+    def add_middleware(self, middleware: Callable) -> None:
+        """
+        Register a middleware.
+
+        :param middleware: Middleware.
+        :raises ValueError: If middleware is not callable.
+        """
+        super().add_middleware(middleware)
+        self._pipeline = None
+        self._async_pipeline = None
+
+    def proceed_middlewares(self, context: Context) -> Response:
+        """
+        Apply middlewares sequentially and resolve the final response.
+
+        The middleware pipeline is compiled on first use and recompiled after middlewares change.
+
+        :param context: Context values for current request.
+        :returns: Response object.
+        """
+        if self._pipeline is None:
+            if self.instrumentation is not None:
+                self._pipeline = compile_pipeline(self.middlewares, self.handle_timed_request, timed=True)
+            else:
+                self._pipeline = compile_pipeline(self.middlewares, lambda context: self.handle_request(None, context))
+        return self._pipeline(context)
+
+    async def proceed_middlewares_async(self, context: Context) -> Response:
+        """
+        Apply sync or async middlewares sequentially and resolve the final response.
+
+        The async middleware pipeline is compiled on first use and recompiled after middlewares change.
+
+        :param context: Context values for current request.
+        :returns: Response object.
+        """
+        if self._async_pipeline is None:
+            if self.instrumentation is not None:
+                self._async_pipeline = compile_async_pipeline(
+                    self.middlewares, self.handle_timed_request_async, timed=True
+                )
+            else:
+                self._async_pipeline = compile_async_pipeline(self.middlewares, self.handle_request_async)
+        return await self._async_pipeline(context)
+
+    def handle_request(self, next_handler: Callable, context: Context) -> Response:
+        """
+        Resolve the request handler for the given endpoint and method.
+
+        :param next_handler: Not used, required for middleware signature.
+        :param context: Context values for current request.
+        :returns: Response object.
+        :raises HTTPException(413): If declared body size exceeds maximum body size.
+        """
+        route = self.resolve_route(context)
+        return self.call_route(route, context)
+
+    async def handle_request_async(self, context: Context) -> Response:
+        """
+        Resolve and await the sync or async request handler for the given endpoint and method.
+
+        :param context: Context values for current request.
+        :returns: Response object.
+        :raises HTTPException(413): If declared body size exceeds maximum body size.
+        """
+        route = self.resolve_route(context)
+        return await self.call_route_async(route, context)
+
+    def call_route(self, route: Route, context: Context) -> Response:
+        """
+        Call the route handler through middlewares of the route, compiled on first use.
+
+        The handler result is negotiated before middlewares of the route get it, so they see the final response.
+
+        :param route: Matched route.
+        :param context: Context values for current request.
+        :returns: Response object.
+        """
+        handler = route.handler
+        if not route.middlewares:
+            return self.negotiate_response(Response.ensure_response(handler(**context.params_for(handler))), context)
+
+        if route.pipeline is None:
+            route.pipeline = compile_pipeline(
+                route.middlewares,
+                lambda context: self.negotiate_response(
+                    Response.ensure_response(handler(**context.params_for(handler))), context
+                ),
+                timed=self.instrumentation is not None,
+            )
+        return route.pipeline(context)
+
+    async def call_route_async(self, route: Route, context: Context) -> Response:
+        """
+        Call the sync or async route handler through middlewares of the route, compiled on first use.
+
+        The handler result is negotiated before middlewares of the route get it, so they see the final response.
+
+        :param route: Matched route.
+        :param context: Context values for current request.
+        :returns: Response object.
+        """
+        handler = route.handler
+        if not route.middlewares:
+            return self.negotiate_response(Response.ensure_response(await context.call_async(handler)), context)
+
+        if route.async_pipeline is None:
+            async def call_handler(context: Context) -> Response:
+                return self.negotiate_response(Response.ensure_response(await context.call_async(handler)), context)
+
+            route.async_pipeline = compile_async_pipeline(
+                route.middlewares, call_handler, timed=self.instrumentation is not None
+            )
+        return await route.async_pipeline(context)
+
+    def handle_timed_request(self, context: Context) -> Response:
+        """
+        Resolve the request handler and call it, recording routing and handler time in `timings` context value.
+
+        :param context: Context values for current request.
+        :returns: Response object.
+        """
+        timings = context["timings"]
+        timings.enter("routing")
+        try:
+            route = self.resolve_route(context)
+            timings.next("handler")
+            return self.call_route(route, context)
+        finally:
+            timings.exit()
+
+    async def handle_timed_request_async(self, context: Context) -> Response:
+        """
+        Resolve and await the sync or async request handler,
+        recording routing and handler time in `timings` context value.
+
+        :param context: Context values for current request.
+        :returns: Response object.
+        """
+        timings = context["timings"]
+        timings.enter("routing")
+        try:
+            route = self.resolve_route(context)
+            timings.next("handler")
+            return await self.call_route_async(route, context)
+        finally:
+            timings.exit()
+
+    def match_request(self, request: Request) -> tuple[Union[Route, None], dict, Union[int, None]]:
+        """
+        Match the route before middlewares run, so unmatched requests are answered without raising exceptions.
+
+        Nothing is matched if there are middlewares, which may change the request or handle the raised exception,
+        or if requests are timed. A 404 or 405 status is returned only if no exception handler is registered for it
+        or for HTTPException class.
+
+        :param request: Current request.
+        :returns: Route, parsed path parameters and error status, if the request doesn't match.
+        """
+        if self.middlewares or self.instrumentation is not None:
+            return None, {}, None
+        route, path_params, status = self.route_table.match_route(request.endpoint, request.method)
+        if status is not None and (
+            status in self.exception_handlers or self.find_exception_handler(HTTPException) is not None
+        ):
+            return None, {}, None
+        return route, path_params, status
+
+    def resolve_route(self, context: Context) -> Route:
+        """
+        Find the route for the current request and store it with its path parameters in context,
+        unless it was matched before middlewares.
+
+        Requests with declared body size above the route or application limit are rejected before reading.
+
+        :param context: Context values for current request.
+        :returns: Matched route.
+        :raises HTTPException(404): If no route matches for endpoint.
+        :raises HTTPException(405): If no method matches for matched route.
+        :raises HTTPException(413): If declared body size exceeds maximum body size.
+        """
+        request = context["request"]
+        route = context.get("route")
+        if not isinstance(route, Route):
+            route, path_params = self.route_table.find_route(request.endpoint, request.method)
+            context["route"] = route
+            context.update(path_params)
+        request.limit_body_size(route.max_body_size if route.max_body_size is not None else self.max_body_size)
+        return route
+
+    def negotiate_response(self, response: Response, context: Context) -> Response:
+        """
+        Choose the serializer of response content returned by a handler.
+
+        JSON content is serialized with the serializer negotiated by Accept header, content of other registered
+        content types with their serializers. Text, bytes, streaming and file responses are left as is.
+
+        :param response: Response returned by a handler.
+        :param context: Context values for current request.
+        :returns: The same response.
+        """
+        if (
+            response.serializer is not None
+            or isinstance(response.content, (str, *RAW_CONTENT_TYPES))
+            or isinstance(response, (StreamingResponse, FileResponse))
+        ):
+            return response
+
+        if response.content_type != JSON_CONTENT_TYPE:
+            response.serializer = self.serializers.get(response.content_type)
+            return response
+
+        serializer = self.serializers.negotiate(context["request"].headers.get("Accept"))
+        response.serializer = serializer
+        if serializer.content_type != response.content_type:
+            response.content_type = response.headers["Content-Type"] = serializer.content_type
+        if len(self.serializers.serializers) > 1:
+            add_vary(response.headers, "Accept")
+        return response
+
+    def handle_exception(self, exception: BaseException, context: Context) -> Response:
+        """
+        Convert an exception into a proper HTTP response.
+
+        :param exception: The raised exception.
+        :param context: Context values for current request.
+        :returns: Response object.
+        """
+        http_exception, exception_handler = self.resolve_exception_handler(exception, context)
+        if not exception_handler:
+            return http_exception
+
+        try:
+            return self.negotiate_response(
+                Response.ensure_response(exception_handler(**context.params_for(exception_handler))), context
+            )
+        except BaseException as inner_exception:
+            return self.chain_exception(inner_exception, exception)
+
+    async def handle_exception_async(self, exception: Exception, context: Context) -> Response:
+        """
+        Convert an exception into a proper HTTP response, awaiting sync or async exception handler.
+
+        :param exception: The raised exception.
+        :param context: Context values for current request.
+        :returns: Response object.
+        """
+        http_exception, exception_handler = self.resolve_exception_handler(exception, context)
+        if not exception_handler:
+            return http_exception
+
+        try:
+            return self.negotiate_response(
+                Response.ensure_response(await context.call_async(exception_handler)), context
+            )
+        except Exception as inner_exception:
+            return self.chain_exception(inner_exception, exception)
+
+    def resolve_exception_handler(
+        self, exception: BaseException, context: Context
+    ) -> tuple[Union[HTTPException, None], Union[Callable, None]]:
+        """
+        Find the handler of an exception and store the handled exception in context.
+
+        HTTP exceptions are handled by the handler of their status or, if there is none, of their class.
+        Other exceptions are handled by the handler of their class, which receives the original exception;
+        without it they're converted into 500 HTTPException, handled by the handler of status 500.
+
+        :param exception: The raised exception.
+        :param context: Context values for current request.
+        :returns: HTTPException object, which is the response if there is no handler, and exception handler.
+        """
+        if isinstance(exception, HTTPException):
+            context.update(exception=exception)
+            exception_handler = self.exception_handlers.get(exception.status)
+            if exception_handler is None:
+                exception_handler = self.find_exception_handler(type(exception))
+            return exception, exception_handler
+
+        exception_handler = self.find_exception_handler(type(exception))
+        if exception_handler is not None:
+            context.update(exception=exception)
+            return None, exception_handler
+
+        http_exception = HTTPException.from_exception(exception, catch_traceback=self.debug)
+        context.update(exception=http_exception)
+        return http_exception, self.exception_handlers.get(http_exception.status)
+
+    def chain_exception(self, inner_exception: BaseException, exception: BaseException) -> HTTPException:
+        """
+        Convert an exception raised by an exception handler, keeping the original exception as its cause.
+
+        :param inner_exception: Exception raised by exception handler.
+        :param exception: Original exception.
+        :returns: HTTPException object.
+        """
+        combined_exception = inner_exception.with_traceback(inner_exception.__traceback__)
+        combined_exception.__cause__ = exception
+        return HTTPException.from_exception(combined_exception, catch_traceback=self.debug)
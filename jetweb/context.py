@@ -2,16 +2,74 @@
 Provides request context for dependency injection.
 """
 
+from __future__ import annotations
+
 import inspect
-from collections import UserDict
-from typing import Callable
+from collections import ChainMap
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Mapping
+from weakref import WeakKeyDictionary
+
+from .utils import call_async, is_async_callable
+
+if TYPE_CHECKING:
+    from .providers import Provider
 
+PARAMS_CACHE = WeakKeyDictionary()
+EMPTY_PROVIDERS = MappingProxyType({})
 
-class Context(UserDict):
+
+def inspect_params(function: Callable) -> tuple[str, ...]:
+    """
+    Get parameter names of a callable, caching them per callable.
+
+    Bound methods are cached by their underlying function, so methods looked up per request
+    don't inspect the signature again.
+
+    :param function: Callable whose signature will be inspected.
+    :returns: Parameter names.
+    """
+    key = getattr(function, "__func__", function)
+    try:
+        return PARAMS_CACHE[key]
+    except KeyError:
+        params = PARAMS_CACHE[key] = tuple(inspect.signature(function).parameters)
+        return params
+    except TypeError:
+        return tuple(inspect.signature(function).parameters)
+
+
+class Context(ChainMap):
     """
     Dictionary-like object that stores request context for dependency injection.
+
+    Values are looked up in a small per-request layer first, then in shared layers (e.g. global context),
+    which are referenced, not copied. Setting, updating and clearing values only changes the per-request layer.
+    Missing values are created by providers of the same name on first access.
+
+    :param layers: Shared read-only layers.
+    :param providers: Providers of lazily created values by name.
+    :param values: Initial values of the per-request layer.
     """
 
+    def __init__(self, *layers: Mapping, providers: Mapping = EMPTY_PROVIDERS, **values):
+        super().__init__(values, *layers)
+        self.providers = providers
+        self.teardowns = None
+        self.resolving = None
+
+    def __missing__(self, key: str) -> object:
+        provider = self.providers.get(key)
+        if provider is None:
+            raise KeyError(key)
+        return self.provide(key, provider)
+
+    def get(self, key: str, default: object = None) -> object:
+        for values in self.maps:
+            if key in values:
+                return values[key]
+        return default
+
     def params_for(self, function: Callable) -> dict:
         """
         Extract only the parameters from context that a function expects.
@@ -19,9 +77,85 @@ class Context(UserDict):
         :param function: Callable whose signature will be inspected.
         :returns: Dictionary of context values relevant to the function.
         """
-        signature = inspect.signature(function).parameters
-        return {
-            name: value
-            for name, value in {"context": self, **self.data}.items()
-            if name in signature
-        }
+        maps = self.maps
+        params = {}
+        for name in inspect_params(function):
+            for values in maps:
+                if name in values:
+                    params[name] = values[name]
+                    break
+            else:
+                if name == "context":
+                    params[name] = self
+                elif name in self.providers:
+                    params[name] = self.provide(name, self.providers[name])
+        return params
+
+    async def call_async(self, function: Callable, *args) -> object:
+        """
+        Call a sync or async callable with parameters from context without blocking the event loop.
+
+        Parameters of sync callables are extracted in the thread pool together with the call, so blocking providers
+        and the callable share one thread hop. Parameters of async callables are extracted in the thread pool
+        only if some of them must be created by providers.
+
+        :param function: Sync or async callable.
+        :param args: Positional arguments passed before the context parameters.
+        :returns: Callable result.
+        """
+        if not is_async_callable(function):
+            return await call_async(lambda: function(*args, **self.params_for(function)))
+
+        if self.providers and any(name in self.providers and name not in self for name in inspect_params(function)):
+            params = await call_async(self.params_for, function)
+        else:
+            params = self.params_for(function)
+        return await function(*args, **params)
+
+    def provide(self, name: str, provider: Provider) -> object:
+        """
+        Get a value from its provider, detecting providers depending on themselves.
+
+        :param name: Value name.
+        :param provider: Provider of the value.
+        :returns: Provided value.
+        :raises RuntimeError: If providers depend on each other in a cycle.
+        """
+        resolving = self.resolving
+        if resolving is None:
+            resolving = self.resolving = set()
+        if name in resolving:
+            raise RuntimeError(f"Provider {name} depends on itself")
+
+        resolving.add(name)
+        try:
+            return provider.provide(self, name)
+        finally:
+            resolving.discard(name)
+
+    def add_teardown(self, teardown: Callable[[], None]) -> None:
+        """
+        Register a callable to run when the context is cleared, in reverse order of registration.
+
+        :param teardown: Teardown callable.
+        """
+        if self.teardowns is None:
+            self.teardowns = []
+        self.teardowns.append(teardown)
+
+    def clear(self) -> None:
+        """
+        Run teardowns of request-scoped values and remove values of the per-request layer.
+
+        All teardowns run even if some of them fail; the first error is raised afterwards.
+        """
+        teardowns, self.teardowns = self.teardowns, None
+        error = None
+        for teardown in reversed(teardowns or ()):
+            try:
+                teardown()
+            except Exception as exception:
+                error = error or exception
+        super().clear()
+        if error is not None:
+            raise error
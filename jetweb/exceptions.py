@@ -4,23 +4,35 @@ Provides HTTPException class for error handling.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from http import HTTPStatus
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MemberDescriptorType
+from typing import Any
 
 from .http import Response
-from .utils import format_exception
+from .http.response import BaseResponse, EncodedResponse
+from .http.status import get_description
+from .serializers import Serializer
+from .utils import LazyTraceback, add_slots
 
 
+@add_slots(extra_slots=("reason",))
 @dataclass
-class HTTPException(Response, Exception):  # noqa: N818
+class HTTPException(BaseResponse, Exception):  # noqa: N818
     """
     Exception that also acts as a valid HTTP response.
+
+    Registered as a virtual subclass of `Response`, so `isinstance(exception, Response)` is True.
     """
+    headers: dict = field(default_factory=dict)
+    content: Any = ""
     status: int = 400
+    content_type: str = None
+    serializer: Serializer = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.content:
-            self.content = HTTPStatus(self.status).description
+            self.content = get_description(self.status)
         super().__post_init__()
 
     @classmethod
@@ -29,12 +41,44 @@ class HTTPException(Response, Exception):  # noqa: N818
         Convert any exception into an HTTPException.
 
         :param exception: Original exception.
-        :param catch_traceback: Include traceback text if True.
+        :param catch_traceback: Include traceback text if True, it's formatted only when the content is read.
         :returns: HTTPException object.
         """
         if isinstance(exception, cls):
             return exception
-        return cls(
-            content=format_exception(exception) if catch_traceback else None,
-            status=500,
-        )
+        http_exception = cls(status=500, content_type="text/plain")
+        if catch_traceback:
+            http_exception.content = LazyTraceback(exception)
+        return http_exception
+
+
+def lazy_content(content_slot: MemberDescriptorType) -> property:
+    """
+    Wrap the content slot, so a stored LazyTraceback is formatted into a string on the first read.
+
+    :param content_slot: Slot descriptor of the content field.
+    :returns: Content property.
+    """
+    def get_content(exception: HTTPException) -> object:
+        content = content_slot.__get__(exception)
+        if isinstance(content, LazyTraceback):
+            content = str(content)
+            content_slot.__set__(exception, content)
+        return content
+
+    return property(get_content, content_slot.__set__)
+
+
+HTTPException.content = lazy_content(HTTPException.content)
+Response.register(HTTPException)
+
+
+@lru_cache(maxsize=None)
+def encode_http_exception(status: int) -> EncodedResponse:
+    """
+    Encode default HTTPException response of a status once, so it can be sent without raising an exception.
+
+    :param status: Exception status.
+    :returns: Shared encoded response.
+    """
+    return EncodedResponse.from_response(HTTPException(status=status))
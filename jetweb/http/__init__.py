@@ -1,7 +1,9 @@
 from .request import Request
-from .response import Response
+from .response import FileResponse, Response, StreamingResponse
 
 __all__ = [
     "Request",
     "Response",
+    "StreamingResponse",
+    "FileResponse",
 ]
@@ -1,65 +1,210 @@
-"""
-Provides HTTP request representation.
-"""
-from __future__ import annotations
-
-from dataclasses import dataclass
-from json import loads
-
-from ..utils import CaseInsensitiveDict, parse_body, parse_headers, parse_query_params
-
-
-@dataclass
-class Request:
-    """
-    Represents an HTTP request.
-
-    :param method: Request method (GET, POST, etc.).
-    :param endpoint: Request endpoint.
-    :param query_params: Case-insensitive dict of query parameters.
-    :param headers: Case-insensitive dict of headers.
-    :param body: Request body.
-    """
-    method: str
-    endpoint: str
-    query_params: CaseInsensitiveDict
-    headers: CaseInsensitiveDict
-    body: bytes
-
-    @property
-    def text(self) -> str:
-        """
-        Parse body as text.
-
-        :returns: Request body decoded as text.
-        """
-        return self.body.decode()
-
-    @property
-    def json(self) -> dict:
-        """
-        Parse body as JSON.
-
-        :returns: Request body loaded as JSON.
-        :raises ValueError: If content-type is not application/json.
-        """
-        if self.headers["content-type"] != "application/json":
-            raise ValueError("Content type must be application/json")
-
-        return loads(self.body)
-
-    @classmethod
-    def from_environ(cls, environ: dict) -> Request:
-        """
-        Construct a Request object from WSGI environ.
-
-        :param environ: WSGI environ.
-        :returns: Request object.
-        """
-        return cls(
-            method=environ["REQUEST_METHOD"],
-            endpoint=environ["PATH_INFO"],
-            query_params=parse_query_params(environ),
-            headers=parse_headers(environ),
-            body=parse_body(environ),
-        )
+"""
+Provides HTTP request representation.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from json import loads
+from tempfile import SpooledTemporaryFile
+from typing import IO, Iterator, Union
+
+from ..utils import CaseInsensitiveDict, add_slots, parse_content_length, parse_headers, parse_query_params
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_THRESHOLD = 1024 * 1024
+
+LAZY_ATTRIBUTES = {
+    "query_params": lambda request: parse_query_params(request.environ),
+    "headers": lambda request: parse_headers(request.environ),
+    "body": lambda request: request.read_body(),
+    "file": lambda request: request.spool_body(),
+}
+
+
+@add_slots(extra_slots=("file", "body_streamed"))
+@dataclass
+class Request:
+    """
+    Represents an HTTP request.
+
+    Requests created lazily from WSGI environ parse query parameters, headers and body on first access.
+    The body can also be streamed in chunks with `iter_body()` or accessed as a file-like `file` attribute,
+    which is spooled to a temporary file above `spool_threshold` bytes. Body streamed before it was loaded
+    is not kept, so `body`, `text`, `json` and `file` can't be used after that.
+    Body is left out of `repr()` and comparison, so e.g. logging a request doesn't read it.
+
+    :param method: Request method (GET, POST, etc.).
+    :param endpoint: Request endpoint.
+    :param query_params: Case-insensitive dict of query parameters.
+    :param headers: Case-insensitive dict of headers.
+    :param body: Request body.
+    :param environ: WSGI environ the request was created from.
+    :param max_body_size: Maximum allowed body size in bytes, unlimited if None.
+    :param spool_threshold: Body size in bytes above which `file` is spooled to disk.
+    """
+    method: str
+    endpoint: str
+    query_params: CaseInsensitiveDict
+    headers: CaseInsensitiveDict
+    body: bytes = field(repr=False, compare=False)
+    environ: dict = field(default=None, repr=False, compare=False)
+    max_body_size: int = field(default=None, repr=False, compare=False)
+    spool_threshold: int = field(default=SPOOL_THRESHOLD, repr=False, compare=False)
+
+    def __getattr__(self, name: str) -> object:
+        loader = LAZY_ATTRIBUTES.get(name)
+        if loader is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        value = loader(self)
+        setattr(self, name, value)
+        return value
+
+    @property
+    def text(self) -> str:
+        """
+        Parse body as text.
+
+        :returns: Request body decoded as text.
+        """
+        return self.body.decode()
+
+    @property
+    def json(self) -> dict:
+        """
+        Parse body as JSON.
+
+        :returns: Request body loaded as JSON.
+        :raises ValueError: If content-type is not application/json.
+        """
+        if self.headers["content-type"] != "application/json":
+            raise ValueError("Content type must be application/json")
+
+        return loads(self.body)
+
+    def limit_body_size(self, max_body_size: Union[int, None]) -> None:
+        """
+        Set maximum body size and check the declared content length against it.
+
+        :param max_body_size: Maximum allowed body size in bytes, unlimited if None.
+        :raises HTTPException(413): If declared content length exceeds maximum body size.
+        """
+        self.max_body_size = max_body_size
+        if self.environ is not None:
+            self._check_body_size(parse_content_length(self.environ))
+
+    def iter_body(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream request body in chunks.
+
+        Body that was not loaded yet is read directly from WSGI input, so it can be streamed only once.
+
+        :param chunk_size: Maximum size of a chunk in bytes.
+        :returns: Iterator of body chunks.
+        :raises HTTPException(413): If body size exceeds maximum body size.
+        :raises RuntimeError: If body was already streamed from WSGI input.
+        """
+        loaded = self._get_loaded("body")
+        if loaded is not None:
+            yield loaded
+            return
+
+        loaded = self._get_loaded("file")
+        if loaded is not None:
+            loaded.seek(0)
+            yield from iter(lambda: loaded.read(chunk_size), b"")
+            loaded.seek(0)
+            return
+
+        if self._get_loaded("body_streamed"):
+            raise RuntimeError("Request body was already streamed with iter_body() and can't be read again")
+        self.body_streamed = True
+
+        readable = self.environ["wsgi.input"]
+        remaining = parse_content_length(self.environ)
+        self._check_body_size(remaining)
+        if not remaining and self.environ.get("wsgi.input_terminated"):
+            remaining = None
+
+        received = 0
+        while remaining is None or received < remaining:
+            size = chunk_size if remaining is None else min(chunk_size, remaining - received)
+            chunk = readable.read(size)
+            if not chunk:
+                break
+            received += len(chunk)
+            self._check_body_size(received)
+            yield chunk
+
+    def read_body(self) -> bytes:
+        """
+        Read the whole request body.
+
+        :returns: Request body.
+        :raises HTTPException(413): If body size exceeds maximum body size.
+        :raises RuntimeError: If body was already streamed from WSGI input.
+        """
+        return b"".join(self.iter_body())
+
+    def spool_body(self) -> IO[bytes]:
+        """
+        Copy request body into a file-like object, kept in memory up to `spool_threshold` bytes.
+
+        :returns: File-like object positioned at the start of the body.
+        :raises HTTPException(413): If body size exceeds maximum body size.
+        :raises RuntimeError: If body was already streamed from WSGI input.
+        """
+        file = SpooledTemporaryFile(max_size=self.spool_threshold)
+        for chunk in self.iter_body():
+            file.write(chunk)
+        file.seek(0)
+        return file
+
+    def close(self) -> None:
+        """
+        Close the spooled body file, if it was created.
+        """
+        file = self._get_loaded("file")
+        if file is not None:
+            file.close()
+
+    def _get_loaded(self, name: str) -> object:
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            return None
+
+    def _check_body_size(self, size: int) -> None:
+        if self.max_body_size is not None and size > self.max_body_size:
+            from ..exceptions import HTTPException
+            raise HTTPException(status=413)
+
+    @classmethod
+    def from_environ(
+        cls,
+        environ: dict,
+        lazy: bool = True,
+        max_body_size: int = None,
+        spool_threshold: int = SPOOL_THRESHOLD,
+    ) -> Request:
+        """
+        Construct a Request object from WSGI environ.
+
+        :param environ: WSGI environ.
+        :param lazy: Defer parsing of query parameters, headers and body until first access if True.
+        :param max_body_size: Maximum allowed body size in bytes, unlimited if None.
+        :param spool_threshold: Body size in bytes above which `file` is spooled to disk.
+        :returns: Request object.
+        :raises HTTPException(413): If not lazy and body size exceeds maximum body size.
+        """
+        request = cls.__new__(cls)
+        request.method = environ["REQUEST_METHOD"]
+        request.endpoint = environ["PATH_INFO"]
+        request.environ = environ
+        request.max_body_size = max_body_size
+        request.spool_threshold = spool_threshold
+
+        if not lazy:
+            for name in ("query_params", "headers", "body"):
+                getattr(request, name)
+        return request
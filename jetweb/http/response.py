@@ -4,14 +4,139 @@ Provides HTTP response representation.
 
 from __future__ import annotations
 
+import os
+from abc import ABCMeta
 from dataclasses import dataclass, field
-from http import HTTPStatus
-from json import dumps
-from typing import Any, Union
+from itertools import chain
+from mimetypes import guess_type
+from typing import IO, Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Union
 
+from ..serializers import Serializer, default_serializers
+from ..utils import add_slots, encode_headers, run_sync
+from .status import get_reason, get_status_line
 
+CHUNK_SIZE = 64 * 1024
+RAW_CONTENT_TYPES = (bytes, bytearray, memoryview)
+
+
+def encode_chunk(chunk: Union[bytes, str]) -> bytes:
+    """
+    Encode a text chunk of streamed body, bytes are returned as is.
+
+    :param chunk: Body chunk.
+    :returns: Encoded body chunk.
+    """
+    return chunk.encode() if isinstance(chunk, str) else chunk
+
+
+class BaseResponse(metaclass=ABCMeta):
+    """
+    Base class with behaviour shared by responses and HTTP exceptions.
+
+    It has no instance attributes, so slotted `Response` and `HTTPException`,
+    which can't share instance layout, can both inherit it.
+    """
+
+    __slots__ = ()
+
+    def __post_init__(self):
+        if not self.content_type:
+            if isinstance(self.content, str):
+                self.content_type = "text/plain"
+            elif isinstance(self.content, RAW_CONTENT_TYPES):
+                self.content_type = "application/octet-stream"
+            else:
+                self.content_type = "application/json"
+        self.headers["Content-Type"] = self.content_type
+        self.reason = get_reason(self.status)
+
+    @property
+    def body(self) -> bytes:
+        """
+        Return body as encoded bytes.
+
+        Bytes content is returned as is, bytearray and memoryview content is converted to bytes.
+        Content of a content type with a registered serializer (e.g. application/json) is serialized
+        by the response serializer or the default one of the content type, other content is encoded as text.
+
+        :returns: Response body encoded as text.
+        """
+        content = self.content
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, (bytearray, memoryview)):
+            return bytes(content)
+        serializer = self.serializer or default_serializers.get(self.content_type)
+        if serializer is not None:
+            return serializer.serialize(content)
+        return content.encode()
+
+    def iter_body(self, file_wrapper: Callable = None) -> Iterable[bytes]:
+        """
+        Return body as an iterable of encoded chunks.
+
+        :param file_wrapper: Optional WSGI file wrapper (`wsgi.file_wrapper`) for file-backed bodies.
+        :returns: Iterable of body chunks.
+        """
+        return [self.body]
+
+    async def aiter_body(self) -> AsyncIterator[bytes]:
+        """
+        Return body as an async iterator of encoded chunks.
+
+        :returns: Async iterator of body chunks.
+        """
+        for chunk in self.iter_body():
+            yield chunk
+
+    @classmethod
+    def ensure_response(cls, obj: Union[Response, object]) -> Response:
+        """
+        Convert any object or Response into a Response.
+
+        :param obj: Response or any object.
+        :returns: Response object.
+        """
+        return obj if isinstance(obj, cls) else cls(content=obj)
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """
+    Immutable response with precomputed status line, headers and body, shared by many requests.
+
+    :param status: Response status code.
+    :param status_line: Status code with reason phrase for WSGI.
+    :param headers: Response headers for WSGI.
+    :param asgi_headers: Encoded response headers for ASGI.
+    :param body: Encoded response body.
+    """
+    status: int
+    status_line: str
+    headers: tuple[tuple[str, str], ...]
+    asgi_headers: tuple[tuple[bytes, bytes], ...]
+    body: bytes
+
+    @classmethod
+    def from_response(cls, response: BaseResponse) -> EncodedResponse:
+        """
+        Encode a response with a fully known body.
+
+        :param response: Response object.
+        :returns: EncodedResponse object.
+        """
+        return cls(
+            status=response.status,
+            status_line=get_status_line(response.status, response.reason),
+            headers=tuple(response.headers.items()),
+            asgi_headers=tuple(encode_headers(response.headers)),
+            body=response.body,
+        )
+
+
+@add_slots(extra_slots=("reason",))
 @dataclass
-class Response:
+class Response(BaseResponse):
     """
     Represents an HTTP response.
 
@@ -19,38 +144,148 @@ class Response:
     :param content: Response body.
     :param status: Response status code.
     :param content_type: MIME type of the response.
+    :param serializer: Serializer of the content, the default serializer of the content type if None.
     """
     headers: dict = field(default_factory=dict)
     content: Any = ""
     status: int = 200
     content_type: str = None
+    serializer: Serializer = field(default=None, repr=False, compare=False)
+
+
+@add_slots
+@dataclass
+class StreamingResponse(Response):
+    """
+    Represents an HTTP response with body produced by an iterable of chunks.
+
+    The first chunk is produced as soon as the body is requested,
+    so errors raised before any data is sent still result in an error response.
+
+    :param content: Iterable of bytes or text chunks. Async iterables are supported by the ASGI entry point.
+    :param content_length: Total body size in bytes. Body is sent without Content-Length if None.
+    """
+    content: Union[Iterable[Union[bytes, str]], AsyncIterable[Union[bytes, str]]] = ()
+    content_length: int = None
 
     def __post_init__(self):
         if not self.content_type:
-            self.content_type = "text/plain" if isinstance(self.content, str) else "application/json"
-        self.headers["Content-Type"] = self.content_type
-        self.reason = HTTPStatus(self.status).phrase
+            self.content_type = "application/octet-stream"
+        super().__post_init__()
+        if self.content_length is not None:
+            self.headers["Content-Length"] = str(self.content_length)
 
     @property
     def body(self) -> bytes:
         """
-        Return body as encoded bytes.
-
-        For responses with content type application/json,
-        the content is first JSON-serialized before encoding.
+        Return the whole streamed body as encoded bytes.
 
         :returns: Response body encoded as text.
         """
-        if self.content_type == "application/json":
-            return dumps(self.content).encode()
-        return self.content.encode()
+        return b"".join(self.iter_body())
 
-    @classmethod
-    def ensure_response(cls, obj: Union[Response, object]) -> Response:
+    def iter_body(self, file_wrapper: Callable = None) -> Iterator[bytes]:
         """
-        Convert any object or Response into a Response.
+        Return body as an iterator of encoded chunks.
 
-        :param obj: Response or any object.
-        :returns: Response object.
+        :param file_wrapper: Not used, required for signature compatibility.
+        :returns: Iterator of body chunks.
         """
-        return obj if isinstance(obj, cls) else cls(content=obj)
+        chunks = map(encode_chunk, self.content)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            return iter(())
+        return chain((first_chunk,), chunks)
+
+    async def aiter_body(self) -> AsyncIterator[bytes]:
+        """
+        Return body as an async iterator of encoded chunks.
+
+        Async iterables are consumed directly, sync ones are advanced in the thread pool.
+
+        :returns: Async iterator of body chunks.
+        """
+        if hasattr(self.content, "__aiter__"):
+            async for chunk in self.content:
+                yield encode_chunk(chunk)
+            return
+
+        chunks = iter(self.content)
+        while True:
+            chunk = await run_sync(next, chunks, None)
+            if chunk is None:
+                return
+            yield encode_chunk(chunk)
+
+
+@add_slots
+@dataclass
+class FileResponse(Response):
+    """
+    Represents an HTTP response with body read from a file.
+
+    The file is handed to the server's `wsgi.file_wrapper` when available, so it can be sent with `sendfile`.
+
+    :param content: Path to a file or a file opened in binary mode.
+    :param chunk_size: Size of chunks in bytes for reading the file.
+    """
+    content: Union[str, os.PathLike, IO[bytes]] = None
+    chunk_size: int = CHUNK_SIZE
+
+    def __post_init__(self):
+        if isinstance(self.content, (str, os.PathLike)):
+            if not self.content_type:
+                self.content_type = guess_type(os.fspath(self.content))[0]
+            self.content = open(self.content, "rb")
+
+        if not self.content_type:
+            self.content_type = "application/octet-stream"
+        super().__post_init__()
+
+        try:
+            size = os.fstat(self.content.fileno()).st_size - self.content.tell()
+        except (AttributeError, OSError, ValueError):
+            size = None
+        if size is not None:
+            self.headers["Content-Length"] = str(size)
+
+    @property
+    def body(self) -> bytes:
+        """
+        Return the whole file content.
+
+        :returns: Response body read from the file.
+        """
+        return b"".join(self.iter_body())
+
+    def iter_body(self, file_wrapper: Callable = None) -> Iterable[bytes]:
+        """
+        Return body as an iterable of file chunks.
+
+        :param file_wrapper: Optional WSGI file wrapper (`wsgi.file_wrapper`).
+        :returns: Iterable of body chunks, closing the file when exhausted.
+        """
+        if file_wrapper is not None:
+            return file_wrapper(self.content, self.chunk_size)
+        return self._read_chunks()
+
+    async def aiter_body(self) -> AsyncIterator[bytes]:
+        """
+        Return body as an async iterator of file chunks, read in the thread pool.
+
+        :returns: Async iterator of body chunks, closing the file when exhausted.
+        """
+        try:
+            while True:
+                chunk = await run_sync(self.content.read, self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            self.content.close()
+
+    def _read_chunks(self) -> Iterator[bytes]:
+        try:
+            yield from iter(lambda: self.content.read(self.chunk_size), b"")
+        finally:
+            self.content.close()
@@ -0,0 +1,49 @@
+"""
+Provides precomputed HTTP status reasons and status lines.
+"""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+
+STATUS_REASONS = {status.value: status.phrase for status in HTTPStatus}
+STATUS_DESCRIPTIONS = {status.value: status.description for status in HTTPStatus}
+STATUS_LINES = {status.value: f"{status.value} {status.phrase}" for status in HTTPStatus}
+
+
+def get_reason(status: int) -> str:
+    """
+    Get reason phrase of a status.
+
+    :param status: Status code.
+    :returns: Reason phrase.
+    :raises ValueError: If status is unknown.
+    """
+    reason = STATUS_REASONS.get(status)
+    return reason if reason is not None else HTTPStatus(status).phrase
+
+
+def get_description(status: int) -> str:
+    """
+    Get long description of a status.
+
+    :param status: Status code.
+    :returns: Status description.
+    :raises ValueError: If status is unknown.
+    """
+    description = STATUS_DESCRIPTIONS.get(status)
+    return description if description is not None else HTTPStatus(status).description
+
+
+def get_status_line(status: int, reason: str) -> str:
+    """
+    Get status line of a response, e.g. "404 Not Found".
+
+    :param status: Status code.
+    :param reason: Reason phrase.
+    :returns: Status code with reason phrase.
+    """
+    status_line = STATUS_LINES.get(status)
+    if status_line is not None and reason == STATUS_REASONS[status]:
+        return status_line
+    return f"{status} {reason}"
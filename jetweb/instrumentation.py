@@ -0,0 +1,118 @@
+"""
+Provides opt-in timing of request handling stages.
+"""
+
+from __future__ import annotations
+
+from time import perf_counter_ns
+from typing import Callable
+
+from .http import Request
+
+
+class Timings:
+    """
+    Durations of request handling stages, measured with `perf_counter_ns`.
+
+    Stages nest: time spent in an inner stage (e.g. the handler called by a middleware)
+    is not counted in the outer one, so durations add up to the total time.
+    Handlers and middlewares can record their own stages through the `timings` context value.
+    """
+
+    __slots__ = ("durations", "stages", "started", "last")
+
+    def __init__(self):
+        self.durations = {}
+        self.stages = ["request"]
+        self.started = self.last = perf_counter_ns()
+
+    def enter(self, stage: str) -> None:
+        """
+        Start a nested stage.
+
+        :param stage: Stage name.
+        """
+        self.switch()
+        self.stages.append(stage)
+
+    def exit(self) -> None:
+        """
+        Finish the current stage, returning to the outer one.
+        """
+        self.switch()
+        self.stages.pop()
+
+    def next(self, stage: str) -> None:
+        """
+        Finish the current stage and start the next one at the same level.
+
+        :param stage: Stage name.
+        """
+        self.switch()
+        self.stages[-1] = stage
+
+    def switch(self) -> None:
+        """
+        Add time since the last change to the current stage.
+        """
+        now = perf_counter_ns()
+        stage = self.stages[-1]
+        self.durations[stage] = self.durations.get(stage, 0) + now - self.last
+        self.last = now
+
+    @property
+    def total(self) -> int:
+        """
+        Time since the request was received in nanoseconds.
+        """
+        return perf_counter_ns() - self.started
+
+    def format_server_timing(self) -> str:
+        """
+        Format durations as Server-Timing header value with milliseconds.
+
+        :returns: Header value, e.g. "request;dur=0.012, handler;dur=1.250, total;dur=1.302".
+        """
+        metrics = [f"{stage};dur={duration / 1e6:.3f}" for stage, duration in self.durations.items()]
+        metrics.append(f"total;dur={self.total / 1e6:.3f}")
+        return ", ".join(metrics)
+
+
+class Instrumentation:
+    """
+    Opt-in timing of request handling stages: request construction, routing, each middleware,
+    the handler, exception handling and body serialization.
+
+    :param server_timing: Send durations in Server-Timing response header if True.
+    :param sink: Callable, which receives the request and its timings after the response is prepared,
+        e.g. to log slow requests or feed metrics.
+    """
+
+    def __init__(self, server_timing: bool = True, sink: Callable[[Request, Timings], None] = None):
+        self.server_timing = server_timing
+        self.sink = sink
+
+    def finish(self, request: Request, timings: Timings, headers: dict) -> None:
+        """
+        Finish timing of a request, adding Server-Timing header and passing timings to the sink.
+
+        :param request: Current request.
+        :param timings: Timings of the request.
+        :param headers: Response headers.
+        """
+        timings.switch()
+        if self.server_timing:
+            headers["Server-Timing"] = timings.format_server_timing()
+        if self.sink is not None:
+            self.sink(request, timings)
+
+
+def get_stage_name(middleware: Callable) -> str:
+    """
+    Get timing stage name of a middleware.
+
+    :param middleware: Middleware function or instance.
+    :returns: Stage name, e.g. "middleware.auth".
+    """
+    name = getattr(middleware, "__name__", None) or type(middleware).__name__
+    return f"middleware.{name}"
@@ -0,0 +1,17 @@
+"""
+Provides built-in middlewares.
+"""
+
+from .cache import CacheMiddleware
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
+from .single_flight import SingleFlight, SingleFlightMiddleware, single_flight
+
+__all__ = [
+    "CacheMiddleware",
+    "CompressionMiddleware",
+    "MetricsMiddleware",
+    "SingleFlight",
+    "SingleFlightMiddleware",
+    "single_flight",
+]
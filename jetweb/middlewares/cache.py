@@ -0,0 +1,275 @@
+"""
+Provides in-memory response cache middleware.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Callable, Iterable, Union
+
+from ..context import Context
+from ..http import FileResponse, Request, Response, StreamingResponse
+from .single_flight import CREDENTIAL_HEADERS
+
+UNCACHEABLE_DIRECTIVES = ("no-store", "private", "no-cache")
+SHARED_DIRECTIVES = ("public", "s-maxage")
+
+
+@dataclass
+class CacheEntry:
+    """
+    Finished response stored in cache.
+
+    :param status: Response status code.
+    :param headers: Response headers.
+    :param body: Encoded response body.
+    :param endpoint: Request endpoint.
+    :param route: Endpoint template of the matched route.
+    :param expires_at: Monotonic time after which the entry is stale.
+    :param size: Approximate entry size in bytes.
+    """
+    status: int
+    headers: dict
+    body: bytes
+    endpoint: str
+    route: str
+    expires_at: float
+    size: int
+
+    def to_response(self) -> Response:
+        """
+        Create a new response from the cached entry.
+
+        :returns: Response object.
+        """
+        return Response(
+            headers=dict(self.headers),
+            content=self.body,
+            status=self.status,
+            content_type=self.headers.get("Content-Type"),
+        )
+
+
+class CacheMiddleware:
+    """
+    Middleware, which caches finished responses in memory with LRU eviction.
+
+    Responses are keyed on request method, endpoint, query parameters and the request headers
+    listed in the `Vary` header of the cached response. Streaming and file responses,
+    responses with `Cache-Control: no-store, private or no-cache` and requests with `Cache-Control: no-cache`
+    or `no-store` are not served from cache. Requests with `Authorization` or `Cookie` headers are never
+    served from cache, their responses are stored only if explicitly marked `public` or with `s-maxage`.
+
+    :param ttl: Default time to live of cached responses in seconds.
+    :param route_ttls: Time to live per route endpoint template, e.g. `{"/users/{user_id:int}": 10}`.
+        Responses of routes with zero time to live are not cached.
+    :param max_size: Maximum total size of cached responses in bytes.
+    :param max_entries: Maximum number of cached responses.
+    :param methods: Cached request methods.
+    :param statuses: Cached response statuses.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        route_ttls: dict[str, float] = None,
+        max_size: int = 64 * 1024 * 1024,
+        max_entries: int = 10_000,
+        methods: Iterable[str] = ("GET", "HEAD"),
+        statuses: Iterable[int] = (200,),
+    ):
+        self.ttl = ttl
+        self.route_ttls = route_ttls or {}
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.methods = frozenset(methods)
+        self.statuses = frozenset(statuses)
+        self.entries = OrderedDict()
+        self.vary = {}
+        self.variants = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def __call__(self, next_handler: Callable, request: Request, context: Context) -> Response:
+        if request.method not in self.methods or self.bypasses_cache(request.headers.get("Cache-Control")):
+            return next_handler()
+
+        base_key = (request.method, request.endpoint, tuple(sorted(request.query_params.multi_items())))
+        credentialed = any(name in request.headers for name in CREDENTIAL_HEADERS)
+        if not credentialed:
+            entry = self.get(base_key, request)
+            if entry is not None:
+                return entry.to_response()
+
+        response = next_handler()
+        self.store(base_key, request, response, context.get("route"), credentialed)
+        return response
+
+    def get(self, base_key: tuple, request: Request) -> Union[CacheEntry, None]:
+        """
+        Find a fresh cached response for the request, counting a hit or a miss.
+
+        :param base_key: Method, endpoint and query parameters of the request.
+        :param request: Current request.
+        :returns: Cached entry or None.
+        """
+        with self.lock:
+            key = self.create_key(base_key, request, self.vary.get(base_key, ()))
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires_at <= monotonic():
+                self.remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def store(
+        self, base_key: tuple, request: Request, response: Response, route: object, credentialed: bool = False
+    ) -> None:
+        """
+        Store a finished response, evicting least recently used responses above the limits.
+
+        :param base_key: Method, endpoint and query parameters of the request.
+        :param request: Current request.
+        :param response: Response returned by the next handler.
+        :param route: Matched route or None.
+        :param credentialed: Whether the request has credentials, so only explicitly shared responses are stored.
+        """
+        if isinstance(response, (StreamingResponse, FileResponse)) or response.status not in self.statuses:
+            return
+
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        vary = tuple(sorted(name.strip().lower() for name in headers.get("vary", "").split(",") if name.strip()))
+        cache_control = headers.get("cache-control")
+        if "*" in vary or self.bypasses_cache(cache_control) or "set-cookie" in headers:
+            return
+        if credentialed and not self.allows_shared_cache(cache_control):
+            return
+
+        route_endpoint = getattr(route, "endpoint", None)
+        ttl = self.route_ttls.get(route_endpoint, self.ttl)
+        if ttl <= 0:
+            return
+
+        body = response.body
+        size = len(body) + sum(len(name) + len(str(value)) for name, value in response.headers.items())
+        if size > self.max_size:
+            return
+
+        entry = CacheEntry(
+            status=response.status,
+            headers=dict(response.headers),
+            body=body,
+            endpoint=request.endpoint,
+            route=route_endpoint,
+            expires_at=monotonic() + ttl,
+            size=size,
+        )
+        with self.lock:
+            key = self.create_key(base_key, request, vary)
+            self.remove(key)
+            self.vary[base_key] = vary
+            self.variants[base_key] = self.variants.get(base_key, 0) + 1
+            self.entries[key] = entry
+            self.size += size
+            while self.size > self.max_size or len(self.entries) > self.max_entries:
+                self.remove(next(iter(self.entries)))
+
+    def invalidate(self, endpoint: str = None, route: str = None) -> int:
+        """
+        Remove cached responses of an endpoint or of all endpoints of a route.
+
+        :param endpoint: Request endpoint, e.g. "/users/1".
+        :param route: Route endpoint template, e.g. "/users/{user_id:int}".
+        :returns: Number of removed responses.
+        """
+        with self.lock:
+            keys = [
+                key for key, entry in self.entries.items()
+                if (endpoint is not None and entry.endpoint == endpoint)
+                or (route is not None and entry.route == route)
+            ]
+            for key in keys:
+                self.remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """
+        Remove all cached responses and reset counters.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.vary.clear()
+            self.variants.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+
+        :returns: Numbers of hits, misses and cached responses, and their total size in bytes.
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries), "size": self.size}
+
+    def remove(self, key: tuple) -> None:
+        """
+        Remove a cached response, if present, and the Vary record of its base key with its last response.
+        Must be called with the lock held.
+
+        :param key: Cache key.
+        """
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+            base_key = key[0]
+            variants = self.variants[base_key] - 1
+            if variants:
+                self.variants[base_key] = variants
+            else:
+                del self.variants[base_key]
+                del self.vary[base_key]
+
+    @staticmethod
+    def create_key(base_key: tuple, request: Request, vary: tuple[str, ...]) -> tuple:
+        """
+        Create a cache key from the request and the headers responses vary on.
+
+        :param base_key: Method, endpoint and query parameters of the request.
+        :param request: Current request.
+        :param vary: Lower-cased names of request headers.
+        :returns: Cache key.
+        """
+        return base_key, tuple(request.headers.get(name) for name in vary)
+
+    @staticmethod
+    def bypasses_cache(cache_control: Union[str, None]) -> bool:
+        """
+        Check whether Cache-Control header forbids using the cache.
+
+        :param cache_control: Cache-Control header value.
+        :returns: True if response must not be cached or served from cache.
+        """
+        return bool(cache_control) and any(directive in cache_control.lower() for directive in UNCACHEABLE_DIRECTIVES)
+
+    @staticmethod
+    def allows_shared_cache(cache_control: Union[str, None]) -> bool:
+        """
+        Check whether Cache-Control header explicitly allows storing a response to a request with credentials.
+
+        :param cache_control: Cache-Control header value.
+        :returns: True if response is marked `public` or has `s-maxage`.
+        """
+        return bool(cache_control) and any(directive in cache_control.lower() for directive in SHARED_DIRECTIVES)
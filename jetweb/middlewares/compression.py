@@ -0,0 +1,234 @@
+"""
+Provides gzip and deflate response compression middleware.
+"""
+
+from __future__ import annotations
+
+import zlib
+from dataclasses import replace
+from threading import Lock
+from time import perf_counter
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Union
+
+from ..http import FileResponse, Request, Response, StreamingResponse
+from ..http.response import encode_chunk
+from ..utils import add_vary
+
+WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+COMPRESSED_TYPES = (
+    "image/",
+    "audio/",
+    "video/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-bzip2",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/zstd",
+    "application/pdf",
+)
+UNCOMPRESSED_IMAGE_TYPES = ("image/svg+xml", "image/bmp")
+STATUSES_WITHOUT_BODY = (204, 304)
+MEBIBYTE = 1024 * 1024
+EWMA_WEIGHT = 0.1
+
+
+def negotiate_encoding(accept_encoding: Union[str, None], encodings: Iterable[str]) -> Union[str, None]:
+    """
+    Choose the most preferred supported encoding from Accept-Encoding header.
+
+    :param accept_encoding: Accept-Encoding header value.
+    :param encodings: Supported encodings in order of server preference.
+    :returns: Encoding or None if the client accepts none of them.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().lower().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip()] = quality
+
+    best_encoding, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+    return best_encoding
+
+
+def is_compressible(content_type: Union[str, None]) -> bool:
+    """
+    Check whether content type is not compressed already.
+
+    :param content_type: Response content type.
+    :returns: True if response body is worth compressing.
+    """
+    content_type = (content_type or "").lower()
+    return content_type.startswith(UNCOMPRESSED_IMAGE_TYPES) or not content_type.startswith(COMPRESSED_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Middleware, which compresses response bodies with gzip or deflate according to Accept-Encoding header.
+
+    Streaming and file responses are compressed incrementally chunk by chunk, without buffering the whole body.
+    Responses with known size below `minimum_size`, already encoded responses and already compressed content types
+    (images, audio, video, archives) are sent as is.
+
+    :param minimum_size: Minimum body size in bytes for compression.
+    :param level: Compression level from 1 (fastest) to 9 (smallest).
+    :param encodings: Supported encodings in order of preference.
+    :param cpu_budget: Maximum average compression time in seconds per MiB of body.
+        While the moving average exceeds it, compression level is lowered; it's raised back below half of the budget.
+        Unlimited if None.
+    """
+
+    def __init__(
+        self,
+        minimum_size: int = 500,
+        level: int = 6,
+        encodings: Iterable[str] = ("gzip", "deflate"),
+        cpu_budget: float = None,
+    ):
+        encodings = tuple(encodings)
+        if any(encoding not in WBITS for encoding in encodings):
+            raise ValueError("Encodings must be gzip or deflate")
+
+        self.minimum_size = minimum_size
+        self.level = level
+        self.max_level = level
+        self.encodings = encodings
+        self.cpu_budget = cpu_budget
+        self.average_cost = 0.0
+        self.lock = Lock()
+
+    def __call__(self, next_handler: Callable, request: Request) -> Response:
+        response = next_handler()
+        if (
+            response.status in STATUSES_WITHOUT_BODY
+            or "Content-Encoding" in response.headers
+            or not is_compressible(response.content_type)
+        ):
+            return response
+
+        streaming = isinstance(response, (StreamingResponse, FileResponse))
+        if not streaming:
+            body = response.body
+            if len(body) < self.minimum_size:
+                return response
+        elif int(response.headers.get("Content-Length", self.minimum_size)) < self.minimum_size:
+            return response
+
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding"), self.encodings)
+        if encoding is None:
+            add_vary(response.headers, "Accept-Encoding")
+            return response
+
+        headers = dict(response.headers)
+        add_vary(headers, "Accept-Encoding")
+        headers["Content-Encoding"] = encoding
+        headers.pop("Content-Length", None)
+        if not streaming:
+            return replace(response, headers=headers, content=self.compress(body, encoding))
+
+        if hasattr(response.content, "__aiter__"):
+            content = self.compress_async_chunks(response.content, encoding)
+        else:
+            content = self.compress_chunks(response.iter_body(), encoding)
+        return StreamingResponse(
+            headers=headers, content=content, status=response.status, content_type=response.content_type
+        )
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """
+        Compress the whole body.
+
+        :param body: Response body.
+        :param encoding: Content encoding.
+        :returns: Compressed body.
+        """
+        started = perf_counter()
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, WBITS[encoding])
+        data = compressor.compress(body) + compressor.flush()
+        self.account(perf_counter() - started, len(body))
+        return data
+
+    def compress_chunks(self, chunks: Iterable[Union[bytes, str]], encoding: str) -> Iterator[bytes]:
+        """
+        Compress streamed body chunk by chunk, flushing each chunk, so clients receive data without delays.
+
+        :param chunks: Response body chunks.
+        :param encoding: Content encoding.
+        :returns: Iterator of compressed chunks.
+        """
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, WBITS[encoding])
+        for chunk in chunks:
+            data = self.compress_chunk(compressor, encode_chunk(chunk))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    async def compress_async_chunks(
+        self, chunks: AsyncIterable[Union[bytes, str]], encoding: str
+    ) -> AsyncIterator[bytes]:
+        """
+        Compress async streamed body chunk by chunk, flushing each chunk, so clients receive data without delays.
+
+        :param chunks: Response body chunks.
+        :param encoding: Content encoding.
+        :returns: Async iterator of compressed chunks.
+        """
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, WBITS[encoding])
+        async for chunk in chunks:
+            data = self.compress_chunk(compressor, encode_chunk(chunk))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def compress_chunk(self, compressor: object, chunk: bytes) -> bytes:
+        """
+        Compress and flush a single chunk of streamed body.
+
+        :param compressor: Zlib compression object.
+        :param chunk: Body chunk.
+        :returns: Compressed data.
+        """
+        if not chunk:
+            return b""
+        started = perf_counter()
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.account(perf_counter() - started, len(chunk))
+        return data
+
+    def account(self, elapsed: float, size: int) -> None:
+        """
+        Update moving average of compression cost and adjust compression level to the CPU budget.
+
+        :param elapsed: Compression time in seconds.
+        :param size: Compressed data size in bytes.
+        """
+        if self.cpu_budget is None or not size:
+            return
+
+        cost = elapsed * MEBIBYTE / size
+        with self.lock:
+            average_cost = self.average_cost + EWMA_WEIGHT * (cost - self.average_cost)
+            level = self.level
+            if average_cost > self.cpu_budget and level > 1:
+                level -= 1
+                average_cost = self.cpu_budget
+            elif average_cost < self.cpu_budget / 2 and level < self.max_level:
+                level += 1
+                average_cost = self.cpu_budget / 2
+            self.average_cost = average_cost
+            self.level = max(1, min(level, self.max_level))
@@ -0,0 +1,232 @@
+"""
+Provides request metrics middleware with Prometheus text export.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from bisect import bisect_left
+from threading import Lock, get_ident, local
+from time import monotonic, perf_counter
+from typing import Callable, Iterable
+
+from ..context import Context
+from ..exceptions import HTTPException
+from ..http import Request, Response
+from ..routing import Route
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+OTHER_METHOD = "other"
+STANDARD_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "DELETE", "CONNECT", "OPTIONS", "TRACE", "PATCH"))
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def get_method_label(method: str, route: object) -> str:
+    """
+    Get the method label of a request, so clients sending arbitrary methods don't create new series.
+
+    :param method: Request method.
+    :param route: Matched route or None.
+    :returns: Standard method, a method explicitly allowed by the route, or "other".
+    """
+    if method in STANDARD_METHODS or (route is not None and method in route.methods):
+        return method
+    return OTHER_METHOD
+
+
+def escape_label(value: str) -> str:
+    """
+    Escape a label value for Prometheus text format.
+
+    :param value: Label value.
+    :returns: Escaped value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsMiddleware:
+    """
+    Middleware, which counts requests and measures their latency per route, method and status.
+
+    Requests are labelled by the endpoint template of the matched route (e.g. `/users/{user_id:int}`),
+    not by the requested endpoint, so the number of series stays bounded; unmatched requests are labelled `unmatched`.
+    For the same reason, methods other than standard ones and those explicitly allowed by the matched route
+    are labelled `other`.
+    Each thread updates its own shard without locking, shards are summed when metrics are collected.
+
+    With `directory`, each process periodically writes its samples to a file there, and collection
+    sums files of all processes, so any worker of the prefork server exports metrics of all of them.
+    The directory should be emptied before the server starts.
+
+    :param buckets: Upper bounds of latency histogram buckets in seconds.
+    :param directory: Directory shared by worker processes, metrics of the current process only if None.
+    :param flush_interval: Seconds between writes of process samples to `directory`.
+    :param prefix: Prefix of metric names.
+    """
+
+    def __init__(
+        self,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        directory: str = None,
+        flush_interval: float = 1.0,
+        prefix: str = "jetweb",
+    ):
+        self.buckets = tuple(sorted(bound for bound in buckets if bound != float("inf")))
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.prefix = prefix
+        self.shards = []
+        self.local = local()
+        self.lock = Lock()
+        self.flushed_at = monotonic()
+
+    def __call__(self, next_handler: Callable, request: Request, context: Context) -> Response:
+        started = perf_counter()
+        status = 500
+        try:
+            response = next_handler()
+            status = response.status
+            return response
+        except HTTPException as exception:
+            status = exception.status
+            raise
+        finally:
+            route = context.get("route")
+            if not isinstance(route, Route):
+                route = None
+            self.observe(
+                route.endpoint if route is not None else UNMATCHED_ROUTE,
+                get_method_label(request.method, route),
+                status,
+                perf_counter() - started,
+            )
+
+    def observe(self, route: str, method: str, status: int, duration: float) -> None:
+        """
+        Record a handled request in the shard of the current thread.
+
+        :param route: Route endpoint template.
+        :param method: Request method.
+        :param status: Response status.
+        :param duration: Handling time in seconds.
+        """
+        try:
+            shard = self.local.shard
+        except AttributeError:
+            shard = self.local.shard = {}
+            with self.lock:
+                self.shards.append(shard)
+
+        key = (route, method, status)
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0, 0.0] + [0] * (len(self.buckets) + 1)
+        values[0] += 1
+        values[1] += duration
+        values[2 + bisect_left(self.buckets, duration)] += 1
+
+        if self.directory is not None and monotonic() - self.flushed_at >= self.flush_interval:
+            self.flush()
+
+    def collect_local(self) -> dict[tuple[str, str, int], list]:
+        """
+        Sum shards of all threads of the current process.
+
+        :returns: Count, sum and per-bucket counts by route, method and status.
+        """
+        with self.lock:
+            shards = list(self.shards)
+
+        samples = {}
+        for shard in shards:
+            for key, values in list(shard.items()):
+                total = samples.get(key)
+                if total is None:
+                    samples[key] = list(values)
+                else:
+                    for index, value in enumerate(values):
+                        total[index] += value
+        return samples
+
+    def flush(self) -> None:
+        """
+        Write samples of the current process to its file in `directory`.
+        """
+        self.flushed_at = monotonic()
+        samples = [[*key, *values] for key, values in self.collect_local().items()]
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        temporary_path = f"{path}.{get_ident()}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(samples, file)
+        os.replace(temporary_path, path)
+
+    def collect(self) -> dict[tuple[str, str, int], list]:
+        """
+        Collect samples of the current process or, with `directory`, of all processes.
+
+        :returns: Count, sum and per-bucket counts by route, method and status.
+        """
+        if self.directory is None:
+            return self.collect_local()
+
+        self.flush()
+        samples = {}
+        for name in os.listdir(self.directory):
+            if not (name.startswith("metrics-") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as file:
+                    process_samples = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for route, method, status, *values in process_samples:
+                key = (route, method, status)
+                total = samples.get(key)
+                if total is None:
+                    samples[key] = values
+                else:
+                    for index, value in enumerate(values):
+                        total[index] += value
+        return samples
+
+    def render(self) -> str:
+        """
+        Format collected samples in Prometheus text format.
+
+        :returns: Exposition text with request counter and latency histogram.
+        """
+        requests_name = f"{self.prefix}_requests_total"
+        duration_name = f"{self.prefix}_request_duration_seconds"
+        samples = sorted(self.collect().items())
+
+        requests_lines = [
+            f"# HELP {requests_name} Total number of handled requests.",
+            f"# TYPE {requests_name} counter",
+        ]
+        duration_lines = [
+            f"# HELP {duration_name} Request handling time in seconds.",
+            f"# TYPE {duration_name} histogram",
+        ]
+        bounds = [*(repr(float(bound)) for bound in self.buckets), "+Inf"]
+        for (route, method, status), (count, duration, *bucket_counts) in samples:
+            labels = f'route="{escape_label(route)}",method="{escape_label(method)}",status="{status}"'
+            requests_lines.append(f"{requests_name}{{{labels}}} {count}")
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, bucket_counts):
+                cumulative += bucket_count
+                duration_lines.append(f'{duration_name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            duration_lines.append(f"{duration_name}_sum{{{labels}}} {duration!r}")
+            duration_lines.append(f"{duration_name}_count{{{labels}}} {count}")
+        return "\n".join(requests_lines + duration_lines) + "\n"
+
+    def export(self) -> Response:
+        """
+        Request handler, which exports metrics in Prometheus text format.
+
+        Mount it with e.g. `app.add_route("/metrics", metrics.export)`.
+
+        :returns: Response object.
+        """
+        return Response(content=self.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,259 @@
+"""
+Provides request coalescing (single-flight) for identical concurrent requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from functools import update_wrapper
+from threading import Event, Lock
+from typing import Awaitable, Callable, Hashable, Iterable, Mapping, Union
+
+from ..context import Context, inspect_params
+from ..exceptions import HTTPException
+from ..http import FileResponse, Request, Response, StreamingResponse
+from ..utils import is_async_callable
+
+CREDENTIAL_HEADERS = ("Authorization", "Cookie")
+
+
+def request_key(request: Request) -> Hashable:
+    """
+    Default single-flight key: request method, endpoint, query string and credentials,
+    so requests of different users are not coalesced.
+
+    :param request: Current request.
+    :returns: Key of identical requests.
+    """
+    return (
+        request.method,
+        request.endpoint,
+        tuple(sorted(request.query_params.multi_items())),
+        tuple(request.headers.get(name) for name in CREDENTIAL_HEADERS),
+    )
+
+
+def is_shareable(response: Response, leader_headers: Union[Mapping, None], headers: Union[Mapping, None]) -> bool:
+    """
+    Check whether the response of the first request can be shared with a waiting request.
+
+    Responses setting cookies are never shared. Responses varying on request headers are shared
+    only if the waiting request has the same values of these headers.
+
+    :param response: Response or HTTPException of the first request.
+    :param leader_headers: Headers of the first request, unknown if None.
+    :param headers: Headers of the waiting request, unknown if None.
+    :returns: True if the response can be shared.
+    """
+    vary = None
+    for name, value in response.headers.items():
+        name = name.lower()
+        if name == "set-cookie":
+            return False
+        if name == "vary":
+            vary = [header.strip() for header in value.split(",") if header.strip()]
+    if not vary:
+        return True
+    if "*" in vary or leader_headers is None or headers is None:
+        return False
+    return all(leader_headers.get(name) == headers.get(name) for name in vary)
+
+
+def share_response(response: Response) -> Response:
+    """
+    Copy a shared response for a waiting request, so changes of one request don't affect others.
+
+    :param response: Response of the first request.
+    :returns: Response copy with its own headers.
+    """
+    return replace(response, headers=dict(response.headers))
+
+
+class Flight:
+    """
+    Execution shared by identical concurrent requests.
+
+    :param headers: Headers of the first request, unknown if None.
+    """
+
+    def __init__(self, headers: Mapping = None):
+        self.done = Event()
+        self.response = None
+        self.exception = None
+        self.headers = headers
+
+    def result(self, headers: Mapping = None) -> Union[Response, None]:
+        """
+        Get a copy of the shared result.
+
+        :param headers: Headers of the waiting request, unknown if None.
+        :returns: Response copy or None if the response can't be shared or the first request was interrupted.
+        :raises HTTPException: Copy of HTTPException raised by the first request.
+        :raises Exception: Other exception raised by the first request.
+        """
+        if isinstance(self.exception, HTTPException):
+            if not is_shareable(self.exception, self.headers, headers):
+                return None
+            raise share_response(self.exception)
+        if self.exception is not None:
+            raise self.exception
+        if (
+            self.response is None
+            or isinstance(self.response, (StreamingResponse, FileResponse))
+            or not is_shareable(self.response, self.headers, headers)
+        ):
+            return None
+        return share_response(self.response)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: the first call runs the function, others wait for its response.
+
+    Waiting calls get copies of the response or of the raised HTTPException; other exceptions are re-raised as is.
+    Streaming and file responses, responses setting cookies and responses varying on request headers,
+    which differ from headers of the first call, can't be shared, so waiting calls run the function themselves.
+
+    :param timeout: Seconds to wait for the first call, after which a waiting call runs the function itself.
+    """
+
+    def __init__(self, timeout: float = 30.0):
+        self.timeout = timeout
+        self.flights = {}
+        self.async_flights = {}
+        self.lock = Lock()
+
+    def run(self, key: Hashable, function: Callable[[], object], headers: Mapping = None) -> Response:
+        """
+        Run function once for all concurrent calls with the same key.
+
+        :param key: Key of identical calls.
+        :param function: Function producing the response.
+        :param headers: Request headers, compared with headers of the first call for responses with Vary header.
+        :returns: Response object.
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight(headers)
+
+        if not leader:
+            if flight.done.wait(self.timeout):
+                response = flight.result(headers)
+                if response is not None:
+                    return response
+            return Response.ensure_response(function())
+
+        try:
+            flight.response = Response.ensure_response(function())
+            return flight.response
+        except Exception as exception:
+            flight.exception = exception
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+    async def run_async(self, key: Hashable, function: Callable[[], Awaitable], headers: Mapping = None) -> Response:
+        """
+        Await coroutine function once for all concurrent calls with the same key.
+
+        :param key: Key of identical calls.
+        :param function: Coroutine function producing the response.
+        :param headers: Request headers, compared with headers of the first call for responses with Vary header.
+        :returns: Response object.
+        """
+        future = self.async_flights.get(key)
+        if future is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(future), self.timeout)
+                response = future.result().result(headers)
+                if response is not None:
+                    return response
+            except asyncio.TimeoutError:
+                pass
+            return Response.ensure_response(await function())
+
+        future = self.async_flights[key] = asyncio.get_running_loop().create_future()
+        flight = Flight(headers)
+        try:
+            flight.response = Response.ensure_response(await function())
+            return flight.response
+        except Exception as exception:
+            flight.exception = exception
+            raise
+        finally:
+            del self.async_flights[key]
+            future.set_result(flight)
+
+
+class SingleFlightMiddleware:
+    """
+    Middleware, which coalesces identical concurrent requests, so the rest of the chain runs once for all of them.
+
+    :param key: Callable, which receives the request and returns the key of identical requests
+        (default: method, endpoint, query parameters and credentials). Requests with None key are not coalesced.
+    :param timeout: Seconds to wait for the first request, after which a waiting request is handled separately.
+    :param methods: Coalesced request methods.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[Request], Hashable] = request_key,
+        timeout: float = 30.0,
+        methods: Iterable[str] = ("GET", "HEAD"),
+    ):
+        self.key = key
+        self.methods = frozenset(methods)
+        self.single_flight = SingleFlight(timeout)
+
+    def __call__(self, next_handler: Callable, request: Request) -> Response:
+        if request.method not in self.methods:
+            return next_handler()
+        key = self.key(request)
+        if key is None:
+            return next_handler()
+        return self.single_flight.run(key, next_handler, request.headers)
+
+
+def single_flight(
+    handler: Callable = None, key: Callable[[Request], Hashable] = request_key, timeout: float = 30.0
+) -> Callable:
+    """
+    Decorator, which coalesces identical concurrent requests of a single route.
+
+    Must be applied below the route decorator. Sync and async handlers are supported.
+
+    :param handler: Request handler.
+    :param key: Callable, which receives the request and returns the key of identical requests
+        (default: method, endpoint, query parameters and credentials). Requests with None key are not coalesced.
+    :param timeout: Seconds to wait for the first request, after which a waiting request is handled separately.
+    :returns: Wrapped request handler or decorator, if handler is not passed.
+    """
+    if handler is None:
+        return lambda handler: single_flight(handler, key, timeout)
+
+    flights = SingleFlight(timeout)
+    inspect_params(handler)
+
+    if is_async_callable(handler):
+        async def wrapper(request: Request, context: Context) -> Response:
+            flight_key = key(request)
+            if flight_key is None:
+                return await handler(**context.params_for(handler))
+            return await flights.run_async(
+                flight_key, lambda: handler(**context.params_for(handler)), request.headers
+            )
+    else:
+        def wrapper(request: Request, context: Context) -> Response:
+            flight_key = key(request)
+            if flight_key is None:
+                return handler(**context.params_for(handler))
+            return flights.run(flight_key, lambda: handler(**context.params_for(handler)), request.headers)
+
+    update_wrapper(wrapper, handler)
+    del wrapper.__wrapped__
+    return wrapper
@@ -0,0 +1,137 @@
+"""
+Provides compilation of middleware chains.
+"""
+
+from asyncio import get_running_loop
+from functools import partial
+from typing import Awaitable, Callable, Sequence
+
+from .context import Context
+from .http import Response
+from .instrumentation import get_stage_name
+from .utils import WaitingThread, is_async_callable, run_sync
+
+Pipeline = Callable[[Context], Response]
+AsyncPipeline = Callable[[Context], Awaitable[Response]]
+
+
+def wrap_middleware(middleware: Callable, next_pipeline: Pipeline) -> Pipeline:
+    """
+    Wrap a middleware into a pipeline step that calls the next step as its next handler.
+
+    :param middleware: Middleware.
+    :param next_pipeline: Next pipeline step.
+    :returns: Pipeline step.
+    """
+    def pipeline(context: Context) -> Response:
+        next_handler = partial(next_pipeline, context)
+        return Response.ensure_response(middleware(next_handler, **context.params_for(middleware)))
+    return pipeline
+
+
+def wrap_timed_middleware(middleware: Callable, next_pipeline: Pipeline) -> Pipeline:
+    """
+    Wrap a middleware into a pipeline step, which records time spent in the middleware in `timings` context value.
+
+    :param middleware: Middleware.
+    :param next_pipeline: Next pipeline step.
+    :returns: Pipeline step.
+    """
+    step = wrap_middleware(middleware, next_pipeline)
+    stage = get_stage_name(middleware)
+
+    def pipeline(context: Context) -> Response:
+        timings = context["timings"]
+        timings.enter(stage)
+        try:
+            return step(context)
+        finally:
+            timings.exit()
+    return pipeline
+
+
+def compile_pipeline(middlewares: Sequence[Callable], handler: Pipeline, timed: bool = False) -> Pipeline:
+    """
+    Compile middlewares and a final handler into a reusable pipeline.
+
+    :param middlewares: Middlewares in order of registration.
+    :param handler: Final pipeline step, called after all middlewares.
+    :param timed: Record time spent in each middleware if True.
+    :returns: Pipeline that accepts context of the current request.
+    """
+    wrap = wrap_timed_middleware if timed else wrap_middleware
+    pipeline = handler
+    for middleware in reversed(middlewares):
+        pipeline = wrap(middleware, pipeline)
+    return pipeline
+
+
+def wrap_async_middleware(middleware: Callable, next_pipeline: AsyncPipeline) -> AsyncPipeline:
+    """
+    Wrap a sync or async middleware into an async pipeline step.
+
+    Async middlewares await their next handler. Sync middlewares run in the thread pool
+    and get a blocking next handler, which runs the rest of the pipeline in the event loop,
+    while sync middlewares and handlers of the rest run in the waiting thread.
+
+    :param middleware: Sync or async middleware.
+    :param next_pipeline: Next async pipeline step.
+    :returns: Async pipeline step.
+    """
+    if is_async_callable(middleware):
+        async def pipeline(context: Context) -> Response:
+            next_handler = partial(next_pipeline, context)
+            return Response.ensure_response(await context.call_async(middleware, next_handler))
+        return pipeline
+
+    async def pipeline(context: Context) -> Response:
+        loop = get_running_loop()
+
+        def next_handler() -> Response:
+            return WaitingThread().wait(next_pipeline(context), loop)
+
+        def call_middleware() -> Response:
+            return middleware(next_handler, **context.params_for(middleware))
+
+        return Response.ensure_response(await run_sync(call_middleware))
+    return pipeline
+
+
+def wrap_timed_async_middleware(middleware: Callable, next_pipeline: AsyncPipeline) -> AsyncPipeline:
+    """
+    Wrap a sync or async middleware into an async pipeline step,
+    which records time spent in the middleware in `timings` context value.
+
+    :param middleware: Sync or async middleware.
+    :param next_pipeline: Next async pipeline step.
+    :returns: Async pipeline step.
+    """
+    step = wrap_async_middleware(middleware, next_pipeline)
+    stage = get_stage_name(middleware)
+
+    async def pipeline(context: Context) -> Response:
+        timings = context["timings"]
+        timings.enter(stage)
+        try:
+            return await step(context)
+        finally:
+            timings.exit()
+    return pipeline
+
+
+def compile_async_pipeline(
+    middlewares: Sequence[Callable], handler: AsyncPipeline, timed: bool = False
+) -> AsyncPipeline:
+    """
+    Compile sync or async middlewares and a final async handler into a reusable async pipeline.
+
+    :param middlewares: Middlewares in order of registration.
+    :param handler: Final async pipeline step, called after all middlewares.
+    :param timed: Record time spent in each middleware if True.
+    :returns: Async pipeline that accepts context of the current request.
+    """
+    wrap = wrap_timed_async_middleware if timed else wrap_async_middleware
+    pipeline = handler
+    for middleware in reversed(middlewares):
+        pipeline = wrap(middleware, pipeline)
+    return pipeline
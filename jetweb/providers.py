@@ -0,0 +1,126 @@
+"""
+Provides lazily evaluated dependency providers for context injection.
+"""
+
+from __future__ import annotations
+
+from inspect import isgeneratorfunction
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Generator, Union
+
+from .context import inspect_params
+
+if TYPE_CHECKING:
+    from .context import Context
+
+APP_SCOPE = "app"
+REQUEST_SCOPE = "request"
+TRANSIENT_SCOPE = "transient"
+SCOPES = (APP_SCOPE, REQUEST_SCOPE, TRANSIENT_SCOPE)
+MISSING = object()
+
+
+def close_generator(generator: Generator) -> None:
+    """
+    Run teardown code of a generator provider after its single yield.
+
+    :param generator: Started generator.
+    :raises RuntimeError: If generator yields more than once.
+    """
+    try:
+        next(generator)
+    except StopIteration:
+        return
+    raise RuntimeError("Provider must yield only once")
+
+
+class Provider:
+    """
+    Creates a context value only when a handler, middleware or another provider asks for it by name.
+
+    Provider parameters are injected from context like handler parameters, so providers can depend on
+    request values, global context and other providers. Generator functions yield the value
+    and run code after `yield` as teardown.
+
+    Scopes:
+
+    * `app` — created once and shared by all requests, torn down by `close()`.
+    * `request` — created once per request and torn down when the request context is cleared.
+    * `transient` — created on each injection, generators are torn down when the request context is cleared.
+
+    :param function: Callable or generator function creating the value.
+    :param scope: Value lifetime: app, request or transient.
+    :raises ValueError: If provider isn't callable or scope is unknown.
+    """
+
+    def __init__(self, function: Callable, scope: str = REQUEST_SCOPE):
+        if not callable(function):
+            raise ValueError("Provider must be callable")
+        if scope not in SCOPES:
+            raise ValueError("Scope must be app, request or transient")
+
+        inspect_params(function)
+        self.function = function
+        self.scope = scope
+        self.is_generator = isgeneratorfunction(function)
+        self.value = MISSING
+        self.teardown = None
+        self.lock = Lock()
+
+    def create(self, context: Context) -> tuple[object, Union[Callable[[], None], None]]:
+        """
+        Create a new value, injecting its parameters from context.
+
+        :param context: Context values for current request.
+        :returns: Value and its teardown callable, if provider is a generator function.
+        """
+        params = context.params_for(self.function)
+        if not self.is_generator:
+            return self.function(**params), None
+
+        generator = self.function(**params)
+        return next(generator), lambda: close_generator(generator)
+
+    def provide(self, context: Context, name: str) -> object:
+        """
+        Get the value for a request according to the provider scope.
+
+        :param context: Context values for current request.
+        :param name: Value name.
+        :returns: Provided value.
+        """
+        if self.scope == APP_SCOPE:
+            return self.get_shared(context)
+
+        value, teardown = self.create(context)
+        if teardown is not None:
+            context.add_teardown(teardown)
+        if self.scope == REQUEST_SCOPE:
+            context[name] = value
+        return value
+
+    def get_shared(self, context: Context) -> object:
+        """
+        Get the app-scoped value, creating it on first use.
+
+        :param context: Context values for the request, which uses the value first.
+        :returns: Shared value.
+        """
+        value = self.value
+        if value is MISSING:
+            with self.lock:
+                value = self.value
+                if value is MISSING:
+                    value, self.teardown = self.create(context)
+                    self.value = value
+        return value
+
+    def close(self) -> None:
+        """
+        Tear down the app-scoped value, so it's created again on next use.
+        """
+        with self.lock:
+            teardown, self.teardown = self.teardown, None
+            self.value = MISSING
+        if teardown is not None:
+            teardown()
@@ -1,9 +1,11 @@
 from .route import Route
 from .route_table import RouteTable
+from .route_tree import RouteTree
 from .router import Router
 
 __all__ = [
     "Route",
     "RouteTable",
+    "RouteTree",
     "Router",
 ]
@@ -4,12 +4,13 @@ Provides route class.
 
 from __future__ import annotations
 
+from copy import copy
 from dataclasses import dataclass, field
 from re import Pattern
 from typing import Callable, Iterable
 
 from ..converters import CONVERTERS
-from ..utils import convert_path_params, create_pattern, normalize_endpoint
+from ..utils import create_converters, create_pattern, normalize_endpoint
 
 
 @dataclass
@@ -20,15 +21,40 @@ class Route:
     :param endpoint: Route endpoint. Can contain optional path parameters with converter names.
     :param handler: Request handler.
     :param methods: Allowed request methods.
+    :param max_body_size: Maximum allowed request body size in bytes, application default if None.
+    :param middlewares: Middlewares of the routers the route was included from, run after routing.
     """
     endpoint: str
     handler: Callable
     methods: Iterable[str]
+    max_body_size: int = None
+    middlewares: tuple[Callable, ...] = ()
+    pipeline: Callable = field(init=False, default=None, repr=False, compare=False)
+    async_pipeline: Callable = field(init=False, default=None, repr=False, compare=False)
     _pattern: Pattern = field(init=False, repr=False)
+    _converters: tuple[tuple[str, Callable], ...] = field(init=False, repr=False)
 
     def __post_init__(self):
         self.endpoint = normalize_endpoint(self.endpoint)
         self._pattern = create_pattern(self.endpoint, CONVERTERS)
+        self._converters = create_converters(self.endpoint, CONVERTERS)
+
+    def mount(self, prefix: str, middlewares: tuple[Callable, ...]) -> Route:
+        """
+        Create a copy of the route for a router mounted under a prefix, without recompiling its pattern.
+
+        The copy keeps matching endpoints relative to the mount, as its route table receives them.
+
+        :param prefix: Prefix of the including router.
+        :param middlewares: Middlewares of the mounted router.
+        :returns: Route with prefixed endpoint and mount middlewares.
+        """
+        route = copy(self)
+        route.endpoint = normalize_endpoint(prefix + self.endpoint)
+        route.middlewares = (*middlewares, *self.middlewares)
+        route.pipeline = None
+        route.async_pipeline = None
+        return route
 
     def match_endpoint(self, endpoint: str) -> tuple[bool, dict]:
         """
@@ -38,9 +64,21 @@ class Route:
         :returns: True if endpoint is matched and parsed path parameters.
         """
         match = self._pattern.match(endpoint)
-        path_params = match.groupdict() if match else {}
+        if not match:
+            return False, {}
 
-        return bool(match), convert_path_params(self.endpoint, path_params, CONVERTERS)
+        return True, self.convert_path_params(match.groupdict())
+
+    def convert_path_params(self, path_params: dict) -> dict:
+        """
+        Convert matched path parameters to the types of this route's converters.
+
+        :param path_params: Path parameters matched as strings.
+        :returns: Converted path parameters.
+        """
+        for param_name, convert in self._converters:
+            path_params[param_name] = convert(path_params[param_name])
+        return path_params
 
     def match_method(self, method: str) -> bool:
         """
@@ -4,10 +4,45 @@ Provides routing table class.
 
 from __future__ import annotations
 
-from typing import Callable, Iterable, Union
+from typing import Callable, Iterable, Sequence, Union
 
 from ..exceptions import HTTPException
+from ..utils import has_path_params, normalize_endpoint
 from .route import Route
+from .route_tree import RouteTree
+
+
+class Mount:
+    """
+    Route table of a router mounted under a prefix.
+
+    :param prefix: Prefix of the including router, removed from endpoints before lookup in the mounted table.
+    :param route_table: Mounted route table.
+    :param middlewares: Middlewares of the mounted router.
+    """
+
+    def __init__(self, prefix: str, route_table: RouteTable, middlewares: Sequence[Callable] = ()):
+        self.prefix = prefix
+        self.route_table = route_table
+        self.middlewares = tuple(middlewares)
+        self.routes = {}
+
+    def match_route(self, endpoint: str, method: str) -> tuple[Union[Route, None], dict, Union[int, None]]:
+        """
+        Match a route in the mounted table.
+
+        :param endpoint: Request endpoint.
+        :param method: Request method.
+        :returns: Prefixed route, parsed path parameters and error status (404 or 405), if the request doesn't match.
+        """
+        route, path_params, status = self.route_table.match_route(endpoint[len(self.prefix):], method)
+        if route is None:
+            return route, path_params, status
+
+        mounted_route = self.routes.get(id(route))
+        if mounted_route is None:
+            mounted_route = self.routes[id(route)] = route.mount(self.prefix, self.middlewares)
+        return mounted_route, path_params, status
 
 
 class RouteTable:
@@ -19,21 +54,111 @@ class RouteTable:
 
     def __init__(self):
         self.routes = []
+        self.route_tree = RouteTree()
+        self.static_routes = {}
+        self.mounts = {}
 
-    def include(self, prefix: str, route_table: RouteTable) -> None:
+    def append(self, route: Route) -> None:
+        """
+        Store a route, keeping registration order for lookup precedence.
+
+        Routes without path parameters are also indexed by endpoint with precomputed allowed methods,
+        unless an earlier registered route already matches the same endpoint.
+
+        :param route: Route for storing.
+        """
+        if not has_path_params(route.endpoint) and self.route_tree.find(route.endpoint)[0] is None:
+            methods = None if "*" in route.methods else frozenset(route.methods)
+            self.static_routes[route.endpoint] = (route, methods)
+
+        self.route_tree.insert(len(self.routes), route)
+        self.routes.append(route)
+
+    def include(self, prefix: str, route_table: RouteTable, middlewares: Sequence[Callable] = ()) -> None:
         """
         Include routes from another table under a prefix.
 
         :param prefix: Endpoint prefix.
         :param route_table: Route table with routes for including.
+        :param middlewares: Middlewares of the included router, which wrap middlewares of included routes.
         """
+        for key, mount in route_table.mounts.items():
+            self.add_mount(
+                normalize_endpoint(prefix + key),
+                Mount(
+                    normalize_endpoint(prefix + mount.prefix).rstrip("/"),
+                    mount.route_table,
+                    (*middlewares, *mount.middlewares),
+                ),
+            )
+
         for route in route_table.routes:
-            self.routes.append(
-                Route(endpoint=prefix + route.endpoint, handler=route.handler, methods=route.methods)
+            self.append(
+                Route(
+                    endpoint=prefix + route.endpoint,
+                    handler=route.handler,
+                    methods=route.methods,
+                    max_body_size=route.max_body_size,
+                    middlewares=(*middlewares, *route.middlewares),
+                )
             )
 
+    def mount(
+        self, prefix: str, route_table: RouteTable, router_prefix: str, middlewares: Sequence[Callable] = ()
+    ) -> bool:
+        """
+        Mount routes from another table under a prefix without copying them.
+
+        Requests under the full prefix are looked up in the mounted table first, so lookup cost depends on
+        the depth of mounts rather than the total number of routes. Routers without a static prefix
+        can't be selected by prefix and aren't mounted.
+
+        :param prefix: Prefix of the including router.
+        :param route_table: Route table of the mounted router.
+        :param router_prefix: Prefix of the mounted router, already included in endpoints of its routes.
+        :param middlewares: Middlewares of the mounted router.
+        :returns: True if the table is mounted, False if its routes must be included instead.
+        """
+        prefix = prefix.rstrip("/")
+        key = normalize_endpoint(prefix + router_prefix).rstrip("/")
+        if not key or has_path_params(key) or key in self.mounts:
+            return False
+
+        self.add_mount(key, Mount(prefix, route_table, middlewares))
+        return True
+
+    def add_mount(self, key: str, mount: Mount) -> None:
+        """
+        Store a mount, keeping the first mount of a prefix.
+
+        :param key: Full prefix of mounted routes.
+        :param mount: Mount.
+        """
+        self.mounts.setdefault(key, mount)
+
+    def find_mount(self, endpoint: str) -> Union[Mount, None]:
+        """
+        Find the mount with the longest prefix of the endpoint, checking one candidate per endpoint segment.
+
+        :param endpoint: Request endpoint.
+        :returns: Mount or None.
+        """
+        mounts = self.mounts
+        index = len(endpoint)
+        while index > 0:
+            mount = mounts.get(endpoint[:index])
+            if mount is not None:
+                return mount
+            index = endpoint.rfind("/", 0, index)
+        return None
+
     def add_route(
-        self, prefix: str, endpoint: str, handler: Callable, methods: Union[Iterable[str], None] = None
+        self,
+        prefix: str,
+        endpoint: str,
+        handler: Callable,
+        methods: Union[Iterable[str], None] = None,
+        max_body_size: int = None,
     ) -> None:
         """
         Register a new route.
@@ -42,15 +167,73 @@ class RouteTable:
         :param endpoint: Route endpoint.
         :param handler: Request handler.
         :param methods: Allowed request methods (default: ["GET"]). Adds "OPTIONS" if GET is allowed.
+        :param max_body_size: Maximum allowed request body size in bytes, application default if None.
         """
         methods = [method.upper() for method in (methods or ["GET"])]
         if "GET" in methods:
             methods.append("OPTIONS")
 
-        self.routes.append(
-            Route(endpoint=prefix + endpoint, handler=handler, methods=methods)
+        self.append(
+            Route(endpoint=prefix + endpoint, handler=handler, methods=methods, max_body_size=max_body_size)
         )
 
+    def match_route(self, endpoint: str, method: str) -> tuple[Union[Route, None], dict, Union[int, None]]:
+        """
+        Match a route for the given endpoint and method without raising exceptions.
+
+        :param endpoint: Request endpoint.
+        :param method: Request method.
+        :returns: Route, parsed path parameters and error status (404 or 405), if the request doesn't match.
+        """
+        if self.mounts:
+            mount = self.find_mount(endpoint)
+            if mount is not None:
+                route, path_params, status = mount.match_route(endpoint, method)
+                if route is not None:
+                    return route, path_params, status
+                own_route, own_path_params, own_status = self.match_own_route(endpoint, method)
+                if own_route is not None or own_status == 405:
+                    return own_route, own_path_params, own_status
+                return None, {}, status
+        return self.match_own_route(endpoint, method)
+
+    def match_own_route(self, endpoint: str, method: str) -> tuple[Union[Route, None], dict, Union[int, None]]:
+        """
+        Match a route of this table, not of mounted ones.
+
+        :param endpoint: Request endpoint.
+        :param method: Request method.
+        :returns: Route, parsed path parameters and error status (404 or 405), if the request doesn't match.
+        """
+        static_route = self.static_routes.get(endpoint)
+        if static_route is not None:
+            route, methods = static_route
+            if methods is not None and method not in methods:
+                return None, {}, 405
+            return route, {}, None
+
+        route, path_params = self.route_tree.find(endpoint)
+        if route is None:
+            return None, {}, 404
+        if not route.match_method(method):
+            return None, {}, 405
+        return route, path_params, None
+
+    def find_route(self, endpoint: str, method: str) -> tuple[Route, dict]:
+        """
+        Find a route for the given endpoint and method.
+
+        :param endpoint: Request endpoint.
+        :param method: Request method.
+        :returns: Route and parsed path parameters.
+        :raises HTTPException(404): If no route matches for endpoint.
+        :raises HTTPException(405): If no method matches for matched route.
+        """
+        route, path_params, status = self.match_route(endpoint, method)
+        if status is not None:
+            raise HTTPException(status=status)
+        return route, path_params
+
     def find_handler(self, endpoint: str, method: str) -> tuple[Callable, dict]:
         """
         Find a request handler for the given endpoint and method.
@@ -61,10 +244,5 @@ class RouteTable:
         :raises HTTPException(404): If no route matches for endpoint.
         :raises HTTPException(405): If no method matches for matched route.
         """
-        for route in self.routes:
-            matched, path_params = route.match_endpoint(endpoint)
-            if matched:
-                if route.match_method(method):
-                    return route.handler, path_params
-                raise HTTPException(status=405)
-        raise HTTPException(status=404)
+        route, path_params = self.find_route(endpoint, method)
+        return route.handler, path_params
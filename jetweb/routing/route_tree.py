@@ -0,0 +1,129 @@
+"""
+Provides segment-based route tree.
+"""
+
+from __future__ import annotations
+
+from typing import Union
+
+from ..converters import CONVERTERS
+from ..utils import create_pattern, has_path_params, spans_segments
+from .route import Route
+
+Candidate = tuple[int, Route, dict]
+
+
+class RouteNode:
+    """
+    Single endpoint segment of the route tree.
+
+    :param first: Registration index of the first route stored in this subtree.
+    """
+
+    def __init__(self, first: int):
+        self.first = first
+        self.static = {}
+        self.dynamic = {}
+        self.routes = []
+        self.greedy = []
+
+    def child(self, segment: str, index: int) -> RouteNode:
+        """
+        Get or create child node for the route segment.
+
+        Static segments are stored in a dict, segments with path parameters keep their own pattern.
+
+        :param segment: Route endpoint segment.
+        :param index: Registration index of the inserted route.
+        :returns: Child node.
+        """
+        if not has_path_params(segment):
+            return self.static.setdefault(segment, RouteNode(index))
+
+        if segment not in self.dynamic:
+            self.dynamic[segment] = (create_pattern(segment, CONVERTERS), RouteNode(index))
+        return self.dynamic[segment][1]
+
+
+class RouteTree:
+    """
+    Prefix tree of routes split by endpoint segments.
+
+    Static segments are resolved with dict lookups, segments with path parameters are matched
+    with their own patterns, and routes with parameters spanning several segments fall back
+    to a full match at the deepest static node. When several routes match, the earliest registered wins.
+    """
+
+    def __init__(self):
+        self.root = RouteNode(0)
+
+    def insert(self, index: int, route: Route) -> None:
+        """
+        Insert a route into the tree.
+
+        :param index: Registration index of the route.
+        :param route: Route for inserting.
+        """
+        node = self.root
+        for segment in route.endpoint[1:].split("/"):
+            if spans_segments(segment, CONVERTERS):
+                node.greedy.append((index, route))
+                return
+            node = node.child(segment, index)
+        node.routes.append((index, route))
+
+    def find(self, endpoint: str) -> tuple[Union[Route, None], dict]:
+        """
+        Find the earliest registered route that matches the endpoint.
+
+        :param endpoint: Request endpoint.
+        :returns: Matched route (or None) and parsed path parameters.
+        """
+        if not endpoint.startswith("/"):
+            return None, {}
+
+        candidate = self._search(self.root, endpoint[1:].split("/"), 0, endpoint, {}, None)
+        if candidate is None:
+            return None, {}
+
+        _, route, path_params = candidate
+        return route, path_params
+
+    def _search(
+        self,
+        node: RouteNode,
+        segments: list[str],
+        position: int,
+        endpoint: str,
+        path_params: dict,
+        best: Union[Candidate, None],
+    ) -> Union[Candidate, None]:
+        if best is not None and node.first >= best[0]:
+            return best
+
+        for index, route in node.greedy:
+            if best is not None and index >= best[0]:
+                break
+            matched, greedy_params = route.match_endpoint(endpoint)
+            if matched:
+                best = (index, route, greedy_params)
+                break
+
+        if position == len(segments):
+            if node.routes and (best is None or node.routes[0][0] < best[0]):
+                index, route = node.routes[0]
+                best = (index, route, route.convert_path_params(dict(path_params)))
+            return best
+
+        segment = segments[position]
+        child = node.static.get(segment)
+        if child is not None:
+            best = self._search(child, segments, position + 1, endpoint, path_params, best)
+
+        for pattern, child in node.dynamic.values():
+            match = pattern.match(segment)
+            if match:
+                best = self._search(
+                    child, segments, position + 1, endpoint, {**path_params, **match.groupdict()}, best
+                )
+        return best
@@ -5,9 +5,12 @@ Provides router class.
 from __future__ import annotations
 
 from inspect import isclass
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Union
 
+from ..context import inspect_params
+from ..exceptions import HTTPException
 from ..handlers import BaseHandler
+from ..providers import REQUEST_SCOPE, Provider
 from .route_table import RouteTable
 
 
@@ -15,7 +18,7 @@ class Router:
     """
     Router for managing request handling.
 
-    Supports route, middleware and exception handler registration.
+    Supports route, middleware, exception handler and provider registration.
 
     :param prefix: Optional URL prefix for all routes.
     """
@@ -24,17 +27,30 @@ class Router:
         self.prefix = prefix or ""
         self.middlewares = []
         self.exception_handlers = {}
+        self.resolved_exception_handlers = {}
+        self.providers = {}
         self.route_table = RouteTable()
 
-    def include(self, router: Router) -> None:
+    def include(self, router: Router, mount: bool = False) -> None:
         """
-        Include routes, middlewares, and handlers from another router.
+        Include routes, handlers and providers from another router.
+
+        Middlewares of the included router stay attached to its routes: they run only for requests
+        matched to these routes, after routing and inside middlewares of the including router.
+
+        In mount mode, routes aren't copied: requests under the router prefix are dispatched to its route table,
+        which takes precedence over other routes under the prefix, and routes registered on the router later
+        are available too. Routers without a static prefix, or with a prefix that is already mounted, are included
+        as in the default mode.
 
         :param router: Router for including.
+        :param mount: Mount the router under its prefix instead of copying its routes.
         """
-        self.middlewares.extend(router.middlewares)
         self.exception_handlers.update(router.exception_handlers)
-        self.route_table.include(self.prefix, router.route_table)
+        self.resolved_exception_handlers = {}
+        self.providers.update(router.providers)
+        if not mount or not self.route_table.mount(self.prefix, router.route_table, router.prefix, router.middlewares):
+            self.route_table.include(self.prefix, router.route_table, router.middlewares)
 
     def add_middleware(self, middleware: Callable) -> None:
         """
@@ -49,6 +65,7 @@ class Router:
         if not callable(middleware):
             raise ValueError("Middleware must be callable")
 
+        inspect_params(middleware)
         self.middlewares.append(middleware)
 
     def middleware(self, middleware: Callable) -> Callable:
@@ -58,35 +75,92 @@ class Router:
         self.add_middleware(middleware)
         return middleware
 
-    def add_exception_handler(self, status: int, exception_handler: Callable) -> None:
+    def add_exception_handler(
+        self, status_or_class: Union[int, type[BaseException]], exception_handler: Callable
+    ) -> None:
         """
-        Register an exception handler for the status.
+        Register an exception handler for the status or the exception class.
 
-        :param status: Exception status.
+        Handlers of exception classes also handle exceptions of their subclasses.
+
+        :param status_or_class: Status of HTTPException or exception class.
         :param exception_handler: Exception handler.
-        :raises ValueError: If exception handler is not callable.
+        :raises ValueError: If exception handler is not callable or registered for neither status nor class.
         """
+        if not isinstance(status_or_class, int) and not (
+            isclass(status_or_class) and issubclass(status_or_class, BaseException)
+        ):
+            raise ValueError("Exception handler must be registered for a status or an exception class")
         if not callable(exception_handler):
             raise ValueError("Exception handler must be callable")
 
-        self.exception_handlers[status] = exception_handler
+        inspect_params(exception_handler)
+        self.exception_handlers[status_or_class] = exception_handler
+        self.resolved_exception_handlers = {}
 
-    def exception_handler(self, status: int) -> Callable:
+    def exception_handler(self, status_or_class: Union[int, type[BaseException]]) -> Callable:
         """
         Decorator for registering exception handler.
         """
         def decorator(exception_handler: Callable) -> Callable:
-            self.add_exception_handler(status, exception_handler)
+            self.add_exception_handler(status_or_class, exception_handler)
             return exception_handler
         return decorator
 
-    def add_route(self, endpoint: str, handler: Callable, methods: Iterable[str] = None) -> None:
+    def find_exception_handler(self, exception_type: type[BaseException]) -> Union[Callable, None]:
+        """
+        Find the handler of the closest exception class in the MRO of the exception type, caching the result per type.
+
+        Bases of HTTPException are not searched for HTTP exceptions, so e.g. a handler of `Exception`
+        doesn't handle 404 errors.
+
+        :param exception_type: Type of the raised exception.
+        :returns: Exception handler or None if none is registered.
+        """
+        resolved = self.resolved_exception_handlers
+        try:
+            return resolved[exception_type]
+        except KeyError:
+            pass
+
+        exception_handler = None
+        for cls in exception_type.__mro__:
+            exception_handler = self.exception_handlers.get(cls)
+            if exception_handler is not None or cls is HTTPException:
+                break
+        resolved[exception_type] = exception_handler
+        return exception_handler
+
+    def add_provider(self, name: str, provider: Callable, scope: str = REQUEST_SCOPE) -> None:
+        """
+        Register a provider, which creates a context value when it's requested by name.
+
+        :param name: Value name.
+        :param provider: Callable or generator function creating the value, its parameters are injected from context.
+        :param scope: Value lifetime: "app", "request" or "transient".
+        :raises ValueError: If provider is not callable or scope is unknown.
+        """
+        self.providers[name] = Provider(provider, scope)
+
+    def provider(self, provider: Callable = None, name: str = None, scope: str = REQUEST_SCOPE) -> Callable:
+        """
+        Decorator for registering provider, named after the decorated function by default.
+        """
+        if provider is None:
+            return lambda provider: self.provider(provider, name, scope)
+        self.add_provider(name or provider.__name__, provider, scope)
+        return provider
+
+    def add_route(
+        self, endpoint: str, handler: Callable, methods: Iterable[str] = None, max_body_size: int = None
+    ) -> None:
         """
         Register a request handler for endpoint pattern and allowed methods.
 
         :param endpoint: Route endpoint.
         :param handler: Request handler.
         :param methods: Allowed request methods.
+        :param max_body_size: Maximum allowed request body size in bytes, application default if None.
         :raises ValueError: If class-based handler is not subclass of BaseHandler or handler is not callable.
         """
         if isclass(handler):
@@ -99,14 +173,15 @@ class Router:
         if not callable(handler):
             raise ValueError("Handler must be callable")
 
-        self.route_table.add_route(self.prefix, endpoint, handler, methods)
+        inspect_params(handler)
+        self.route_table.add_route(self.prefix, endpoint, handler, methods, max_body_size)
 
-    def route(self, endpoint: str, methods: Iterable[str] = None) -> Callable:
+    def route(self, endpoint: str, methods: Iterable[str] = None, max_body_size: int = None) -> Callable:
         """
         Decorator for registering request handler.
         """
         def decorator(handler: Callable) -> Callable:
-            self.add_route(endpoint, handler, methods)
+            self.add_route(endpoint, handler, methods, max_body_size)
             return handler
         return decorator
 
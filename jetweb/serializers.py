@@ -0,0 +1,167 @@
+"""
+Provides response serializers and their registry with content negotiation.
+"""
+
+from __future__ import annotations
+
+from json import JSONEncoder
+from threading import Lock
+from typing import Callable, Iterable, Union
+
+JSON_CONTENT_TYPE = "application/json"
+MAX_NEGOTIATED = 1024
+
+
+class Serializer:
+    """
+    Serializes response content of a content type into bytes.
+
+    Any callable returning bytes or text can be plugged in, e.g. `Serializer("application/json", orjson.dumps)`.
+
+    :param content_type: MIME type of serialized content.
+    :param dumps: Callable, which receives response content and returns bytes or text.
+    """
+
+    def __init__(self, content_type: str, dumps: Callable[[object], Union[bytes, str]]):
+        self.content_type = content_type
+        self.dumps = dumps
+
+    def serialize(self, content: object) -> bytes:
+        """
+        Serialize response content.
+
+        :param content: Response content.
+        :returns: Encoded body.
+        """
+        data = self.dumps(content)
+        return data.encode() if isinstance(data, str) else data
+
+
+class JSONSerializer(Serializer):
+    """
+    Serializes content into compact JSON with a single reusable encoder.
+
+    :param content_type: MIME type of serialized content.
+    :param options: Options of `json.JSONEncoder`, by default non-ASCII characters are not escaped
+        and no whitespace is added after separators.
+    """
+
+    def __init__(self, content_type: str = JSON_CONTENT_TYPE, **options):
+        options.setdefault("ensure_ascii", False)
+        options.setdefault("separators", (",", ":"))
+        super().__init__(content_type, JSONEncoder(**options).encode)
+
+
+def parse_content_type(content_type: Union[str, None]) -> str:
+    """
+    Get lower-cased MIME type without parameters.
+
+    :param content_type: Content-Type value, e.g. "application/json; charset=utf-8".
+    :returns: MIME type, e.g. "application/json".
+    """
+    return (content_type or "").partition(";")[0].strip().lower()
+
+
+def negotiate_content_type(accept: Union[str, None], content_types: Iterable[str]) -> Union[str, None]:
+    """
+    Choose the most preferred supported content type from Accept header.
+
+    :param accept: Accept header value.
+    :param content_types: Supported content types in order of server preference.
+    :returns: Content type or None if the client accepts none of them.
+    """
+    content_types = tuple(content_types)
+    if not accept:
+        return content_types[0] if content_types else None
+
+    qualities = {}
+    for item in accept.split(","):
+        media_range, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[media_range.strip().lower()] = quality
+
+    best_content_type, best_quality = None, 0.0
+    for content_type in content_types:
+        main_type = content_type.partition("/")[0]
+        quality = qualities.get(content_type, qualities.get(f"{main_type}/*", qualities.get("*/*", 0.0)))
+        if quality > best_quality:
+            best_content_type, best_quality = content_type, quality
+    return best_content_type
+
+
+class SerializerRegistry:
+    """
+    Serializers keyed by content type.
+
+    The first registered serializer is the default one, used for content of unregistered content types
+    and for clients accepting none of the registered ones. Negotiation results are cached per Accept header value.
+
+    :param serializers: Serializers in order of preference (default: compact JSON only).
+    """
+
+    def __init__(self, serializers: Iterable[Serializer] = None):
+        self.serializers = {}
+        self.negotiated = {}
+        self.lock = Lock()
+        for serializer in serializers if serializers is not None else [JSONSerializer()]:
+            self.register(serializer)
+
+    def register(self, serializer: Serializer) -> None:
+        """
+        Register a serializer, replacing a serializer of the same content type.
+
+        :param serializer: Serializer.
+        """
+        with self.lock:
+            self.serializers[parse_content_type(serializer.content_type)] = serializer
+            self.negotiated = {}
+
+    def get(self, content_type: Union[str, None]) -> Union[Serializer, None]:
+        """
+        Get the serializer of a content type.
+
+        :param content_type: Content type, parameters are ignored.
+        :returns: Serializer or None if none is registered.
+        """
+        serializer = self.serializers.get(content_type)
+        if serializer is None:
+            serializer = self.serializers.get(parse_content_type(content_type))
+        return serializer
+
+    def negotiate(self, accept: Union[str, None]) -> Serializer:
+        """
+        Choose a serializer according to Accept header, falling back to the default one.
+
+        :param accept: Accept header value.
+        :returns: Serializer.
+        """
+        negotiated = self.negotiated
+        serializer = negotiated.get(accept)
+        if serializer is None:
+            content_type = negotiate_content_type(accept, self.serializers)
+            serializer = self.serializers[content_type] if content_type else next(iter(self.serializers.values()))
+            if len(negotiated) >= MAX_NEGOTIATED:
+                negotiated = self.negotiated = {}
+            negotiated[accept] = serializer
+        return serializer
+
+    def serialize(self, content: object, content_type: Union[str, None]) -> bytes:
+        """
+        Serialize content with the serializer of its content type.
+
+        :param content: Response content.
+        :param content_type: Content type.
+        :returns: Encoded body.
+        """
+        serializer = self.get(content_type) or next(iter(self.serializers.values()))
+        return serializer.serialize(content)
+
+
+default_serializers = SerializerRegistry()
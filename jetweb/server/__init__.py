@@ -0,0 +1,13 @@
+"""
+Provides built-in HTTP/1.1 servers.
+"""
+
+from .connection import Connection
+from .event_loop import EventLoopServer
+from .prefork import PreforkServer
+
+__all__ = [
+    "Connection",
+    "EventLoopServer",
+    "PreforkServer",
+]
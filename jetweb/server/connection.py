@@ -0,0 +1,379 @@
+"""
+Provides blocking HTTP/1.1 connection handling with keep-alive.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import socket
+from io import BytesIO
+from typing import IO, Callable, Iterable, Union
+
+from ..exceptions import HTTPException
+from .protocol import (
+    CONTINUE_RESPONSE,
+    LAST_CHUNK,
+    MAX_HEADERS_SIZE,
+    MAX_REQUEST_LINE_SIZE,
+    FileWrapper,
+    RequestHead,
+    ResponseStarter,
+    build_environ,
+    call_application,
+    encode_chunk,
+    format_error,
+    format_response_head,
+    frame_response,
+    parse_request_head,
+)
+
+MAX_CHUNK_LINE_SIZE = 1024
+CHUNK_SIZE_PATTERN = re.compile(rb"[0-9A-Fa-f]{1,16}")
+
+logger = logging.getLogger(__name__)
+
+
+class LimitedReader:
+    """
+    Request body reader limited by declared Content-Length.
+
+    :param readable: Buffered socket file.
+    :param length: Declared body length.
+    :param on_first_read: Optional callback called before the first read (e.g. to send "100 Continue").
+    """
+
+    def __init__(self, readable: IO[bytes], length: int, on_first_read: Callable = None):
+        self.readable = readable
+        self.remaining = length
+        self.on_first_read = on_first_read
+
+    def read(self, size: int = -1) -> bytes:
+        return self._read(self.readable.read, size)
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._read(self.readable.readline, size)
+
+    def drain(self) -> bool:
+        """
+        Read and discard the rest of the body, so the next request on the connection can be parsed.
+
+        :returns: False if client still waits for "100 Continue", so the body state is unknown.
+        """
+        if self.on_first_read is not None:
+            return False
+        while self.read(64 * 1024):
+            pass
+        return True
+
+    def _read(self, read: Callable, size: int) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if self.on_first_read is not None:
+            self.on_first_read()
+            self.on_first_read = None
+
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = read(size)
+        self.remaining = self.remaining - len(data) if data else 0
+        return data
+
+
+class ChunkedReader:
+    """
+    Request body reader for chunked transfer encoding.
+
+    :param readable: Buffered socket file.
+    :param on_first_read: Optional callback called before the first read (e.g. to send "100 Continue").
+    """
+
+    def __init__(self, readable: IO[bytes], on_first_read: Callable = None):
+        self.readable = readable
+        self.on_first_read = on_first_read
+        self.chunk_remaining = 0
+        self.done = False
+
+    def read(self, size: int = -1) -> bytes:
+        if self.on_first_read is not None:
+            self.on_first_read()
+            self.on_first_read = None
+
+        data = bytearray()
+        while not self.done and (size is None or size < 0 or len(data) < size):
+            if not self.chunk_remaining:
+                self._start_chunk()
+                continue
+
+            wanted = self.chunk_remaining if size is None or size < 0 else min(self.chunk_remaining, size - len(data))
+            chunk = self.readable.read(wanted)
+            if not chunk:
+                raise HTTPException(status=400)
+            data += chunk
+            self.chunk_remaining -= len(chunk)
+            if not self.chunk_remaining:
+                self.readable.readline(MAX_CHUNK_LINE_SIZE)
+        return bytes(data)
+
+    def readline(self, size: int = -1) -> bytes:
+        line = bytearray()
+        while not line.endswith(b"\n") and (size is None or size < 0 or len(line) < size):
+            char = self.read(1)
+            if not char:
+                break
+            line += char
+        return bytes(line)
+
+    def drain(self) -> bool:
+        """
+        Read and discard the rest of the body, so the next request on the connection can be parsed.
+
+        :returns: False if client still waits for "100 Continue", so the body state is unknown.
+        """
+        if self.on_first_read is not None:
+            return False
+        while self.read(64 * 1024):
+            pass
+        return True
+
+    def _start_chunk(self) -> None:
+        line = self.readable.readline(MAX_CHUNK_LINE_SIZE)
+        size = line.split(b";")[0].strip()
+        if not CHUNK_SIZE_PATTERN.fullmatch(size):
+            raise HTTPException(status=400)
+        self.chunk_remaining = int(size, 16)
+
+        if not self.chunk_remaining:
+            while self.readable.readline(MAX_CHUNK_LINE_SIZE) not in (b"\r\n", b"\n", b""):
+                pass
+            self.done = True
+
+
+class Connection:
+    """
+    Serves HTTP/1.1 requests of a single client connection to a WSGI application.
+
+    :param sock: Connected client socket in blocking mode.
+    :param client_address: Client host and port.
+    :param server_address: Server host and port.
+    :param app: WSGI application.
+    :param keepalive_timeout: Seconds to wait for the next request on an idle connection.
+    :param max_request_line_size: Maximum size of the request line in bytes.
+    :param max_headers_size: Maximum total size of request headers in bytes.
+    :param multithread: Whether the application may be called from several threads.
+    :param multiprocess: Whether the application may be called from several processes.
+    :param should_close: Callable that returns True when connection must be closed after the current response.
+    :param on_request: Callable called after each request is handled, before its response is sent.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        client_address: tuple,
+        server_address: tuple,
+        app: Callable,
+        keepalive_timeout: float,
+        max_request_line_size: int = MAX_REQUEST_LINE_SIZE,
+        max_headers_size: int = MAX_HEADERS_SIZE,
+        multithread: bool = False,
+        multiprocess: bool = False,
+        should_close: Callable[[], bool] = lambda: False,
+        on_request: Callable[[], None] = lambda: None,
+    ):
+        self.sock = sock
+        self.client_address = client_address
+        self.server_address = server_address
+        self.app = app
+        self.keepalive_timeout = keepalive_timeout
+        self.max_request_line_size = max_request_line_size
+        self.max_headers_size = max_headers_size
+        self.multithread = multithread
+        self.multiprocess = multiprocess
+        self.should_close = should_close
+        self.on_request = on_request
+        self.readable = None
+
+    def serve(self) -> None:
+        """
+        Serve requests until the client closes the connection, keep-alive ends or an error happens.
+        """
+        self.sock.settimeout(self.keepalive_timeout)
+        readable = self.sock.makefile("rb")
+        try:
+            while self.serve_request(readable):
+                pass
+        except (OSError, socket.timeout):
+            pass
+        finally:
+            readable.close()
+            self.sock.close()
+
+    def serve_pending(self) -> bool:
+        """
+        Serve requests, which have already arrived, without waiting for the next one on an idle connection,
+        so the serving thread can be used for other connections meanwhile.
+
+        Should be called when the socket is readable.
+
+        :returns: True if the connection is idle and kept open, False if it was closed.
+        """
+        if self.readable is None:
+            self.readable = self.sock.makefile("rb")
+        try:
+            while True:
+                self.sock.settimeout(self.keepalive_timeout)
+                if not self.serve_request(self.readable):
+                    break
+                self.sock.settimeout(0)
+                if not self.readable.peek(1):
+                    self.sock.settimeout(self.keepalive_timeout)
+                    return True
+        except (OSError, socket.timeout):
+            pass
+        except Exception:
+            logger.exception("Serving connection failed")
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """
+        Close the connection.
+        """
+        if self.readable is not None:
+            self.readable.close()
+        self.sock.close()
+
+    def serve_request(self, readable: IO[bytes]) -> bool:
+        """
+        Read, dispatch and answer a single request.
+
+        :param readable: Buffered socket file.
+        :returns: True if connection should be kept open for the next request.
+        """
+        try:
+            data = self.read_head(readable)
+            if data is None:
+                return False
+            head = parse_request_head(data, self.max_request_line_size)
+        except HTTPException as exception:
+            self.sock.sendall(format_error("HTTP/1.1", exception))
+            return False
+
+        return self.handle_request(head, readable)
+
+    def handle_request(self, head: RequestHead, readable: IO[bytes]) -> bool:
+        """
+        Dispatch a parsed request to the application and send its response.
+
+        :param head: Parsed request head.
+        :param readable: Buffered socket file, positioned at the start of the request body.
+        :returns: True if connection should be kept open for the next request.
+        """
+        try:
+            body_reader = self.create_body_reader(head, readable)
+        except HTTPException as exception:
+            self.sock.sendall(format_error(head.version, exception))
+            return False
+
+        environ = build_environ(
+            head, body_reader, self.server_address, self.client_address, self.multithread, self.multiprocess
+        )
+        starter, body = call_application(self.app, environ)
+        self.on_request()
+        keep_alive = self.send_response(head, starter, body, head.keep_alive and not self.should_close())
+
+        return keep_alive and not self.should_close() and body_reader.drain()
+
+    def read_head(self, readable: IO[bytes]) -> Union[bytes, None]:
+        """
+        Read request line and headers.
+
+        :param readable: Buffered socket file.
+        :returns: Request head or None if connection was closed.
+        :raises HTTPException(414): If request line is too long.
+        :raises HTTPException(431): If request headers are too large.
+        """
+        line = readable.readline(self.max_request_line_size + 3)
+        while line in (b"\r\n", b"\n"):
+            line = readable.readline(self.max_request_line_size + 3)
+        if not line:
+            return None
+        if not line.endswith(b"\n"):
+            raise HTTPException(status=414)
+
+        data = bytearray(line)
+        headers_size = 0
+        while True:
+            line = readable.readline(self.max_headers_size + 1)
+            if not line:
+                return None
+            if line in (b"\r\n", b"\n"):
+                return bytes(data)
+            headers_size += len(line)
+            if headers_size > self.max_headers_size:
+                raise HTTPException(status=431)
+            data += line
+
+    def create_body_reader(self, head: RequestHead, readable: IO[bytes]) -> Union[LimitedReader, ChunkedReader]:
+        """
+        Create a request body reader according to body framing headers.
+
+        :param head: Parsed request head.
+        :param readable: Buffered socket file.
+        :returns: Body reader.
+        :raises HTTPException(400): If body framing headers are invalid.
+        """
+        on_first_read = None
+        if head.version == "HTTP/1.1" and (head.get_header("expect") or "").lower() == "100-continue":
+            def on_first_read() -> None:
+                self.sock.sendall(CONTINUE_RESPONSE)
+
+        content_length = head.content_length
+        if content_length is None:
+            return ChunkedReader(readable, on_first_read)
+        if not content_length:
+            return LimitedReader(BytesIO(), 0)
+        return LimitedReader(readable, content_length, on_first_read)
+
+    def send_response(
+        self, head: RequestHead, starter: ResponseStarter, body: Iterable[bytes], keep_alive: bool
+    ) -> bool:
+        """
+        Send response head and body, using `sendfile` for file-backed bodies with known length.
+
+        :param head: Parsed request head.
+        :param starter: Started response.
+        :param body: Response body iterable.
+        :param keep_alive: Whether connection can be kept open.
+        :returns: True if connection can be kept open.
+        """
+        try:
+            chunks = iter(body)
+            first_chunk = b"" if isinstance(body, FileWrapper) else next(chunks, b"")
+        except Exception as exception:
+            error = HTTPException.from_exception(exception, catch_traceback=False)
+            self.sock.sendall(format_error(head.version, error))
+            return False
+
+        try:
+            headers, send_body, chunked, keep_alive = frame_response(head, starter, body, keep_alive)
+            starter.sent = True
+            data = format_response_head(head.version, starter.status, headers, keep_alive, chunked)
+            if not send_body:
+                self.sock.sendall(data)
+                return keep_alive
+
+            if isinstance(body, FileWrapper) and not chunked and hasattr(body.file, "fileno"):
+                self.sock.sendall(data)
+                self.sock.sendfile(body.file, body.file.tell())
+                return keep_alive
+
+            self.sock.sendall(data + (encode_chunk(first_chunk) if chunked and first_chunk else first_chunk))
+            for chunk in chunks:
+                if chunk:
+                    self.sock.sendall(encode_chunk(chunk) if chunked else chunk)
+            if chunked:
+                self.sock.sendall(LAST_CHUNK)
+            return keep_alive
+        finally:
+            if hasattr(body, "close"):
+                body.close()
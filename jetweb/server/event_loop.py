@@ -0,0 +1,278 @@
+"""
+Provides single-process event-loop HTTP/1.1 server with a bounded worker thread pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import IO, Callable, Coroutine, Union
+
+from ..exceptions import HTTPException
+from .connection import Connection
+from .protocol import MAX_HEADERS_SIZE, MAX_REQUEST_LINE_SIZE, format_error, parse_request_head
+
+logger = logging.getLogger(__name__)
+
+
+def wait_in_loop(coroutine: Coroutine, loop: asyncio.AbstractEventLoop, timeout: float) -> object:
+    """
+    Run a coroutine on the event loop from another thread and wait for its result.
+
+    :param coroutine: Coroutine to run.
+    :param loop: Event loop running in another thread.
+    :param timeout: Seconds to wait for the result.
+    :returns: Coroutine result.
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result(timeout)
+
+
+class BlockingReader:
+    """
+    Blocking file-like view of an asyncio stream, used by the application from worker threads.
+
+    :param reader: Stream reader of the connection.
+    :param loop: Event loop running the connection.
+    :param timeout: Seconds to wait for data from the client.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, loop: asyncio.AbstractEventLoop, timeout: float):
+        self.reader = reader
+        self.loop = loop
+        self.timeout = timeout
+
+    def read(self, size: int = -1) -> bytes:
+        return wait_in_loop(self.reader.read(-1 if size is None else size), self.loop, self.timeout)
+
+    def readline(self, size: int = -1) -> bytes:
+        return wait_in_loop(self._readline(), self.loop, self.timeout)
+
+    async def _readline(self) -> bytes:
+        try:
+            return await self.reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as error:
+            return error.partial
+        except asyncio.LimitOverrunError:
+            raise HTTPException(status=400) from None
+
+
+class BlockingWriter:
+    """
+    Blocking socket-like view of an asyncio stream, used to send responses from worker threads.
+
+    Each write waits until the transport buffer is drained, so slow clients slow down their own responses only.
+
+    :param writer: Stream writer of the connection.
+    :param loop: Event loop running the connection.
+    :param timeout: Seconds to wait for the client to receive data.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop, timeout: float):
+        self.writer = writer
+        self.loop = loop
+        self.timeout = timeout
+
+    def sendall(self, data: bytes) -> None:
+        wait_in_loop(self._write(data), self.loop, self.timeout)
+
+    def sendfile(self, file: IO[bytes], offset: int = 0) -> None:
+        wait_in_loop(self.loop.sendfile(self.writer.transport, file, offset), self.loop, self.timeout)
+
+    async def _write(self, data: bytes) -> None:
+        self.writer.write(data)
+        await self.writer.drain()
+
+
+class EventLoopServer:
+    """
+    Single-process HTTP/1.1 server, which multiplexes keep-alive connections on an asyncio event loop.
+
+    The event loop reads and parses request heads, while the application runs on a bounded thread pool.
+    When all threads are busy, connections stop reading further requests until a thread is free,
+    so pending work is limited by the pool size. Pipelined requests are served in order of receiving.
+
+    SIGTERM and SIGINT stop the server gracefully: idle connections are closed and current requests are finished.
+
+    :param app: WSGI application.
+    :param host: Host address to bind to.
+    :param port: Port number to listen on.
+    :param threads: Number of requests handled concurrently by the application.
+    :param keepalive_timeout: Seconds to wait for the next request on an idle connection,
+        also used as timeout for reading request and sending response.
+    :param graceful_timeout: Seconds to wait for current requests before closing connections on shutdown.
+    :param backlog: Maximum number of pending connections.
+    :param max_request_line_size: Maximum size of the request line in bytes.
+    :param max_headers_size: Maximum total size of request headers in bytes.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        threads: int = 32,
+        keepalive_timeout: float = 5.0,
+        graceful_timeout: float = 30.0,
+        backlog: int = 2048,
+        max_request_line_size: int = MAX_REQUEST_LINE_SIZE,
+        max_headers_size: int = MAX_HEADERS_SIZE,
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.threads = threads
+        self.keepalive_timeout = keepalive_timeout
+        self.graceful_timeout = graceful_timeout
+        self.backlog = backlog
+        self.max_request_line_size = max_request_line_size
+        self.max_headers_size = max_headers_size
+        self.stopping = False
+        self.idle_tasks = set()
+        self.busy_tasks = set()
+
+    def serve_forever(self) -> None:
+        """
+        Run the server until shutdown.
+        """
+        asyncio.run(self.serve())
+
+    async def serve(self) -> None:
+        """
+        Accept and serve connections until SIGTERM or SIGINT is received.
+        """
+        loop = asyncio.get_running_loop()
+        stop_event = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop_event.set)
+
+        executor = ThreadPoolExecutor(max_workers=self.threads)
+        slots = asyncio.Semaphore(self.threads)
+        server = await asyncio.start_server(
+            lambda reader, writer: self.serve_connection(reader, writer, executor, slots),
+            self.host,
+            self.port,
+            backlog=self.backlog,
+            limit=max(self.max_request_line_size, self.max_headers_size) + 2,
+        )
+
+        print(f"Running on http://{self.host}:{self.port}/ with {self.threads} threads", file=sys.stderr)
+        try:
+            await stop_event.wait()
+        finally:
+            self.stopping = True
+            server.close()
+            for task in list(self.idle_tasks):
+                task.cancel()
+            if self.busy_tasks:
+                await asyncio.wait(set(self.busy_tasks), timeout=self.graceful_timeout)
+            for task in list(self.busy_tasks):
+                task.cancel()
+            await server.wait_closed()
+            executor.shutdown(wait=False)
+
+    async def serve_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        executor: ThreadPoolExecutor,
+        slots: asyncio.Semaphore,
+    ) -> None:
+        """
+        Serve requests of a single connection until the client closes it, keep-alive ends or an error happens.
+
+        :param reader: Stream reader of the connection.
+        :param writer: Stream writer of the connection.
+        :param executor: Thread pool running the application.
+        :param slots: Semaphore limiting requests handled concurrently.
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        connection = Connection(
+            BlockingWriter(writer, loop, self.keepalive_timeout),
+            writer.get_extra_info("peername"),
+            writer.get_extra_info("sockname")[:2],
+            self.app,
+            keepalive_timeout=self.keepalive_timeout,
+            max_request_line_size=self.max_request_line_size,
+            max_headers_size=self.max_headers_size,
+            multithread=True,
+            should_close=lambda: self.stopping,
+        )
+        readable = BlockingReader(reader, loop, self.keepalive_timeout)
+
+        keep_alive = True
+        try:
+            while keep_alive and not self.stopping:
+                self.idle_tasks.add(task)
+                try:
+                    data = await self.read_head(reader)
+                finally:
+                    self.idle_tasks.discard(task)
+                if data is None:
+                    break
+
+                self.busy_tasks.add(task)
+                try:
+                    head = parse_request_head(data, self.max_request_line_size)
+                    async with slots:
+                        keep_alive = await loop.run_in_executor(executor, connection.handle_request, head, readable)
+                finally:
+                    self.busy_tasks.discard(task)
+        except HTTPException as exception:
+            writer.write(format_error("HTTP/1.1", exception))
+        except (asyncio.CancelledError, asyncio.TimeoutError, FutureTimeoutError, ConnectionError):
+            pass
+        except Exception:
+            logger.exception("Connection error")
+        finally:
+            writer.close()
+
+    async def read_head(self, reader: asyncio.StreamReader) -> Union[bytes, None]:
+        """
+        Read request line and headers, waiting at most keep-alive timeout for each line.
+
+        :param reader: Stream reader of the connection.
+        :returns: Request head or None if connection was closed.
+        :raises HTTPException(414): If request line is too long.
+        :raises HTTPException(431): If request headers are too large.
+        """
+        line = await self.read_line(reader, status=414)
+        while line in (b"\r\n", b"\n"):
+            line = await self.read_line(reader, status=414)
+        if not line:
+            return None
+        if len(line) > self.max_request_line_size + 2:
+            raise HTTPException(status=414)
+
+        data = bytearray(line)
+        headers_size = 0
+        while True:
+            line = await self.read_line(reader, status=431)
+            if not line:
+                return None
+            if line in (b"\r\n", b"\n"):
+                return bytes(data)
+            headers_size += len(line)
+            if headers_size > self.max_headers_size:
+                raise HTTPException(status=431)
+            data += line
+
+    async def read_line(self, reader: asyncio.StreamReader, status: int) -> bytes:
+        """
+        Read a single line of request head.
+
+        :param reader: Stream reader of the connection.
+        :param status: Status of the error raised if line is too long.
+        :returns: Line or empty bytes if connection was closed.
+        :raises HTTPException: If line is too long.
+        """
+        try:
+            return await asyncio.wait_for(reader.readuntil(b"\n"), self.keepalive_timeout)
+        except asyncio.IncompleteReadError:
+            return b""
+        except asyncio.LimitOverrunError:
+            raise HTTPException(status=status) from None
@@ -0,0 +1,435 @@
+"""
+Provides prefork multi-process HTTP/1.1 server.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import select
+import selectors
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import count
+from queue import SimpleQueue
+from typing import Callable
+
+from .connection import Connection
+from .protocol import MAX_HEADERS_SIZE, MAX_REQUEST_LINE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def create_listener(host: str, port: int, backlog: int, reuse_port: bool) -> socket.socket:
+    """
+    Create a listening TCP socket.
+
+    :param host: Host address to bind to.
+    :param port: Port number to listen on.
+    :param backlog: Maximum number of pending connections.
+    :param reuse_port: Enable SO_REUSEPORT, so several processes can bind the same address.
+    :returns: Listening socket.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    listener = socket.socket(family, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    listener.bind((host, port))
+    listener.listen(backlog)
+    return listener
+
+
+class Worker:
+    """
+    Worker process, which accepts connections from the listening socket and serves them.
+
+    Idle keep-alive connections don't occupy threads: they are polled together with the listening socket,
+    and a thread serves a connection only when its next request arrives.
+
+    :param app: WSGI application.
+    :param listener: Listening socket, shared with other workers or bound with SO_REUSEPORT.
+    :param threads: Number of connections served concurrently.
+    :param max_requests: Number of requests after which the worker exits to be replaced, unlimited if None.
+    :param options: Connection options (keep-alive timeout and size limits).
+    """
+
+    def __init__(self, app: Callable, listener: socket.socket, threads: int, max_requests: int, **options):
+        self.app = app
+        self.listener = listener
+        self.threads = threads
+        self.max_requests = max_requests
+        self.options = options
+        self.alive = True
+        self.requests = count(1)
+        self.selector = None
+        self.idle = {}
+        self.finished = SimpleQueue()
+        self.busy = 0
+        self.wakeup_read, self.wakeup_write = socket.socketpair()
+
+    def run(self) -> None:
+        """
+        Serve connections until stopped by a signal or by reaching the maximum number of requests.
+        """
+        parent_pid = os.getppid()
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        self.listener.setblocking(False)
+        self.wakeup_write.setblocking(False)
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.wakeup_read, selectors.EVENT_READ)
+        listening = False
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            while self.alive and os.getppid() == parent_pid:
+                if listening != (self.busy < self.threads):
+                    if listening:
+                        self.selector.unregister(self.listener)
+                    else:
+                        self.selector.register(self.listener, selectors.EVENT_READ)
+                    listening = not listening
+
+                for key, _ in self.selector.select(timeout=1.0):
+                    if key.fileobj is self.wakeup_read:
+                        self.wakeup_read.recv(4096)
+                    elif key.fileobj is self.listener:
+                        self.accept()
+                    else:
+                        self.selector.unregister(key.fileobj)
+                        del self.idle[key.data]
+                        self.busy += 1
+                        future = executor.submit(key.data.serve_pending)
+                        future.add_done_callback(partial(self.finish, key.data))
+                self.collect_finished()
+                self.close_expired()
+
+            self.alive = False
+            for connection in list(self.idle):
+                self.release(connection)
+        self.collect_finished()
+        self.selector.close()
+        self.listener.close()
+        self.wakeup_read.close()
+        self.wakeup_write.close()
+
+    def accept(self) -> None:
+        """
+        Accept a connection and wait for its first request.
+        """
+        try:
+            sock, client_address = self.listener.accept()
+        except OSError:
+            return
+        sock.setblocking(True)
+        connection = Connection(
+            sock,
+            client_address,
+            self.listener.getsockname()[:2],
+            self.app,
+            multithread=self.threads > 1,
+            multiprocess=True,
+            should_close=lambda: not self.alive,
+            on_request=self.count_request,
+            **self.options,
+        )
+        self.add_idle(connection)
+
+    def add_idle(self, connection: Connection) -> None:
+        """
+        Poll an idle connection for its next request until keep-alive timeout.
+
+        :param connection: Idle connection.
+        """
+        self.idle[connection] = time.monotonic() + connection.keepalive_timeout
+        self.selector.register(connection.sock, selectors.EVENT_READ, connection)
+
+    def release(self, connection: Connection) -> None:
+        """
+        Stop polling an idle connection and close it.
+
+        :param connection: Idle connection.
+        """
+        self.selector.unregister(connection.sock)
+        del self.idle[connection]
+        connection.close()
+
+    def finish(self, connection: Connection, future: Future) -> None:
+        """
+        Pass a served connection back to the worker loop, called from serving threads.
+
+        :param connection: Served connection.
+        :param future: Result of `Connection.serve_pending`.
+        """
+        exception = future.exception()
+        if exception is not None:
+            logger.error("Serving connection failed", exc_info=exception)
+        self.finished.put((connection, exception is None and future.result()))
+        self.wake_up()
+
+    def wake_up(self) -> None:
+        """
+        Interrupt waiting for connections in the worker loop.
+        """
+        try:
+            self.wakeup_write.send(b"\0")
+        except OSError:
+            pass
+
+    def collect_finished(self) -> None:
+        """
+        Poll connections kept open after serving their requests again, closing the others.
+        """
+        while not self.finished.empty():
+            connection, kept_open = self.finished.get()
+            self.busy -= 1
+            if kept_open and self.alive:
+                self.add_idle(connection)
+            else:
+                connection.close()
+
+    def close_expired(self) -> None:
+        """
+        Close idle connections, which reached keep-alive timeout.
+        """
+        now = time.monotonic()
+        for connection, deadline in list(self.idle.items()):
+            if deadline <= now:
+                self.release(connection)
+
+    def count_request(self) -> None:
+        """
+        Count a served request and stop the worker after reaching the maximum number of requests.
+        """
+        if self.max_requests is not None and next(self.requests) >= self.max_requests:
+            self.alive = False
+
+    def stop(self, signum: int = None, frame: object = None) -> None:
+        """
+        Stop accepting new connections and exit after the current requests are served.
+        """
+        self.alive = False
+        self.wake_up()
+
+
+class PreforkServer:
+    """
+    Multi-process HTTP/1.1 server with keep-alive support.
+
+    The master process binds the listening socket shared by workers (or, with SO_REUSEPORT, only workers bind
+    their own sockets, so the kernel doesn't route connections to a socket nobody accepts on),
+    keeps the configured number of workers running and replaces exited ones.
+
+    Signals handled by the master process:
+
+    * SIGTERM, SIGINT — graceful shutdown: workers finish current requests and exit.
+    * SIGHUP — graceful reload: new workers are started and old ones are stopped gracefully.
+
+    :param app: WSGI application.
+    :param host: Host address to bind to.
+    :param port: Port number to listen on.
+    :param workers: Number of worker processes (default: number of CPUs).
+    :param threads: Number of connections served concurrently by each worker.
+    :param max_requests: Number of requests after which a worker is replaced, unlimited if None.
+    :param max_requests_jitter: Maximum random number added to `max_requests` per worker,
+        so workers are not replaced at the same time.
+    :param keepalive_timeout: Seconds to wait for the next request on an idle connection.
+    :param graceful_timeout: Seconds to wait for workers to exit before killing them.
+    :param reuse_port: Bind a separate socket in each worker with SO_REUSEPORT instead of sharing one.
+    :param backlog: Maximum number of pending connections.
+    :param max_request_line_size: Maximum size of the request line in bytes.
+    :param max_headers_size: Maximum total size of request headers in bytes.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        workers: int = None,
+        threads: int = 1,
+        max_requests: int = None,
+        max_requests_jitter: int = 0,
+        keepalive_timeout: float = 5.0,
+        graceful_timeout: float = 30.0,
+        reuse_port: bool = False,
+        backlog: int = 2048,
+        max_request_line_size: int = MAX_REQUEST_LINE_SIZE,
+        max_headers_size: int = MAX_HEADERS_SIZE,
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.threads = threads
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.keepalive_timeout = keepalive_timeout
+        self.graceful_timeout = graceful_timeout
+        self.reuse_port = reuse_port
+        self.backlog = backlog
+        self.max_request_line_size = max_request_line_size
+        self.max_headers_size = max_headers_size
+        self.listener = None
+        self.worker_pids = set()
+        self.signals = []
+
+    def serve_forever(self) -> None:
+        """
+        Start workers and supervise them until shutdown.
+        """
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Prefork server requires os.fork")
+
+        if not self.reuse_port:
+            self.listener = create_listener(self.host, self.port, self.backlog, reuse_port=False)
+        wakeup_read, wakeup_write = os.pipe()
+        os.set_blocking(wakeup_write, False)
+        signal.set_wakeup_fd(wakeup_write)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, self.queue_signal)
+
+        print(f"Running on http://{self.host}:{self.port}/ with {self.workers} workers", file=sys.stderr)
+        try:
+            self.spawn_workers()
+            while True:
+                if select.select([wakeup_read], [], [], 1.0)[0]:
+                    os.read(wakeup_read, 1024)
+                if not self.handle_signals():
+                    break
+                self.reap_workers()
+                self.spawn_workers()
+        finally:
+            self.stop_workers(self.worker_pids)
+            signal.set_wakeup_fd(-1)
+            os.close(wakeup_read)
+            os.close(wakeup_write)
+            if self.listener is not None:
+                self.listener.close()
+
+    def queue_signal(self, signum: int, frame: object) -> None:
+        """
+        Queue a received signal, so it is handled by the master loop.
+        """
+        self.signals.append(signum)
+
+    def handle_signals(self) -> bool:
+        """
+        Handle queued signals.
+
+        :returns: False if the server must shut down.
+        """
+        while self.signals:
+            signum = self.signals.pop(0)
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                return False
+            if signum == signal.SIGHUP:
+                old_pids = set(self.worker_pids)
+                self.worker_pids.clear()
+                self.spawn_workers()
+                self.stop_workers(old_pids)
+        return True
+
+    def spawn_workers(self) -> None:
+        """
+        Fork workers until the configured number of workers is running.
+        """
+        while len(self.worker_pids) < self.workers:
+            pid = os.fork()
+            if pid:
+                self.worker_pids.add(pid)
+                continue
+
+            exit_code = 0
+            try:
+                self.run_worker()
+            except BaseException:
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+    def run_worker(self) -> None:
+        """
+        Run worker loop in a forked process.
+        """
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        signal.set_wakeup_fd(-1)
+
+        listener = self.listener
+        if self.reuse_port:
+            listener = create_listener(self.host, self.port, self.backlog, reuse_port=True)
+
+        max_requests = self.max_requests
+        if max_requests is not None and self.max_requests_jitter:
+            max_requests += random.randint(0, self.max_requests_jitter)
+
+        worker = Worker(
+            self.app,
+            listener,
+            threads=self.threads,
+            max_requests=max_requests,
+            keepalive_timeout=self.keepalive_timeout,
+            max_request_line_size=self.max_request_line_size,
+            max_headers_size=self.max_headers_size,
+        )
+        worker.run()
+
+    def reap_workers(self) -> None:
+        """
+        Collect exited workers, so they are replaced.
+        """
+        while self.worker_pids:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.worker_pids.clear()
+                return
+            if not pid:
+                return
+            self.worker_pids.discard(pid)
+
+    def stop_workers(self, pids: set) -> None:
+        """
+        Stop workers gracefully, killing those still running after the graceful timeout.
+
+        :param pids: Worker process ids.
+        """
+        for pid in pids:
+            self.kill(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.graceful_timeout
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            for pid in list(remaining):
+                try:
+                    if os.waitpid(pid, os.WNOHANG)[0]:
+                        remaining.discard(pid)
+                except ChildProcessError:
+                    remaining.discard(pid)
+            time.sleep(0.05)
+
+        for pid in remaining:
+            self.kill(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+    def kill(self, pid: int, signum: int) -> None:
+        """
+        Send a signal to a worker, ignoring already exited ones.
+
+        :param pid: Worker process id.
+        :param signum: Signal number.
+        """
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,349 @@
+"""
+Provides HTTP/1.1 parsing and serialization shared by built-in servers.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import IO, Callable, Iterable, Iterator, Union
+from urllib.parse import unquote_to_bytes, urlsplit
+
+from ..exceptions import HTTPException
+from ..http.status import get_status_line
+
+MAX_REQUEST_LINE_SIZE = 8190
+MAX_HEADERS_SIZE = 64 * 1024
+METHODS_WITHOUT_BODY = ("HEAD",)
+STATUSES_WITHOUT_BODY = (204, 304)
+CONTINUE_RESPONSE = b"HTTP/1.1 100 Continue\r\n\r\n"
+LAST_CHUNK = b"0\r\n\r\n"
+
+
+@dataclass
+class RequestHead:
+    """
+    Parsed request line and headers of an HTTP request.
+
+    :param method: Request method.
+    :param target: Request target (path with optional query string).
+    :param version: HTTP version, e.g. "HTTP/1.1".
+    :param headers: Header names (lower-cased) and values in order of receiving.
+    """
+    method: str
+    target: str
+    version: str
+    headers: list[tuple[str, str]]
+
+    def get_header(self, name: str) -> Union[str, None]:
+        """
+        Get the comma-joined value of a header.
+
+        :param name: Lower-cased header name.
+        :returns: Header value or None if header is missing.
+        """
+        values = [value for header_name, value in self.headers if header_name == name]
+        return ",".join(values) if values else None
+
+    @property
+    def keep_alive(self) -> bool:
+        """
+        Check whether the client wants to keep the connection open after the response.
+
+        :returns: True for HTTP/1.1 without "Connection: close" and HTTP/1.0 with "Connection: keep-alive".
+        """
+        connection = (self.get_header("connection") or "").lower()
+        if self.version == "HTTP/1.1":
+            return "close" not in connection
+        return "keep-alive" in connection
+
+    @property
+    def content_length(self) -> Union[int, None]:
+        """
+        Get declared body length.
+
+        :returns: Body length or None if body is chunked or missing.
+        :raises HTTPException(400): If body framing headers are invalid.
+        """
+        transfer_encoding = self.get_header("transfer-encoding")
+        content_length = self.get_header("content-length")
+        if transfer_encoding is not None:
+            if content_length is not None or transfer_encoding.lower() != "chunked":
+                raise HTTPException(status=400)
+            return None
+        if content_length is None:
+            return 0
+        if not content_length.isdigit():
+            raise HTTPException(status=400)
+        return int(content_length)
+
+
+def parse_request_head(data: bytes, max_request_line_size: int = MAX_REQUEST_LINE_SIZE) -> RequestHead:
+    """
+    Parse request line and headers.
+
+    :param data: Request head without the final empty line.
+    :param max_request_line_size: Maximum size of the request line in bytes.
+    :returns: RequestHead object.
+    :raises HTTPException(400): If request head is malformed.
+    :raises HTTPException(414): If request line is too long.
+    :raises HTTPException(505): If HTTP version is not supported.
+    """
+    lines = data.decode("latin-1").lstrip("\r\n").split("\n")
+    request_line = lines[0].rstrip("\r")
+    if len(request_line) > max_request_line_size:
+        raise HTTPException(status=414)
+
+    parts = request_line.split(" ")
+    if len(parts) != 3 or not parts[0].isalpha() or not parts[2].startswith("HTTP/"):
+        raise HTTPException(status=400)
+    method, target, version = parts
+    if version not in ("HTTP/1.0", "HTTP/1.1"):
+        raise HTTPException(status=505)
+
+    headers = []
+    for line in lines[1:]:
+        line = line.rstrip("\r")
+        if not line:
+            continue
+        name, separator, value = line.partition(":")
+        if not separator or not name or name != name.strip():
+            raise HTTPException(status=400)
+        headers.append((name.lower(), value.strip()))
+
+    return RequestHead(method=method, target=target, version=version, headers=headers)
+
+
+def build_environ(
+    head: RequestHead,
+    readable: IO[bytes],
+    server_address: tuple,
+    client_address: tuple,
+    multithread: bool,
+    multiprocess: bool,
+) -> dict:
+    """
+    Build WSGI environ for a parsed request.
+
+    :param head: Parsed request head.
+    :param readable: File-like object with request body.
+    :param server_address: Server host and port.
+    :param client_address: Client host and port.
+    :param multithread: Whether the application may be called from several threads.
+    :param multiprocess: Whether the application may be called from several processes.
+    :returns: WSGI environ.
+    """
+    target = head.target
+    if "://" in target:
+        split_target = urlsplit(target)
+        target = split_target.path + ("?" + split_target.query if split_target.query else "")
+    path, _, query = target.partition("?")
+
+    environ = {
+        "REQUEST_METHOD": head.method,
+        "SCRIPT_NAME": "",
+        "PATH_INFO": unquote_to_bytes(path).decode("latin-1"),
+        "QUERY_STRING": query,
+        "SERVER_NAME": str(server_address[0]),
+        "SERVER_PORT": str(server_address[1]),
+        "SERVER_PROTOCOL": head.version,
+        "REMOTE_ADDR": str(client_address[0]) if client_address else "",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": readable,
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": multithread,
+        "wsgi.multiprocess": multiprocess,
+        "wsgi.run_once": False,
+        "wsgi.file_wrapper": FileWrapper,
+    }
+
+    for name, value in head.headers:
+        name = name.upper().replace("-", "_")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = "HTTP_" + name
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+
+    return environ
+
+
+class FileWrapper:
+    """
+    WSGI file wrapper, which lets servers send files with `sendfile`.
+
+    :param file: File opened in binary mode.
+    :param chunk_size: Size of chunks in bytes for iteration.
+    """
+
+    def __init__(self, file: IO[bytes], chunk_size: int = 64 * 1024):
+        self.file = file
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> FileWrapper:
+        return self
+
+    def __next__(self) -> bytes:
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            raise StopIteration
+        return chunk
+
+    def close(self) -> None:
+        """
+        Close the wrapped file.
+        """
+        self.file.close()
+
+
+class ResponseStarter:
+    """
+    WSGI `start_response` callable, which stores status and headers of the response.
+    """
+
+    def __init__(self):
+        self.status = None
+        self.headers = None
+        self.sent = False
+        self.written = []
+
+    def __call__(self, status: str, headers: list[tuple[str, str]], exc_info: tuple = None) -> Callable:
+        if exc_info and self.sent:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.status = status
+        self.headers = headers
+        return self.write
+
+    def write(self, data: bytes) -> None:
+        """
+        Legacy WSGI write callable, data is buffered and sent before the body iterable returned by the application.
+
+        :param data: Body chunk.
+        :raises RuntimeError: If the response isn't started.
+        """
+        if self.status is None:
+            raise RuntimeError("Response must be started before writing")
+        self.written.append(data)
+
+
+class WrittenBody:
+    """
+    Response body with chunks passed to the write callable, followed by chunks of the returned iterable.
+
+    :param written: Written chunks.
+    :param body: Body iterable returned by the application.
+    """
+
+    def __init__(self, written: list[bytes], body: Iterable[bytes]):
+        self.written = written
+        self.body = body
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self.written
+        yield from self.body
+
+    def close(self) -> None:
+        """
+        Close the body iterable returned by the application.
+        """
+        if hasattr(self.body, "close"):
+            self.body.close()
+
+
+def call_application(app: Callable, environ: dict) -> tuple[ResponseStarter, Iterable[bytes]]:
+    """
+    Call WSGI application, converting unexpected errors into an error response.
+
+    :param app: WSGI application.
+    :param environ: WSGI environ.
+    :returns: Started response and body iterable.
+    """
+    starter = ResponseStarter()
+    try:
+        body = app(environ, starter)
+    except Exception as exception:
+        error = HTTPException.from_exception(exception, catch_traceback=False)
+        starter(get_status_line(error.status, error.reason), list(error.headers.items()))
+        starter.written.clear()
+        body = error.iter_body()
+
+    if starter.written:
+        body = [*starter.written, *body] if isinstance(body, (list, tuple)) else WrittenBody(starter.written, body)
+    return starter, body
+
+
+def format_response_head(
+    version: str, status: str, headers: list[tuple[str, str]], keep_alive: bool, chunked: bool
+) -> bytes:
+    """
+    Serialize status line and headers of a response.
+
+    :param version: HTTP version of the request.
+    :param status: Status code with reason phrase.
+    :param headers: Response headers.
+    :param keep_alive: Keep the connection open after the response if True.
+    :param chunked: Use chunked transfer encoding if True.
+    :returns: Encoded response head.
+    """
+    lines = [f"{version} {status}", f"Date: {formatdate(usegmt=True)}", "Server: jetweb"]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    if chunked:
+        lines.append("Transfer-Encoding: chunked")
+    if not keep_alive:
+        lines.append("Connection: close")
+    elif version == "HTTP/1.0":
+        lines.append("Connection: keep-alive")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def frame_response(
+    head: RequestHead, starter: ResponseStarter, body: Iterable[bytes], keep_alive: bool
+) -> tuple[list[tuple[str, str]], bool, bool, bool]:
+    """
+    Choose response framing: fixed Content-Length, chunked encoding or closing the connection.
+
+    :param head: Parsed request head.
+    :param starter: Started response.
+    :param body: Response body iterable.
+    :param keep_alive: Whether connection can be kept open.
+    :returns: Headers, whether body is sent, whether it is chunked and whether connection is kept open.
+    """
+    headers = [(name, value) for name, value in starter.headers if name.lower() != "connection"]
+    status_code = int(starter.status[:3])
+    send_body = head.method not in METHODS_WITHOUT_BODY
+    if status_code in STATUSES_WITHOUT_BODY or status_code < 200:
+        return headers, False, False, keep_alive
+
+    if any(name.lower() == "content-length" for name, _ in headers):
+        return headers, send_body, False, keep_alive
+    if isinstance(body, (list, tuple)) and len(body) == 1:
+        headers.append(("Content-Length", str(len(body[0]))))
+        return headers, send_body, False, keep_alive
+    if head.version == "HTTP/1.1":
+        return headers, send_body, send_body, keep_alive
+    return headers, send_body, False, False
+
+
+def format_error(version: str, exception: HTTPException) -> bytes:
+    """
+    Serialize a complete error response, sent before the application is called.
+
+    :param version: HTTP version for the status line.
+    :param exception: HTTP exception.
+    :returns: Encoded response.
+    """
+    body = exception.body
+    headers = [*exception.headers.items(), ("Content-Length", str(len(body)))]
+    status = get_status_line(exception.status, exception.reason)
+    return format_response_head(version, status, headers, keep_alive=False, chunked=False) + body
+
+
+def encode_chunk(data: bytes) -> bytes:
+    """
+    Frame data as a single chunk of chunked transfer encoding.
+
+    :param data: Chunk data.
+    :returns: Framed chunk.
+    """
+    return b"%x\r\n%s\r\n" % (len(data), data)
@@ -1,15 +1,32 @@
+from .asgi import create_environ, encode_headers, read_first_chunk
+from .concurrency import WaitingThread, call_async, is_async_callable, run_sync
 from .datastructures import CaseInsensitiveDict
-from .endpoints import convert_path_params, create_pattern, normalize_endpoint
-from .exceptions import format_exception
-from .request import parse_body, parse_headers, parse_query_params
+from .endpoints import create_converters, create_pattern, has_path_params, normalize_endpoint, spans_segments
+from .exceptions import LazyTraceback, format_exception
+from .request import parse_content_length, parse_headers, parse_query_params
+from .response import ClosingIterable, add_vary
+from .slots import add_slots
 
 __all__ = [
+    "create_environ",
+    "encode_headers",
+    "read_first_chunk",
+    "WaitingThread",
+    "call_async",
+    "is_async_callable",
+    "run_sync",
     "CaseInsensitiveDict",
-    "convert_path_params",
+    "create_converters",
     "create_pattern",
+    "has_path_params",
     "normalize_endpoint",
+    "spans_segments",
+    "LazyTraceback",
     "format_exception",
-    "parse_body",
+    "parse_content_length",
     "parse_headers",
     "parse_query_params",
+    "ClosingIterable",
+    "add_vary",
+    "add_slots",
 ]
@@ -0,0 +1,60 @@
+"""
+Provides utils for ASGI scope conversion.
+"""
+
+from typing import IO, AsyncIterator
+
+
+def create_environ(scope: dict, readable: IO[bytes]) -> dict:
+    """
+    Build a WSGI-like environ from ASGI HTTP scope.
+
+    :param scope: ASGI HTTP connection scope.
+    :param readable: File-like object with received request body.
+    :returns: WSGI environ.
+    """
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"],
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": readable,
+        "wsgi.input_terminated": True,
+    }
+
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = "HTTP_" + name
+        value = value.decode("latin-1")
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+
+    return environ
+
+
+def encode_headers(headers: dict) -> list[tuple[bytes, bytes]]:
+    """
+    Encode response headers for ASGI.
+
+    :param headers: Response headers.
+    :returns: List of encoded header name and value pairs.
+    """
+    return [(name.lower().encode("latin-1"), str(value).encode("latin-1")) for name, value in headers.items()]
+
+
+async def read_first_chunk(body: AsyncIterator[bytes]) -> bytes:
+    """
+    Read the first chunk of response body, so errors are raised before the response is started.
+
+    :param body: Async iterator of body chunks.
+    :returns: First chunk or empty bytes if body is empty.
+    """
+    try:
+        return await body.__anext__()
+    except StopAsyncIteration:
+        return b""
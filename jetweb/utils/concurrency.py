@@ -0,0 +1,123 @@
+"""
+Provides utils for running sync and async callables.
+"""
+
+from asyncio import AbstractEventLoop, get_running_loop, run_coroutine_threadsafe, wrap_future
+from concurrent import futures
+from contextvars import ContextVar, copy_context
+from functools import partial
+from inspect import isawaitable, iscoroutinefunction
+from queue import SimpleQueue
+from threading import Lock
+from typing import Callable, Coroutine, Union
+
+
+class WaitingThread:
+    """
+    Thread blocked until a coroutine finishes in the event loop, which runs sync callables of that coroutine meanwhile.
+
+    A sync middleware waits for the rest of the pipeline in its thread, so sync middlewares and handlers
+    called by the rest run in the same thread instead of holding more threads of the pool,
+    which would deadlock once all threads of the pool are waiting.
+    """
+
+    def __init__(self):
+        self.queue = SimpleQueue()
+        self.lock = Lock()
+        self.done = False
+
+    def submit(self, function: Callable[[], object]) -> Union[futures.Future, None]:
+        """
+        Schedule a sync callable in the waiting thread.
+
+        :param function: Sync callable without arguments.
+        :returns: Future of the callable result or None if the thread doesn't wait anymore,
+            e.g. for callables of tasks started by the coroutine, which outlive it.
+        """
+        future = futures.Future()
+        with self.lock:
+            if self.done:
+                return None
+            self.queue.put((future, function))
+        return future
+
+    def finish(self) -> None:
+        """
+        Stop accepting callables and let the waiting thread return.
+        """
+        with self.lock:
+            self.done = True
+            self.queue.put(None)
+
+    def wait(self, coroutine: Coroutine, loop: AbstractEventLoop) -> object:
+        """
+        Run a coroutine in the event loop and call submitted callables until it finishes.
+
+        :param coroutine: Coroutine, which may submit sync callables to this thread.
+        :param loop: Running event loop of another thread.
+        :returns: Coroutine result.
+        """
+        token = waiting_thread.set(self)
+        try:
+            result = run_coroutine_threadsafe(coroutine, loop)
+        finally:
+            waiting_thread.reset(token)
+        result.add_done_callback(lambda _: self.finish())
+
+        while (item := self.queue.get()) is not None:
+            future, function = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(function())
+                except BaseException as exception:
+                    future.set_exception(exception)
+        return result.result()
+
+
+waiting_thread: ContextVar[WaitingThread] = ContextVar("waiting_thread", default=None)
+
+
+def is_async_callable(function: Callable) -> bool:
+    """
+    Check whether a callable (or callable object) returns a coroutine.
+
+    :param function: Callable to check.
+    :returns: True if callable is defined with async def.
+    """
+    return iscoroutinefunction(function) or iscoroutinefunction(getattr(function, "__call__", None))
+
+
+async def run_sync(function: Callable, *args, **kwargs) -> object:
+    """
+    Run a sync callable in the default thread pool of the running event loop
+    or, if called by a coroutine awaited by a waiting thread, in that thread.
+
+    :param function: Sync callable.
+    :returns: Callable result.
+    """
+    context = copy_context()
+    call = partial(context.run, function, *args, **kwargs)
+    thread = waiting_thread.get()
+    future = thread.submit(call) if thread is not None else None
+    if future is not None:
+        return await wrap_future(future)
+    return await get_running_loop().run_in_executor(None, call)
+
+
+async def call_async(function: Callable, *args, **kwargs) -> object:
+    """
+    Call a sync or async callable without blocking the event loop.
+
+    Async callables are awaited, sync ones run in the thread pool.
+    Awaitable results of sync callables (e.g. async methods dispatched by sync code) are awaited too.
+
+    :param function: Sync or async callable.
+    :returns: Callable result.
+    """
+    if is_async_callable(function):
+        return await function(*args, **kwargs)
+
+    result = await run_sync(function, *args, **kwargs)
+    if isawaitable(result):
+        result = await result
+    return result
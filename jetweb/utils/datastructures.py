@@ -2,19 +2,160 @@
 Provides custom data structures.
 """
 
-from collections import UserDict
+from __future__ import annotations
 
+from collections.abc import ItemsView
+from typing import Iterable, Mapping, Union
 
-class CaseInsensitiveDict(UserDict):
+MISSING = object()
+
+
+class CaseInsensitiveDict(dict):
     """
-    Dictionary-like object that treats keys as case-insensitive.
+    Dictionary that treats keys as case-insensitive, storing them lower-cased.
+
+    Lookups of lower-cased keys don't call Python code, other keys are lower-cased on a miss.
+    Item access returns the last value of a repeated key (e.g. `?tag=a&tag=b`),
+    while all values are available with `getall()` and `getlist()`.
     """
 
-    def __getitem__(self, key: str) -> str:
-        return super().__getitem__(key.lower())
+    __slots__ = ("_multi",)
+
+    def __init__(self, data: Union[Mapping, Iterable[tuple[str, object]]] = (), **kwargs):
+        super().__init__()
+        self._multi = None
+        self.update(data, **kwargs)
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[str, object]], lowered: bool = False) -> CaseInsensitiveDict:
+        """
+        Create a dictionary from key-value pairs, keeping all values of repeated keys.
+
+        :param items: Key-value pairs.
+        :param lowered: Keys are already lower-cased if True, so they are not lower-cased again.
+        :returns: CaseInsensitiveDict object.
+        """
+        items = list(items) if lowered else [(key.lower(), value) for key, value in items]
+        instance = cls()
+        dict.update(instance, items)
+        if len(instance) < len(items):
+            values = {}
+            for key, value in items:
+                values.setdefault(key, []).append(value)
+            instance._multi = {key: key_values for key, key_values in values.items() if len(key_values) > 1}
+        return instance
+
+    def __missing__(self, key: str) -> object:
+        lowered_key = key.lower()
+        if lowered_key == key:
+            raise KeyError(key)
+        return dict.__getitem__(self, lowered_key)
 
-    def __setitem__(self, key: str, value: str) -> None:
-        super().__setitem__(key.lower(), value)
+    def __setitem__(self, key: str, value: object) -> None:
+        key = key.lower()
+        if self._multi:
+            self._multi.pop(key, None)
+        dict.__setitem__(self, key, value)
 
     def __delitem__(self, key: str) -> None:
-        super().__delitem__(key.lower())
+        key = key.lower()
+        if self._multi:
+            self._multi.pop(key, None)
+        dict.__delitem__(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key.lower() if isinstance(key, str) else key)
+
+    def get(self, key: str, default: object = None) -> object:
+        return dict.get(self, key.lower(), default)
+
+    def pop(self, key: str, default: object = MISSING) -> object:
+        key = key.lower()
+        if self._multi:
+            self._multi.pop(key, None)
+        if default is MISSING:
+            return dict.pop(self, key)
+        return dict.pop(self, key, default)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        return dict.setdefault(self, key.lower(), default)
+
+    def update(self, data: Union[Mapping, Iterable[tuple[str, object]]] = (), **kwargs) -> None:
+        items = data.items() if hasattr(data, "items") else data
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def items(self) -> ItemsView:
+        """
+        Return a view of items, which checks membership of items with case-insensitive keys.
+        """
+        return ItemsView(self)
+
+    def copy(self) -> CaseInsensitiveDict:
+        instance = type(self)()
+        dict.update(instance, self)
+        if self._multi:
+            instance._multi = {key: list(values) for key, values in self._multi.items()}
+        return instance
+
+    __copy__ = copy
+
+    def __reduce__(self) -> tuple:
+        return type(self), (dict(self),), (None, {"_multi": self._multi})
+
+    def clear(self) -> None:
+        self._multi = None
+        dict.clear(self)
+
+    def add(self, key: str, value: object) -> None:
+        """
+        Add a value to a key, keeping its previous values.
+
+        :param key: Key.
+        :param value: New value, returned by item access.
+        """
+        key = key.lower()
+        if dict.__contains__(self, key):
+            if self._multi is None:
+                self._multi = {}
+            self._multi.setdefault(key, [dict.__getitem__(self, key)]).append(value)
+        dict.__setitem__(self, key, value)
+
+    def getall(self, key: str, default: object = MISSING) -> list:
+        """
+        Get all values of a key.
+
+        :param key: Key.
+        :param default: Value returned if the key is missing.
+        :returns: Values in order of adding.
+        :raises KeyError: If the key is missing and default is not passed.
+        """
+        key = key.lower()
+        if self._multi and key in self._multi:
+            return list(self._multi[key])
+        if dict.__contains__(self, key):
+            return [dict.__getitem__(self, key)]
+        if default is MISSING:
+            raise KeyError(key)
+        return default
+
+    def multi_items(self) -> list[tuple[str, object]]:
+        """
+        Get all key-value pairs, including all values of repeated keys.
+
+        :returns: Key-value pairs.
+        """
+        if not self._multi:
+            return list(dict.items(self))
+        return [(key, value) for key in self for value in self.getall(key)]
+
+    def getlist(self, key: str) -> list:
+        """
+        Get all values of a key.
+
+        :param key: Key.
+        :returns: Values in order of adding, empty list if the key is missing.
+        """
+        return self.getall(key, [])
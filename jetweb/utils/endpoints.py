@@ -2,25 +2,42 @@
 Provides utils for endpoints.
 """
 
-from re import Match, Pattern, compile, sub
+from __future__ import annotations
 
+from re import Match, Pattern, compile, fullmatch, sub
+from typing import Callable
 
-def convert_to_regex(match: Match, converters: dict) -> str:
+PATH_PARAM_PATTERN = compile(r"{(\w+)(:\w+)?}")
+
+
+def get_converter(param_type: str, converters: dict) -> type:
     """
-    Convert a "{name:type}" placeholder into a named regex group using converters.
+    Find a converter for the path parameter type.
 
-    :param match: Match object with path parameter.
+    :param param_type: Converter identifier with optional leading colon. Defaults to "path".
     :param converters: Converters for path parameter.
-    :returns: Regex substring for path parameter.
+    :returns: Converter class.
     :raises ValueError: If converter identifier is not known.
     """
-    param_name, param_type = match.groups()
     param_type = (param_type or "path").lstrip(":")
 
     if param_type not in converters:
         raise ValueError("Converter must be registered")
 
-    return f"(?P<{param_name}>{converters[param_type].pattern})"
+    return converters[param_type]
+
+
+def convert_to_regex(match: Match, converters: dict) -> str:
+    """
+    Convert a "{name:type}" placeholder into a named regex group using converters.
+
+    :param match: Match object with path parameter.
+    :param converters: Converters for path parameter.
+    :returns: Regex substring for path parameter.
+    :raises ValueError: If converter identifier is not known.
+    """
+    param_name, param_type = match.groups()
+    return f"(?P<{param_name}>{get_converter(param_type, converters).pattern})"
 
 
 def create_pattern(endpoint: str, converters: dict) -> Pattern:
@@ -31,25 +48,54 @@ def create_pattern(endpoint: str, converters: dict) -> Pattern:
     :param converters: Converters for path parameter.
     :returns: Pattern object.
     """
-    pattern = sub(r"{(\w+)(:\w+)?}", lambda match: convert_to_regex(match, converters), endpoint)
+    pattern = PATH_PARAM_PATTERN.sub(lambda match: convert_to_regex(match, converters), endpoint)
     return compile("^" + pattern + "$")
 
 
-def convert_path_params(endpoint: str, path_params: dict, converters: dict) -> dict:
+def create_converters(endpoint: str, converters: dict) -> tuple[tuple[str, Callable], ...]:
     """
-    Convert path parameters to necessary types.
+    Build a conversion plan for path parameters of a route endpoint.
+
+    Parameters converted to plain strings are skipped, as matched values are strings already.
 
     :param endpoint: Route endpoint.
-    :param path_params: Path parameters.
     :param converters: Converters for path parameter.
-    :returns: Converted path parameters.
+    :returns: Pairs of path parameter name and its convert callable.
+    :raises ValueError: If converter identifier is not known.
+    """
+    plan = []
+    for param_name, param_type in PATH_PARAM_PATTERN.findall(endpoint):
+        convert = get_converter(param_type, converters).convert
+        if convert is not str:
+            plan.append((param_name, convert))
+    return tuple(plan)
+
+
+def has_path_params(endpoint: str) -> bool:
     """
-    for param_name in path_params:
-        for converter in converters.values():
-            if f"{param_name}:{converter.identifier}" in endpoint:
-                path_params[param_name] = converter.convert(path_params[param_name])
+    Check whether an endpoint contains path parameters.
 
-    return path_params
+    :param endpoint: Route endpoint or its segment.
+    :returns: True if endpoint contains at least one path parameter.
+    """
+    return PATH_PARAM_PATTERN.search(endpoint) is not None
+
+
+def spans_segments(endpoint: str, converters: dict) -> bool:
+    """
+    Check whether any path parameter of an endpoint can match a slash.
+
+    Such parameters can span several endpoint segments, so they can't be matched segment by segment.
+
+    :param endpoint: Route endpoint or its segment.
+    :param converters: Converters for path parameter.
+    :returns: True if any path parameter can match across segments.
+    """
+    for _, param_type in PATH_PARAM_PATTERN.findall(endpoint):
+        pattern = get_converter(param_type, converters).pattern
+        if "/" in pattern or fullmatch(pattern, "/"):
+            return True
+    return False
 
 
 def normalize_endpoint(endpoint: str) -> str:
@@ -15,3 +15,22 @@ def format_exception(exception: BaseException) -> str:
     :returns: Exception traceback.
     """
     return "".join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+
+
+class LazyTraceback:
+    """
+    Placeholder of exception traceback text, formatted only when the content holding it is read.
+
+    :param exception: Original exception.
+    """
+
+    __slots__ = ("exception",)
+
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+    def __str__(self) -> str:
+        return format_exception(self.exception)
+
+    def __repr__(self) -> str:
+        return f"LazyTraceback({self.exception!r})"
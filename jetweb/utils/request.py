@@ -9,30 +9,28 @@ from .datastructures import CaseInsensitiveDict
 
 def parse_query_params(environ: dict) -> CaseInsensitiveDict:
     """
-    Extract request query parameters from WSGI environ.
+    Extract request query parameters from WSGI environ, keeping all values of repeated parameters.
     """
-    return CaseInsensitiveDict(parse_qsl(environ["QUERY_STRING"], True))
+    return CaseInsensitiveDict.from_items(parse_qsl(environ["QUERY_STRING"], True))
 
 
 def parse_headers(environ: dict) -> CaseInsensitiveDict:
     """
     Extract request headers from WSGI environ.
     """
-    filtered_headers = filter(
-        lambda item: item[0].startswith("HTTP_") or item[0] in ("CONTENT_TYPE", "CONTENT_LENGTH"),
-        environ.items(),
-    )
-    formatted_headers = map(
-        lambda item: ("-".join(item[0].replace("HTTP_", "").split("_")), item[1]),
-        filtered_headers,
-    )
-    return CaseInsensitiveDict(formatted_headers)
-
-
-def parse_body(environ: dict) -> bytes:
+    headers = [
+        (name[5:].replace("_", "-").lower(), value)
+        for name, value in environ.items()
+        if name.startswith("HTTP_")
+    ]
+    for name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+        if name in environ:
+            headers.append((name.replace("_", "-").lower(), environ[name]))
+    return CaseInsensitiveDict.from_items(headers, lowered=True)
+
+
+def parse_content_length(environ: dict) -> int:
     """
-    Extract request body from WSGI environ.
+    Extract declared request body length from WSGI environ.
     """
-    content_length = int(environ.get("CONTENT_LENGTH") or 0)
-    readable = environ["wsgi.input"]
-    return readable.read(content_length)
+    return int(environ.get("CONTENT_LENGTH") or 0)
@@ -0,0 +1,45 @@
+"""
+Provides response helpers.
+"""
+
+from typing import Callable, Iterable, Iterator
+
+
+def add_vary(headers: dict, name: str) -> None:
+    """
+    Add a header name to Vary response header.
+
+    :param headers: Response headers.
+    :param name: Request header name.
+    """
+    vary = headers.get("Vary")
+    if not vary:
+        headers["Vary"] = name
+    elif name.lower() not in (value.strip().lower() for value in vary.split(",")) and vary.strip() != "*":
+        headers["Vary"] = f"{vary}, {name}"
+
+
+class ClosingIterable:
+    """
+    WSGI body iterable, which runs a callback after the server closes it, i.e. after the body is sent.
+
+    :param iterable: Body iterable.
+    :param callback: Callable without arguments.
+    """
+
+    def __init__(self, iterable: Iterable[bytes], callback: Callable[[], None]):
+        self.iterable = iterable
+        self.callback = callback
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.iterable)
+
+    def close(self) -> None:
+        """
+        Close the body iterable and run the callback.
+        """
+        try:
+            if hasattr(self.iterable, "close"):
+                self.iterable.close()
+        finally:
+            self.callback()
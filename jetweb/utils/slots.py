@@ -0,0 +1,64 @@
+"""
+Provides utils for slotted dataclasses.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Callable, Iterable, Union
+
+
+def add_slots(cls: type = None, extra_slots: Iterable[str] = ()) -> Union[type, Callable[[type], type]]:
+    """
+    Recreate a dataclass with `__slots__` for its fields, like `dataclass(slots=True)` on Python 3.10+.
+
+    Fields already stored in slots of base classes don't get new slots.
+    Methods using `super()` without arguments are bound to the recreated class.
+
+    :param cls: Dataclass.
+    :param extra_slots: Names of other instance attributes.
+    :returns: Slotted dataclass or decorator, if class is not passed.
+    """
+    if cls is None:
+        return lambda cls: add_slots(cls, extra_slots)
+
+    inherited_slots = {name for base in cls.__mro__[1:] for name in getattr(base, "__slots__", ())}
+    field_names = tuple(field.name for field in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    cls_dict["__slots__"] = tuple(
+        name for name in dict.fromkeys((*field_names, *extra_slots)) if name not in inherited_slots
+    )
+
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    for value in cls_dict.values():
+        rebind_class_cell(value, cls, slotted_cls)
+    return slotted_cls
+
+
+def rebind_class_cell(value: object, old_cls: type, new_cls: type) -> None:
+    """
+    Point the `__class__` cell of a method, used by `super()` without arguments, to the new class.
+
+    :param value: Class attribute (function, property, classmethod or staticmethod).
+    :param old_cls: Original class.
+    :param new_cls: Recreated class.
+    """
+    if isinstance(value, property):
+        functions = (value.fget, value.fset, value.fdel)
+    elif isinstance(value, (classmethod, staticmethod)):
+        functions = (value.__func__,)
+    else:
+        functions = (value,)
+
+    for function in functions:
+        for cell in getattr(function, "__closure__", None) or ():
+            try:
+                if cell.cell_contents is old_cls:
+                    cell.cell_contents = new_cls
+            except ValueError:
+                pass
@@ -0,0 +1,174 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Awaitable, Callable
+
+from httpx import ASGITransport, AsyncClient, Response
+
+from jetweb import BaseHandler, HTTPException, JetWeb, Request, Router, StreamingResponse
+
+
+def request(app: JetWeb, method: str, endpoint: str, **kwargs) -> Response:
+    async def send_request() -> Response:
+        async with AsyncClient(transport=ASGITransport(app=app.asgi), base_url="http://test") as client:
+            return await client.request(method, endpoint, **kwargs)
+    return asyncio.run(send_request())
+
+
+def test_handling_request(app: JetWeb) -> None:
+    @app.middleware
+    async def async_middleware(next_handler: Callable[[], Awaitable]) -> str:
+        response = await next_handler()
+        return f"Async middleware <- {response.content}"
+
+    @app.middleware
+    def sync_middleware(next_handler: Callable) -> str:
+        response = next_handler()
+        return f"Sync middleware <- {response.content}"
+
+    @app.post("/async/{name:str}")
+    async def handle_async(request: Request, name: str) -> str:
+        await asyncio.sleep(0)
+        return f"Async handler: {name}, {request.text}"
+
+    @app.post("/sync/{name:str}")
+    def handle_sync(request: Request, name: str) -> str:
+        return f"Sync handler: {name}, {request.text}"
+
+    response = request(app, "POST", "/async/john", content="Test body")
+    assert response.status_code == 200
+    assert response.text == "Async middleware <- Sync middleware <- Async handler: john, Test body"
+
+    response = request(app, "POST", "/sync/john", content="Test body")
+    assert response.status_code == 200
+    assert response.text == "Async middleware <- Sync middleware <- Sync handler: john, Test body"
+
+
+def test_class_based_handler(app: JetWeb) -> None:
+    @app.get("/endpoint")
+    class Handler(BaseHandler):
+        async def get(self) -> dict:
+            return {"detail": "Test response"}
+
+    response = request(app, "GET", "/endpoint")
+    assert response.status_code == 200
+    assert response.json() == {"detail": "Test response"}
+
+
+def test_raising_exception(app: JetWeb) -> None:
+    @app.exception_handler(403)
+    async def handle_403(exception: HTTPException) -> str:
+        return f"Handled: {exception.content}"
+
+    @app.get("/endpoint")
+    async def handle_get() -> str:
+        raise HTTPException(status=403, content="Invalid credentials")
+
+    response = request(app, "GET", "/endpoint")
+    assert response.status_code == 200
+    assert response.text == "Handled: Invalid credentials"
+
+    response = request(app, "GET", "/non-existing-endpoint")
+    assert response.status_code == 404
+    assert response.text == "Nothing matches the given URI"
+
+
+def test_failing_error_response(app: JetWeb) -> None:
+    @app.exception_handler(500)
+    async def handle_500() -> dict:
+        return {"detail": object()}
+
+    @app.get("/endpoint")
+    async def handle_get() -> None:
+        raise ZeroDivisionError("Test error")
+
+    response = request(app, "GET", "/endpoint")
+    assert response.status_code == 500
+    assert response.text == "Server got itself in trouble"
+
+
+def test_streaming_response(app: JetWeb) -> None:
+    async def generate() -> AsyncGenerator[str, None]:
+        for index in range(3):
+            yield f"Chunk {index};"
+
+    @app.get("/endpoint")
+    async def handle_get() -> StreamingResponse:
+        return StreamingResponse(content=generate())
+
+    response = request(app, "GET", "/endpoint")
+    assert response.status_code == 200
+    assert response.text == "Chunk 0;Chunk 1;Chunk 2;"
+
+
+def test_limiting_request_body() -> None:
+    app = JetWeb(max_body_size=10)
+
+    @app.post("/endpoint")
+    async def handle_post(request: Request) -> str:
+        return request.text
+
+    assert request(app, "POST", "/endpoint", content=b"x" * 10).text == "x" * 10
+    assert request(app, "POST", "/endpoint", content=b"x" * 11).status_code == 413
+
+    @app.route("/large", methods=["POST"], max_body_size=1000)
+    async def handle_large_post(request: Request) -> str:
+        return request.text
+
+    assert request(app, "POST", "/large", content=b"x" * 100).text == "x" * 100
+    assert request(app, "POST", "/large", content=b"x" * 1001).status_code == 413
+
+    app.add_middleware(lambda next_handler: next_handler())
+    assert request(app, "POST", "/large", content=b"x" * 100).text == "x" * 100
+
+
+def test_not_matching_route(app: JetWeb) -> None:
+    @app.get("/endpoint")
+    def handle_get() -> str:
+        return "Test response"
+
+    response = request(app, "GET", "/non-existing-endpoint")
+    assert response.status_code == 404
+    assert response.text == "Nothing matches the given URI"
+
+    response = request(app, "POST", "/endpoint", content="Test body")
+    assert response.status_code == 405
+    assert response.headers["Content-Type"].startswith("text/plain")
+
+
+def test_router_middlewares(app: JetWeb) -> None:
+    router = Router("/router")
+
+    @router.middleware
+    async def middleware(next_handler: Callable[[], Awaitable]) -> str:
+        response = await next_handler()
+        return f"Router middleware <- {response.content}"
+
+    @router.get("/endpoint")
+    async def handle_router() -> str:
+        return "Router handler"
+
+    @app.get("/endpoint")
+    async def handle_app() -> str:
+        return "App handler"
+
+    app.include(router)
+    assert request(app, "GET", "/router/endpoint").text == "Router middleware <- Router handler"
+    assert request(app, "GET", "/endpoint").text == "App handler"
+
+
+def test_sync_middlewares_dont_exhaust_thread_pool(app: JetWeb) -> None:
+    @app.middleware
+    def sync_middleware(next_handler: Callable) -> Response:
+        return next_handler()
+
+    @app.get("/sync")
+    def handle_sync() -> str:
+        return "Sync handler"
+
+    async def send_requests() -> list[Response]:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+        async with AsyncClient(transport=ASGITransport(app=app.asgi), base_url="http://test") as client:
+            return await asyncio.wait_for(asyncio.gather(*(client.get("/sync") for _ in range(4))), timeout=5)
+
+    responses = asyncio.run(send_requests())
+    assert [response.text for response in responses] == ["Sync handler"] * 4
@@ -0,0 +1,126 @@
+from itertools import count
+
+from httpx import Client
+
+from jetweb import JetWeb, Request, Response
+from jetweb.middlewares import CacheMiddleware
+
+
+def test_caching_responses(app: JetWeb, client: Client) -> None:
+    cache = CacheMiddleware()
+    app.add_middleware(cache)
+    calls = count(1)
+
+    @app.get("/users/{user_id:int}")
+    def get_user(user_id: int, request: Request) -> dict:
+        return {"id": user_id, "page": request.query_params.get("page"), "call": next(calls)}
+
+    assert client.get("/users/1?page=1").json() == {"id": 1, "page": "1", "call": 1}
+    response = client.get("/users/1?page=1")
+    assert response.json() == {"id": 1, "page": "1", "call": 1}
+    assert response.headers["Content-Type"] == "application/json"
+    assert client.get("/users/1?page=2").json()["call"] == 2
+    assert client.get("/users/2?page=1").json()["call"] == 3
+    assert client.get("/users/1?page=1", headers={"Cache-Control": "no-cache"}).json()["call"] == 4
+    assert cache.stats() == {"hits": 1, "misses": 3, "entries": 3, "size": cache.size}
+
+    assert cache.invalidate(endpoint="/users/1") == 2
+    assert client.get("/users/1?page=1").json()["call"] == 5
+    assert cache.invalidate(route="/users/{user_id:int}") == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_caching_vary_headers(app: JetWeb, client: Client) -> None:
+    app.add_middleware(CacheMiddleware())
+    calls = count(1)
+
+    @app.get("/greeting")
+    def greet(request: Request) -> Response:
+        language = request.headers.get("Accept-Language")
+        return Response(content=f"{language} {next(calls)}", headers={"Vary": "Accept-Language"})
+
+    assert client.get("/greeting", headers={"Accept-Language": "en"}).text == "en 1"
+    assert client.get("/greeting", headers={"Accept-Language": "uk"}).text == "uk 2"
+    assert client.get("/greeting", headers={"Accept-Language": "en"}).text == "en 1"
+    assert client.get("/greeting", headers={"Accept-Language": "uk"}).text == "uk 2"
+
+
+def test_skipping_credentialed_requests(app: JetWeb, client: Client) -> None:
+    app.add_middleware(CacheMiddleware())
+    calls = count(1)
+
+    @app.get("/profile")
+    def profile(request: Request) -> str:
+        return f"{request.headers.get('Authorization')} {next(calls)}"
+
+    @app.get("/public")
+    def public() -> Response:
+        return Response(content=str(next(calls)), headers={"Cache-Control": "public, max-age=60"})
+
+    assert client.get("/profile", headers={"Authorization": "Bearer alice"}).text == "Bearer alice 1"
+    assert client.get("/profile", headers={"Authorization": "Bearer bob"}).text == "Bearer bob 2"
+    assert client.get("/profile", headers={"Authorization": "Bearer alice"}).text == "Bearer alice 3"
+    assert client.get("/profile", headers={"Cookie": "session=alice"}).text == "None 4"
+    assert client.get("/profile").text == "None 5"
+
+    assert client.get("/public", headers={"Authorization": "Bearer alice"}).text == "6"
+    assert client.get("/public").text == "6"
+    assert client.get("/public", headers={"Authorization": "Bearer bob"}).text == "7"
+
+
+def test_skipping_uncacheable_responses(app: JetWeb, client: Client) -> None:
+    app.add_middleware(CacheMiddleware(route_ttls={"/disabled": 0}))
+    calls = count(1)
+
+    @app.get("/disabled")
+    def disabled() -> str:
+        return str(next(calls))
+
+    @app.get("/private")
+    def private() -> Response:
+        return Response(content=str(next(calls)), headers={"Cache-Control": "private"})
+
+    @app.post("/post")
+    def post() -> str:
+        return str(next(calls))
+
+    assert [client.get("/disabled").text for _ in range(2)] == ["1", "2"]
+    assert [client.get("/private").text for _ in range(2)] == ["3", "4"]
+    assert [client.post("/post").text for _ in range(2)] == ["5", "6"]
+
+
+def test_evicting_responses(app: JetWeb, client: Client) -> None:
+    cache = CacheMiddleware(max_size=250)
+    app.add_middleware(cache)
+
+    @app.get("/items/{item_id:int}")
+    def get_item(item_id: int) -> str:
+        return "x" * 100
+
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/items/1")
+    client.get("/items/3")
+
+    assert cache.stats()["entries"] == 2
+    assert cache.size <= 250
+    client.get("/items/1")
+    client.get("/items/2")
+    assert cache.hits == 2
+
+
+def test_evicting_vary_records(app: JetWeb, client: Client) -> None:
+    cache = CacheMiddleware(max_entries=10)
+    app.add_middleware(cache)
+
+    @app.get("/search")
+    def search() -> Response:
+        return Response(content="Results", headers={"Vary": "Accept-Language"})
+
+    for page in range(50):
+        client.get(f"/search?page={page}")
+
+    assert cache.stats()["entries"] == 10
+    assert len(cache.vary) == 10
+    assert cache.invalidate(endpoint="/search") == 10
+    assert not cache.vary
@@ -0,0 +1,84 @@
+import gzip
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from httpx import Client
+
+from jetweb import JetWeb, Response, StreamingResponse
+from jetweb.middlewares import CompressionMiddleware
+from jetweb.middlewares.compression import MEBIBYTE
+
+
+def test_compressing_responses(app: JetWeb, client: Client) -> None:
+    app.add_middleware(CompressionMiddleware(minimum_size=100))
+
+    @app.get("/large")
+    def large() -> dict:
+        return {"items": list(range(100))}
+
+    @app.get("/small")
+    def small() -> str:
+        return "Small response"
+
+    @app.get("/image")
+    def image() -> Response:
+        return Response(content=b"\x89PNG" * 100, content_type="image/png")
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.num_bytes_downloaded < 300
+    assert response.json() == {"items": list(range(100))}
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip;q=0.5, deflate"})
+    assert response.headers["Content-Encoding"] == "deflate"
+    assert response.json() == {"items": list(range(100))}
+
+    response = client.get("/large", headers={"Accept-Encoding": "br, gzip;q=0"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+    assert "Content-Encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_compressing_streaming_responses(app: JetWeb, client: Client) -> None:
+    app.add_middleware(CompressionMiddleware(minimum_size=100))
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(content=(f"Line {index}\n" * 20 for index in range(10)), content_type="text/plain")
+
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.num_bytes_downloaded < 500
+    assert response.text == "".join(f"Line {index}\n" * 20 for index in range(10))
+
+
+def test_lowering_level_above_cpu_budget() -> None:
+    middleware = CompressionMiddleware(level=9, cpu_budget=0.0)
+    data = b"Compressible data " * 10_000
+
+    compressed = middleware.compress(data, "gzip")
+    assert gzip.decompress(compressed) == data
+    assert middleware.level == 8
+
+    compressor = zlib.compressobj(middleware.level, zlib.DEFLATED, zlib.MAX_WBITS)
+    assert zlib.decompress(middleware.compress_chunk(compressor, data) + compressor.flush()) == data
+    assert middleware.level == 7
+
+
+def test_adjusting_level_concurrently() -> None:
+    middleware = CompressionMiddleware(level=9, cpu_budget=1.0)
+    costs = [10.0, 0.0] * 1000
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in executor.map(lambda cost: middleware.account(cost, MEBIBYTE), costs):
+            assert 1 <= middleware.level <= 9
+
+    for _ in range(200):
+        middleware.account(10.0, MEBIBYTE)
+    assert middleware.level == 1
+    for _ in range(200):
+        middleware.account(0.0, MEBIBYTE)
+    assert middleware.level == 9
@@ -1,6 +1,15 @@
+import pytest
 from httpx import Client
 
-from jetweb import JetWeb
+from jetweb import HTTPException, JetWeb
+
+
+class DomainError(Exception):
+    pass
+
+
+class NotFoundError(DomainError):
+    pass
 
 
 def test_handling_exception(app: JetWeb, client: Client) -> None:
@@ -11,3 +20,119 @@ def test_handling_exception(app: JetWeb, client: Client) -> None:
     response = client.get("/non-existing-endpoint")
     assert response.status_code == 200
     assert response.text == "Test response"
+
+
+def test_handling_exception_class(app: JetWeb, client: Client) -> None:
+    @app.get("/users/{user_id:int}")
+    def get_user(user_id: int) -> None:
+        raise NotFoundError(f"User {user_id} was not found")
+
+    @app.get("/error")
+    def error() -> None:
+        raise DomainError("Domain error")
+
+    @app.exception_handler(DomainError)
+    def handle_domain_error(exception: DomainError) -> HTTPException:
+        return HTTPException(status=400, content={"detail": str(exception)})
+
+    response = client.get("/users/1")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "User 1 was not found"}
+
+    @app.exception_handler(NotFoundError)
+    def handle_not_found_error(exception: NotFoundError) -> HTTPException:
+        raise HTTPException(status=404, content={"detail": str(exception)})
+
+    response = client.get("/users/1")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "User 1 was not found"}
+
+    response = client.get("/error")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Domain error"}
+
+
+def test_handling_http_exception_class(app: JetWeb, client: Client) -> None:
+    @app.get("/forbidden")
+    def forbidden() -> None:
+        raise HTTPException(status=403)
+
+    @app.exception_handler(Exception)
+    def handle_exception() -> str:
+        return "Exception"
+
+    assert client.get("/forbidden").status_code == 403
+    assert client.get("/non-existing-endpoint").status_code == 404
+
+    @app.exception_handler(HTTPException)
+    def handle_http_exception(exception: HTTPException) -> HTTPException:
+        return HTTPException(status=exception.status, content={"status": exception.status})
+
+    @app.exception_handler(403)
+    def handle_403() -> str:
+        return "Forbidden"
+
+    assert client.get("/forbidden").text == "Forbidden"
+    response = client.get("/non-existing-endpoint")
+    assert response.status_code == 404
+    assert response.json() == {"status": 404}
+
+
+def test_lazy_traceback(app: JetWeb, client: Client, monkeypatch: pytest.MonkeyPatch) -> None:
+    formatted = []
+    monkeypatch.setattr("jetweb.utils.exceptions.format_exception", lambda exception: formatted.append(exception))
+
+    @app.get("/error")
+    def error() -> None:
+        raise ZeroDivisionError("Test error")
+
+    @app.exception_handler(500)
+    def handle_500() -> HTTPException:
+        return HTTPException(status=500, content="Handled")
+
+    response = client.get("/error")
+    assert response.status_code == 500
+    assert response.text == "Handled"
+    assert not formatted
+
+
+def test_traceback_content(app: JetWeb, client: Client) -> None:
+    @app.get("/error")
+    def error() -> None:
+        raise ZeroDivisionError("Test error")
+
+    response = client.get("/error")
+    assert response.status_code == 500
+    assert response.headers["Content-Type"] == "text/plain"
+    assert response.text.startswith("Traceback")
+    assert "ZeroDivisionError: Test error" in response.text
+
+    @app.exception_handler(500)
+    def handle_500(exception: HTTPException) -> dict:
+        assert isinstance(exception.content, str)
+        return {"detail": exception.content}
+
+    response = client.get("/error")
+    assert response.status_code == 200
+    assert "ZeroDivisionError: Test error" in response.json()["detail"]
+
+
+def test_failing_error_response(app: JetWeb, client: Client) -> None:
+    @app.get("/error")
+    def error() -> None:
+        raise ZeroDivisionError("Test error")
+
+    @app.exception_handler(500)
+    def handle_500() -> dict:
+        return {"detail": object()}
+
+    response = client.get("/error")
+    assert response.status_code == 500
+    assert response.text == "Server got itself in trouble"
+
+
+def test_invalid_exception_handler_key(app: JetWeb) -> None:
+    with pytest.raises(ValueError):
+        app.add_exception_handler("404", lambda: "Not found")
+    with pytest.raises(ValueError):
+        app.add_exception_handler(dict, lambda: "Not found")
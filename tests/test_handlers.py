@@ -1,7 +1,9 @@
+from typing import Callable
+
 import pytest
 from httpx import Client
 
-from jetweb import HTTPException, JetWeb
+from jetweb import HTTPException, JetWeb, Response
 
 
 @pytest.mark.parametrize("method", ["GET", "POST", "PUT", "PATCH", "DELETE"])
@@ -39,3 +41,20 @@ def test_not_existing_endpoint(app: JetWeb, client: Client) -> None:
     response = client.get("/non-existing-endpoint")
     assert response.status_code == 404
     assert response.text == "Nothing matches the given URI"
+
+
+def test_not_existing_endpoint_with_middleware(app: JetWeb, client: Client) -> None:
+    statuses = []
+
+    @app.middleware
+    def middleware(next_handler: Callable) -> Response:
+        try:
+            return next_handler()
+        except HTTPException as exception:
+            statuses.append(exception.status)
+            raise
+
+    response = client.get("/non-existing-endpoint")
+    assert response.status_code == 404
+    assert response.text == "Nothing matches the given URI"
+    assert statuses == [404]
@@ -3,6 +3,7 @@ from typing import Callable
 from httpx import Client
 
 from jetweb import Context, HTTPException, JetWeb, Request, Response
+from jetweb.context import PARAMS_CACHE, inspect_params
 
 
 def test_injection_into_handler(app: JetWeb, client: Client) -> None:
@@ -97,3 +98,36 @@ def test_without_injection(app: JetWeb, client: Client) -> None:
     response = client.get("/endpoint/john")
     assert response.status_code == 200
     assert response.text == "Test response"
+
+
+def test_caching_params() -> None:
+    class Handler:
+        def get(self, request: Request, name: str) -> None:
+            pass
+
+    handler = Handler()
+    assert inspect_params(handler.get) == ("request", "name")
+    assert PARAMS_CACHE[Handler.get] == ("request", "name")
+
+    context = Context(request="request", name="john", other="other")
+    assert context.params_for(handler.get) == {"request": "request", "name": "john"}
+
+
+def test_layered_context(app: JetWeb, client: Client) -> None:
+    app.global_context.update(app_context=1, shadowed="global")
+
+    @app.get("/endpoint")
+    def handle_get(context: Context, app_context: int) -> dict:
+        context["shadowed"] = "request"
+        context.update(added=app_context + 1)
+        return {"shadowed": context["shadowed"], "added": context.get("added")}
+
+    assert client.get("/endpoint").json() == {"shadowed": "request", "added": 2}
+    assert app.global_context == {"app_context": 1, "shadowed": "global"}
+
+    context = Context({"shared": 1}, request="request")
+    assert context.params_for(lambda request, shared, context: None) == {
+        "request": "request", "shared": 1, "context": context,
+    }
+    context.clear()
+    assert dict(context) == {"shared": 1}
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Callable
+
+from httpx import ASGITransport, AsyncClient, Client, WSGITransport
+
+from jetweb import HTTPException, Instrumentation, JetWeb, Request, Timings
+
+
+def parse_server_timing(value: str) -> dict:
+    metrics = {}
+    for metric in value.split(", "):
+        name, _, duration = metric.partition(";dur=")
+        metrics[name] = float(duration)
+    return metrics
+
+
+def test_server_timing_header() -> None:
+    recorded = []
+    app = JetWeb(instrumentation=Instrumentation(sink=lambda request, timings: recorded.append(timings)))
+
+    @app.middleware
+    def auth(next_handler: Callable) -> object:
+        return next_handler()
+
+    @app.get("/endpoint")
+    def handle_get(timings: Timings) -> dict:
+        timings.enter("database")
+        timings.exit()
+        return {"status": "ok"}
+
+    @app.get("/error")
+    def handle_error() -> None:
+        raise HTTPException(status=409)
+
+    with Client(transport=WSGITransport(app=app), base_url="http://test") as client:
+        response = client.get("/endpoint")
+        assert response.status_code == 200
+        metrics = parse_server_timing(response.headers["Server-Timing"])
+        assert list(metrics) == ["request", "middleware.auth", "routing", "handler", "database", "body", "total"]
+        assert sum(duration for name, duration in metrics.items() if name != "total") <= metrics["total"]
+
+        response = client.get("/error")
+        assert response.status_code == 409
+        assert "exception" in parse_server_timing(response.headers["Server-Timing"])
+
+        response = client.get("/missing")
+        assert response.status_code == 404
+        assert "Server-Timing" in response.headers
+
+    assert len(recorded) == 3
+    assert recorded[0].durations["handler"] > 0
+
+
+def test_asgi_timings() -> None:
+    recorded = []
+    app = JetWeb(instrumentation=Instrumentation(server_timing=False, sink=lambda request, timings: recorded.append(
+        (request.endpoint, timings)
+    )))
+
+    @app.post("/endpoint")
+    async def handle_post(request: Request) -> str:
+        return request.text
+
+    async def send_request() -> None:
+        async with AsyncClient(transport=ASGITransport(app=app.asgi), base_url="http://test") as client:
+            response = await client.post("/endpoint", content="Test body")
+            assert response.text == "Test body"
+            assert "Server-Timing" not in response.headers
+
+    asyncio.run(send_request())
+    endpoint, timings = recorded[0]
+    assert endpoint == "/endpoint"
+    assert {"request", "receive", "routing", "handler", "body"} <= set(timings.durations)
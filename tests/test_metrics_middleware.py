@@ -0,0 +1,76 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from httpx import Client
+
+from jetweb import HTTPException, JetWeb
+from jetweb.middlewares import MetricsMiddleware
+
+
+def test_collecting_metrics(app: JetWeb, client: Client) -> None:
+    metrics = MetricsMiddleware(buckets=(0.1, 1.0))
+    app.add_middleware(metrics)
+    app.add_route("/metrics", metrics.export)
+
+    @app.get("/users/{user_id:int}")
+    def get_user(user_id: int) -> dict:
+        if user_id == 0:
+            raise HTTPException(status=404)
+        return {"id": user_id}
+
+    @app.route("/cache", methods=["PURGE"])
+    def purge_cache() -> str:
+        return "Purged"
+
+    for endpoint in ["/users/1", "/users/2", "/users/0", "/missing"]:
+        client.get(endpoint)
+    for method, endpoint in [("PURGE", "/cache"), ("FOO", "/missing"), ("BAR", "/users/1"), ("PURGE", "/users/1")]:
+        client.request(method, endpoint)
+
+    samples = metrics.collect()
+    assert samples[("/users/{user_id:int}", "GET", 200)][:1] == [2]
+    assert samples[("/users/{user_id:int}", "GET", 404)][:1] == [1]
+    assert samples[("unmatched", "GET", 404)][:1] == [1]
+    assert samples[("/cache", "PURGE", 200)][:1] == [1]
+    assert samples[("unmatched", "other", 404)][:1] == [1]
+    assert samples[("unmatched", "other", 405)][:1] == [2]
+
+    response = client.get("/metrics")
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "# TYPE jetweb_request_duration_seconds histogram" in lines
+    assert 'jetweb_requests_total{route="/users/{user_id:int}",method="GET",status="200"} 2' in lines
+    labels = 'route="/users/{user_id:int}",method="GET",status="200"'
+    assert f'jetweb_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f"jetweb_request_duration_seconds_count{{{labels}}} 2" in lines
+
+
+def test_path_param_named_route(app: JetWeb, client: Client) -> None:
+    metrics = MetricsMiddleware()
+    app.add_middleware(metrics)
+
+    @app.get("/pages/{route}")
+    def get_page(route: str) -> str:
+        return route
+
+    assert client.get("/pages/home").text == "home"
+    assert metrics.collect()[("unmatched", "GET", 200)][:1] == [1]
+
+
+def test_aggregating_processes(tmp_path: Path) -> None:
+    other_process_samples = [["/users/{user_id:int}", "GET", 200, 3, 0.3, 3, *[0] * 11]]
+    (tmp_path / "metrics-1.json").write_text(json.dumps(other_process_samples))
+
+    metrics = MetricsMiddleware(directory=str(tmp_path))
+    metrics.observe("/users/{user_id:int}", "GET", 200, 0.2)
+    metrics.observe("/health", "GET", 200, 0.001)
+
+    samples = metrics.collect()
+    count, duration, *bucket_counts = samples[("/users/{user_id:int}", "GET", 200)]
+    assert count == 4
+    assert duration == pytest.approx(0.5)
+    assert bucket_counts[:6] == [3, 0, 0, 0, 0, 1]
+    assert samples[("/health", "GET", 200)][0] == 1
+    assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
@@ -37,3 +37,20 @@ def test_raising_exception(app: JetWeb, client: Client) -> None:
     response = client.get("/endpoint")
     assert response.status_code == 403
     assert response.text == "Invalid credentials"
+
+
+def test_adding_middleware_after_request(app: JetWeb, client: Client) -> None:
+    @app.get("/endpoint")
+    def handle_get() -> str:
+        return "Test response"
+
+    assert client.get("/endpoint").text == "Test response"
+
+    @app.middleware
+    def middleware(next_handler: Callable) -> str:
+        response = next_handler()
+        return f"Middleware <- {response.content}"
+
+    response = client.get("/endpoint")
+    assert response.status_code == 200
+    assert response.text == "Middleware <- Test response"
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from itertools import count
+from typing import Callable, Generator
+
+import pytest
+from httpx import ASGITransport, AsyncClient, Client
+
+from jetweb import Context, JetWeb, Request, Router, StreamingResponse
+
+
+def test_provider_scopes(app: JetWeb, client: Client) -> None:
+    events = []
+    ids = count(1)
+
+    @app.provider(scope="app")
+    def settings() -> dict:
+        events.append("settings")
+        return {"dsn": "test"}
+
+    @app.provider
+    def session(settings: dict) -> Generator[dict, None, None]:
+        session = {"dsn": settings["dsn"], "id": next(ids)}
+        events.append(f"open {session['id']}")
+        yield session
+        events.append(f"close {session['id']}")
+
+    @app.provider(scope="transient")
+    def token(request: Request) -> str:
+        return f"{request.headers.get('Authorization')} {next(ids)}"
+
+    @app.middleware
+    def middleware(next_handler: Callable, context: Context) -> object:
+        assert "session" not in context
+        return next_handler()
+
+    @app.get("/endpoint")
+    def handle_get(session: dict, context: Context, token: str) -> dict:
+        assert context["session"] is session
+        return {"session": session, "token": token, "other_token": context["token"]}
+
+    @app.get("/unused")
+    def handle_unused() -> str:
+        return "Test response"
+
+    response = client.get("/endpoint", headers={"Authorization": "Bearer"})
+    assert response.json() == {"session": {"dsn": "test", "id": 1}, "token": "Bearer 2", "other_token": "Bearer 3"}
+    assert events == ["settings", "open 1", "close 1"]
+
+    client.get("/unused")
+    assert events == ["settings", "open 1", "close 1"]
+
+    assert client.get("/endpoint").json()["session"]["id"] == 4
+    assert events == ["settings", "open 1", "close 1", "open 4", "close 4"]
+
+
+def test_including_providers(app: JetWeb, client: Client) -> None:
+    router = Router()
+    router.add_provider("user", lambda request: {"name": request.query_params.get("name")})
+
+    @router.get("/user")
+    def get_user(user: dict) -> dict:
+        return user
+
+    app.include(router)
+    assert client.get("/user?name=john").json() == {"name": "john"}
+
+
+def test_closing_app_providers(app: JetWeb) -> None:
+    events = []
+
+    @app.provider(name="pool", scope="app")
+    def create_pool() -> Generator[str, None, None]:
+        events.append("open")
+        yield "pool"
+        events.append("close")
+
+    assert Context(providers=app.providers)["pool"] == "pool"
+    assert Context(providers=app.providers)["pool"] == "pool"
+    asyncio.run(app.asgi({"type": "lifespan"}, create_receive(), send_nothing))
+    assert events == ["open", "close"]
+
+
+def test_circular_providers(app: JetWeb) -> None:
+    app.add_provider("first", lambda second: second)
+    app.add_provider("second", lambda first: first)
+
+    with pytest.raises(RuntimeError):
+        Context(providers=app.providers).params_for(lambda first: None)
+    with pytest.raises(ValueError):
+        app.add_provider("invalid", lambda: None, scope="session")
+
+
+def test_tearing_down_after_streaming(app: JetWeb, client: Client, caplog: pytest.LogCaptureFixture) -> None:
+    @app.provider
+    def session() -> Generator[dict, None, None]:
+        session = {"open": True}
+        yield session
+        session["open"] = False
+        raise RuntimeError("Teardown error")
+
+    @app.get("/stream")
+    def stream(session: dict) -> StreamingResponse:
+        return StreamingResponse(content=(f"open={session['open']};" for _ in range(2)))
+
+    @app.get("/json")
+    def get_json(session: dict) -> dict:
+        return session
+
+    response = client.get("/stream")
+    assert response.status_code == 200
+    assert response.text == "open=True;open=True;"
+    assert client.get("/json").json() == {"open": True}
+    assert asyncio.run(request_asgi(app, "/stream")) == b"open=True;open=True;"
+    assert caplog.text.count("Request teardown failed") == 3
+
+
+def test_blocking_providers_dont_block_event_loop(app: JetWeb) -> None:
+    @app.provider
+    def session() -> Generator[str, None, None]:
+        time.sleep(0.2)
+        yield "session"
+        time.sleep(0.2)
+
+    @app.get("/async")
+    async def handle_async(session: str) -> str:
+        return session
+
+    @app.get("/sync")
+    def handle_sync(session: str) -> str:
+        return session
+
+    async def measure_delays() -> list:
+        delays = []
+        task = asyncio.gather(request_asgi(app, "/async"), request_asgi(app, "/sync"))
+        while not task.done():
+            started = time.monotonic()
+            await asyncio.sleep(0.01)
+            delays.append(time.monotonic() - started)
+        assert await task == [b"session", b"session"]
+        return delays
+
+    assert max(asyncio.run(measure_delays())) < 0.15
+
+
+async def request_asgi(app: JetWeb, endpoint: str) -> bytes:
+    async with AsyncClient(transport=ASGITransport(app=app.asgi), base_url="http://test") as client:
+        return (await client.get(endpoint)).content
+
+
+def create_receive() -> Callable:
+    messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+
+    async def receive() -> dict:
+        return next(messages)
+    return receive
+
+
+async def send_nothing(message: dict) -> None:
+    pass
@@ -1,6 +1,9 @@
-from httpx import Client
+from io import BytesIO
 
-from jetweb import JetWeb, Request
+import pytest
+from httpx import Client, WSGITransport
+
+from jetweb import HTTPException, JetWeb, Request
 
 
 def test_get_request(app: JetWeb, client: Client) -> None:
@@ -37,3 +40,88 @@ def test_post_request(app: JetWeb, client: Client) -> None:
     response = client.request(method, endpoint, content=content)
     assert response.status_code == 200
     assert response.text == "Test response"
+
+
+def test_lazy_request() -> None:
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": "/endpoint",
+        "QUERY_STRING": "aaa=bbb",
+        "HTTP_TEST_HEADER": "Test value",
+        "CONTENT_LENGTH": "9",
+        "wsgi.input": BytesIO(b"Test body"),
+    }
+
+    request = Request.from_environ(environ)
+    assert environ["wsgi.input"].tell() == 0
+    assert "Test body" not in repr(request)
+    assert environ["wsgi.input"].tell() == 0
+    assert request.headers == {"test-header": "Test value", "content-length": "9"}
+    assert environ["wsgi.input"].tell() == 0
+    assert request.query_params == {"aaa": "bbb"}
+    assert request.body == b"Test body"
+    assert request == Request.from_environ({**environ, "wsgi.input": BytesIO(b"Test body")}, lazy=False)
+
+
+def test_streaming_request_body(app: JetWeb, client: Client) -> None:
+    content = b"x" * 100
+
+    @app.post("/chunks")
+    def handle_chunks(request: Request) -> list:
+        chunk_sizes = [len(chunk) for chunk in request.iter_body(chunk_size=40)]
+        with pytest.raises(RuntimeError):
+            request.body
+        return chunk_sizes
+
+    @app.post("/file")
+    def handle_file(request: Request) -> dict:
+        return {"rolled": request.file._rolled, "body": request.file.read().decode()}
+
+    response = client.post("/chunks", content=content)
+    assert response.json() == [40, 40, 20]
+
+    app.spool_threshold = 50
+    response = client.post("/file", content=content)
+    assert response.json() == {"rolled": True, "body": content.decode()}
+
+
+def test_limiting_request_body() -> None:
+    app = JetWeb(max_body_size=10)
+
+    @app.post("/endpoint")
+    def handle_post(request: Request) -> str:
+        return request.text
+
+    @app.route("/upload", ["POST"], max_body_size=20)
+    def handle_upload(request: Request) -> str:
+        return request.text
+
+    client = Client(transport=WSGITransport(app=app), base_url="http://test")
+    assert client.post("/endpoint", content=b"x" * 10).text == "x" * 10
+    assert client.post("/endpoint", content=b"x" * 11).status_code == 413
+    assert client.post("/upload", content=b"x" * 20).text == "x" * 20
+    assert client.post("/upload", content=b"x" * 21).status_code == 413
+
+    readable = BytesIO(b"x" * 100)
+    request = Request.from_environ(
+        {"REQUEST_METHOD": "POST", "PATH_INFO": "/", "CONTENT_LENGTH": "100", "wsgi.input": readable},
+        max_body_size=10,
+    )
+    with pytest.raises(HTTPException) as exception_info:
+        request.body
+    assert exception_info.value.status == 413
+    assert readable.tell() == 0
+
+
+def test_repeated_params(app: JetWeb, client: Client) -> None:
+    @app.get("/endpoint")
+    def handle_get(request: Request) -> dict:
+        return {
+            "tag": request.query_params["TAG"],
+            "tags": request.query_params.getall("tag"),
+            "missing": request.query_params.getlist("missing"),
+            "accept": request.headers.getall("Accept"),
+        }
+
+    response = client.get("/endpoint?tag=a&Tag=b&page=1", headers={"Accept": "text/plain"})
+    assert response.json() == {"tag": "b", "tags": ["a", "b"], "missing": [], "accept": ["text/plain"]}
@@ -1,6 +1,20 @@
-from httpx import Client
+import asyncio
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Generator
 
-from jetweb import JetWeb, Response
+from httpx import ASGITransport, AsyncClient, Client, WSGITransport
+
+from jetweb import (
+    FileResponse,
+    HTTPException,
+    JetWeb,
+    Response,
+    Router,
+    Serializer,
+    SerializerRegistry,
+    StreamingResponse,
+)
 
 
 def test_text_response(app: JetWeb, client: Client) -> None:
@@ -47,3 +61,125 @@ def test_json_response(app: JetWeb, client: Client) -> None:
     assert response.json() == content
     assert response.headers == headers
     assert response.headers["Content-type"] == content_type
+
+
+def test_streaming_response(app: JetWeb, client: Client) -> None:
+    @app.get("/endpoint")
+    def handle_get() -> StreamingResponse:
+        return StreamingResponse(content=(f"Chunk {index};" for index in range(3)), content_length=24)
+
+    response = client.get("/endpoint")
+    assert response.status_code == 200
+    assert response.text == "Chunk 0;Chunk 1;Chunk 2;"
+    assert response.headers["Content-Length"] == "24"
+    assert response.headers["Content-Type"] == "application/octet-stream"
+
+
+def test_failing_streaming_response(app: JetWeb, client: Client) -> None:
+    def generate() -> Generator[bytes, None, None]:
+        raise HTTPException(status=403, content="Invalid credentials")
+        yield b"Never sent"
+
+    @app.get("/endpoint")
+    def handle_get() -> StreamingResponse:
+        return StreamingResponse(content=generate())
+
+    response = client.get("/endpoint")
+    assert response.status_code == 403
+    assert response.text == "Invalid credentials"
+
+
+def test_file_response(app: JetWeb, client: Client, tmp_path: Path) -> None:
+    path = tmp_path / "data.txt"
+    path.write_text("Test response")
+
+    @app.get("/endpoint")
+    def handle_get() -> FileResponse:
+        return FileResponse(content=path)
+
+    response = client.get("/endpoint")
+    assert response.status_code == 200
+    assert response.text == "Test response"
+    assert response.headers["Content-Length"] == "13"
+    assert response.headers["Content-Type"] == "text/plain"
+
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": "/endpoint",
+        "wsgi.input": BytesIO(),
+        "wsgi.file_wrapper": lambda file, chunk_size: ("wrapped", file.read()),
+    }
+    assert app(environ, lambda status, headers: None) == ("wrapped", b"Test response")
+
+
+def test_raw_bytes_response(app: JetWeb, client: Client) -> None:
+    @app.get("/bytearray")
+    def handle_bytearray() -> bytearray:
+        return bytearray(b"Test response")
+
+    @app.get("/memoryview")
+    def handle_memoryview() -> memoryview:
+        return memoryview(b"Test response")
+
+    for endpoint in ["/bytearray", "/memoryview"]:
+        response = client.get(endpoint)
+        assert response.content == b"Test response"
+        assert response.headers["Content-Type"] == "application/octet-stream"
+
+
+def test_negotiating_before_route_middlewares() -> None:
+    serializers = SerializerRegistry()
+    serializers.register(Serializer("text/x-pairs", lambda content: str(content)))
+    app = JetWeb(serializers=serializers)
+    router = Router("/router")
+
+    @router.middleware
+    def middleware(next_handler: Callable) -> Response:
+        response = next_handler()
+        response.headers["X-Negotiated"] = response.headers["Content-Type"]
+        return response
+
+    @router.get("/sync")
+    def handle_sync() -> dict:
+        return {"id": 1}
+
+    @router.get("/async")
+    async def handle_async() -> dict:
+        return {"id": 1}
+
+    app.include(router)
+    headers = {"Accept": "text/x-pairs"}
+    with Client(transport=WSGITransport(app=app), base_url="http://test") as client:
+        assert client.get("/router/sync", headers=headers).headers["X-Negotiated"] == "text/x-pairs"
+
+    async def request_asgi() -> str:
+        async with AsyncClient(transport=ASGITransport(app=app.asgi), base_url="http://test") as client:
+            return (await client.get("/router/async", headers=headers)).headers["X-Negotiated"]
+
+    assert asyncio.run(request_asgi()) == "text/x-pairs"
+
+
+def test_negotiating_serializer() -> None:
+    def dumps(content: dict) -> str:
+        return "\n".join(f"{key}={value}" for key, value in content.items())
+
+    serializers = SerializerRegistry()
+    serializers.register(Serializer("text/x-pairs", dumps))
+    app = JetWeb(serializers=serializers)
+
+    @app.get("/endpoint")
+    def handle_get() -> dict:
+        return {"name": "Jörg", "id": 1}
+
+    with Client(transport=WSGITransport(app=app), base_url="http://test") as client:
+        response = client.get("/endpoint")
+        assert response.headers["Content-Type"] == "application/json"
+        assert response.headers["Vary"] == "Accept"
+        assert response.text == '{"name":"Jörg","id":1}'
+
+        response = client.get("/endpoint", headers={"Accept": "text/*, application/json;q=0.5"})
+        assert response.headers["Content-Type"] == "text/x-pairs"
+        assert response.text == "name=Jörg\nid=1"
+
+        response = client.get("/endpoint", headers={"Accept": "application/xml"})
+        assert response.headers["Content-Type"] == "application/json"
@@ -0,0 +1,71 @@
+import pytest
+
+from jetweb import HTTPException
+from jetweb.converters import BaseConverter, converter
+from jetweb.routing import RouteTable
+
+
+@converter
+class HexConverter(BaseConverter):
+    pattern = r"[0-9a-f]+"
+    identifier = "hex"
+
+    @staticmethod
+    def convert(value: str) -> int:
+        return int(value, 16)
+
+
+def handler() -> None:
+    pass
+
+
+@pytest.mark.parametrize("endpoints, endpoint, expected, path_params", [
+    (["/users/me", "/users/{id:int}"], "/users/me", "/users/me", {}),
+    (["/users/{id:int}", "/users/me"], "/users/1", "/users/{id:int}", {"id": 1}),
+    (["/users/{name}", "/users/me"], "/users/me", "/users/{name}", {"name": "me"}),
+    (["/files/{path}", "/files/{name:str}"], "/files/a/b", "/files/{path}", {"path": "a/b"}),
+    (["/files/{name:str}", "/files/{path}"], "/files/a", "/files/{name:str}", {"name": "a"}),
+    (["/v{version:int}/status"], "/v2/status", "/v{version:int}/status", {"version": 2}),
+    (["/"], "/", "/", {}),
+    (["/{a:hex}/{b:str}", "/{a:hex}/x"], "/ff/x", "/{a:hex}/{b:str}", {"a": 255, "b": "x"}),
+])
+def test_finding_route(endpoints: list, endpoint: str, expected: str, path_params: dict) -> None:
+    route_table = RouteTable()
+    for route_endpoint in endpoints:
+        route_table.add_route("", route_endpoint, handler)
+
+    route, found_path_params = route_table.route_tree.find(endpoint)
+    assert route.endpoint == expected
+    assert found_path_params == path_params
+
+
+@pytest.mark.parametrize("endpoint, method, status", [
+    ("/endpoint", "POST", 405),
+    ("/endpoint/", "GET", 404),
+    ("endpoint", "GET", 404),
+    ("/non-existing-endpoint", "GET", 404),
+])
+def test_not_finding_handler(endpoint: str, method: str, status: int) -> None:
+    route_table = RouteTable()
+    route_table.add_route("", "/endpoint", handler, ["GET"])
+    route_table.add_route("", "/endpoint", handler, ["POST"])
+
+    with pytest.raises(HTTPException) as exception_info:
+        route_table.find_handler(endpoint, method)
+    assert exception_info.value.status == status
+    assert route_table.match_route(endpoint, method) == (None, {}, status)
+
+
+@pytest.mark.parametrize("endpoints, indexed", [
+    (["/health", "/api/v1/status"], ["/health", "/api/v1/status"]),
+    (["/users/{name}", "/users/me"], []),
+    (["/users/me", "/users/{name}", "/users/me"], ["/users/me"]),
+])
+def test_indexing_static_routes(endpoints: list, indexed: list) -> None:
+    route_table = RouteTable()
+    for endpoint in endpoints:
+        route_table.add_route("", endpoint, handler)
+
+    assert list(route_table.static_routes) == indexed
+    for endpoint in indexed:
+        assert route_table.find_handler(endpoint, "GET") == (handler, {})
@@ -3,6 +3,7 @@ from typing import Callable
 from httpx import Client
 
 from jetweb import HTTPException, JetWeb, Router
+from jetweb.routing import Route
 
 
 def test_handling_request(app: JetWeb, client: Client) -> None:
@@ -40,3 +41,114 @@ def test_raising_exception(app: JetWeb, client: Client) -> None:
     response = client.get("/first/second/endpoint")
     assert response.status_code == 403
     assert response.text == "Invalid credentials"
+
+
+def test_router_middlewares(app: JetWeb, client: Client) -> None:
+    calls = []
+    admin_router = Router("/admin")
+    users_router = Router("/users")
+
+    @app.middleware
+    def app_middleware(next_handler: Callable) -> object:
+        calls.append("app")
+        return next_handler()
+
+    @admin_router.middleware
+    def admin_middleware(next_handler: Callable, route: Route) -> object:
+        calls.append(f"admin {route.endpoint}")
+        return next_handler()
+
+    @users_router.middleware
+    def users_middleware(next_handler: Callable, user_id: int) -> object:
+        calls.append(f"users {user_id}")
+        return next_handler()
+
+    @users_router.get("/{user_id:int}")
+    def get_user(user_id: int) -> dict:
+        return {"id": user_id}
+
+    @admin_router.get("/stats")
+    def get_stats() -> dict:
+        return {}
+
+    @app.get("/public")
+    def get_public() -> str:
+        return "Test response"
+
+    admin_router.include(users_router)
+    app.include(admin_router)
+
+    assert client.get("/public").status_code == 200
+    assert calls == ["app"]
+
+    calls.clear()
+    assert client.get("/admin/users/1").json() == {"id": 1}
+    assert calls == ["app", "admin /admin/users/{user_id:int}", "users 1"]
+
+    calls.clear()
+    assert client.get("/admin/stats").status_code == 200
+    assert client.get("/admin/missing").status_code == 404
+    assert calls == ["app", "admin /admin/stats", "app"]
+
+
+def test_mounting_routers(app: JetWeb, client: Client) -> None:
+    calls = []
+    api_router = Router("/api")
+    users_router = Router("/users")
+    public_router = Router()
+
+    @users_router.middleware
+    def users_middleware(next_handler: Callable, route: Route) -> object:
+        calls.append(route.endpoint)
+        return next_handler()
+
+    @users_router.get("/{user_id:int}")
+    def get_user(user_id: int) -> dict:
+        return {"id": user_id}
+
+    @api_router.get("/status")
+    def get_status() -> dict:
+        return {"ok": True}
+
+    @public_router.get("/health")
+    def get_health() -> str:
+        return "OK"
+
+    api_router.include(users_router, mount=True)
+    app.include(api_router, mount=True)
+    app.include(public_router, mount=True)
+
+    @app.get("/api/users/me")
+    def get_me() -> dict:
+        return {"id": "me"}
+
+    @users_router.get("/{user_id:int}/posts")
+    def get_posts(user_id: int) -> list:
+        return [user_id]
+
+    assert list(app.route_table.mounts) == ["/api"]
+    assert list(api_router.route_table.mounts) == ["/api/users"]
+    assert [route.endpoint for route in app.route_table.routes] == ["/health", "/api/users/me"]
+
+    assert client.get("/api/users/1").json() == {"id": 1}
+    assert client.get("/api/users/2/posts").json() == [2]
+    assert client.get("/api/users/me").json() == {"id": "me"}
+    assert client.get("/api/status").json() == {"ok": True}
+    assert client.get("/health").text == "OK"
+    assert client.post("/api/users/1").status_code == 405
+    assert client.get("/api/missing").status_code == 404
+    assert calls == ["/api/users/{user_id:int}", "/api/users/{user_id:int}/posts"]
+
+
+def test_including_mounted_routers(app: JetWeb, client: Client) -> None:
+    first_router = Router("/first")
+    second_router = Router("/second")
+
+    @second_router.get("/{name}")
+    def handle_get(name: str, route: Route) -> str:
+        return f"{route.endpoint} {name}"
+
+    first_router.include(second_router, mount=True)
+    app.include(first_router)
+
+    assert client.get("/first/second/john").text == "/first/second/{name} john"
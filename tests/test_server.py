@@ -0,0 +1,269 @@
+import os
+import signal
+import socket
+import time
+from http.client import HTTPConnection
+from multiprocessing import get_context
+from typing import Callable, Generator
+
+import pytest
+
+from jetweb import FileResponse, JetWeb, Request, StreamingResponse
+from jetweb.server import EventLoopServer, PreforkServer
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port: int) -> None:
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError("Server did not start")
+
+
+@pytest.fixture
+def server_app() -> JetWeb:
+    app = JetWeb(debug=True)
+
+    @app.get("/pid")
+    def get_pid() -> str:
+        return str(os.getpid())
+
+    @app.post("/echo")
+    def echo(request: Request) -> str:
+        return request.text
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(content=iter(["a", "b", "c"]))
+
+    @app.get("/broken-stream")
+    def broken_stream() -> StreamingResponse:
+        def generate() -> Generator[str, None, None]:
+            yield "a"
+            raise ValueError("Broken stream")
+        return StreamingResponse(content=generate())
+
+    @app.get("/file")
+    def file() -> FileResponse:
+        return FileResponse(content=__file__)
+
+    @app.get("/sleep")
+    def sleep() -> str:
+        time.sleep(0.3)
+        return "Slept"
+
+    return app
+
+
+@pytest.fixture
+def port(server_app: JetWeb) -> Generator[int, None, None]:
+    server = PreforkServer(
+        server_app, host="127.0.0.1", port=get_free_port(), workers=2, max_requests=3, graceful_timeout=5
+    )
+    yield from run_server(server)
+
+
+def run_server(server: object) -> Generator[int, None, None]:
+    process = get_context("fork").Process(target=server.serve_forever, daemon=True)
+    process.start()
+    wait_for_server(server.port)
+    yield server.port
+    os.kill(process.pid, signal.SIGTERM)
+    process.join(10)
+    assert process.exitcode == 0
+
+
+@pytest.fixture
+def event_loop_port(server_app: JetWeb) -> Generator[int, None, None]:
+    server = EventLoopServer(
+        server_app,
+        host="127.0.0.1",
+        port=get_free_port(),
+        threads=2,
+        keepalive_timeout=0.5,
+        max_request_line_size=100,
+        max_headers_size=200,
+    )
+    yield from run_server(server)
+
+
+def test_keep_alive(port: int) -> None:
+    connection = HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.request("GET", "/pid")
+    first_response = connection.getresponse()
+    first_pid = first_response.read()
+    connection.request("POST", "/echo", body=b"Request body")
+    second_response = connection.getresponse()
+
+    assert first_response.status == 200
+    assert first_response.getheader("Connection") is None
+    assert second_response.status == 200
+    assert second_response.read() == b"Request body"
+
+    connection.request("GET", "/pid")
+    third_response = connection.getresponse()
+    assert third_response.read() == first_pid
+    assert third_response.getheader("Connection") == "close"
+    connection.close()
+
+
+def test_closing_connection_on_body_error(port: int) -> None:
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"GET /broken-stream HTTP/1.1\r\nHost: test\r\n\r\n")
+        data = b""
+        while chunk := sock.recv(65536):
+            data += chunk
+
+    assert data.startswith(b"HTTP/1.1 200 OK")
+    assert not data.endswith(b"0\r\n\r\n")
+
+
+def test_recycling_workers(port: int) -> None:
+    pids = set()
+    for _ in range(12):
+        connection = HTTPConnection("127.0.0.1", port, timeout=5)
+        connection.request("GET", "/pid", headers={"Connection": "close"})
+        pids.add(connection.getresponse().read())
+        connection.close()
+
+    assert len(pids) > 2
+
+
+def test_streaming_and_file_responses(port: int) -> None:
+    connection = HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.request("GET", "/stream")
+    stream_response = connection.getresponse()
+    assert stream_response.getheader("Transfer-Encoding") == "chunked"
+    assert stream_response.read() == b"abc"
+
+    connection.request("GET", "/file")
+    file_response = connection.getresponse()
+    with open(__file__, "rb") as file:
+        assert file_response.read() == file.read()
+    connection.close()
+
+
+def test_chunked_request_and_errors(port: int) -> None:
+    connection = HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.request("POST", "/echo", body=iter([b"Chunked ", b"body"]), encode_chunked=True)
+    echo_response = connection.getresponse()
+    assert echo_response.read() == b"Chunked body"
+
+    connection.request("GET", "/missing")
+    missing_response = connection.getresponse()
+    assert missing_response.status == 404
+    missing_response.read()
+    connection.close()
+
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"BROKEN\r\n\r\n")
+        assert sock.recv(1024).startswith(b"HTTP/1.1 400 Bad Request")
+
+
+def test_invalid_chunk_sizes(port: int) -> None:
+    for size in [b"-1", b"0x10", b"+a", b"1_0", b" ", b"1" * 17]:
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"POST /echo HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n" + size + b"\r\nabc\r\n0\r\n\r\n")
+            assert sock.recv(1024).startswith(b"HTTP/1.1 400 Bad Request")
+
+
+def test_reuse_port(server_app: JetWeb) -> None:
+    server = PreforkServer(server_app, host="127.0.0.1", port=get_free_port(), workers=2, reuse_port=True)
+    for port in run_server(server):
+        for _ in range(30):
+            connection = HTTPConnection("127.0.0.1", port, timeout=5)
+            connection.request("GET", "/pid", headers={"Connection": "close"})
+            assert connection.getresponse().status == 200
+            connection.close()
+
+
+def test_idle_connections_dont_block_worker(server_app: JetWeb) -> None:
+    server = PreforkServer(server_app, host="127.0.0.1", port=get_free_port(), workers=1, threads=1)
+    for port in run_server(server):
+        connections = [HTTPConnection("127.0.0.1", port, timeout=5) for _ in range(4)]
+        for _ in range(3):
+            for connection in connections:
+                connection.request("GET", "/pid")
+                assert connection.getresponse().read().isdigit()
+        for connection in connections:
+            connection.close()
+
+
+def test_write_callable() -> None:
+    def legacy_app(environ: dict, start_response: Callable) -> list[bytes]:
+        write = start_response("200 OK", [("Content-Type", "text/plain")])
+        write(b"Written ")
+        write(b"body ")
+        return [b"and iterable"]
+
+    server = EventLoopServer(legacy_app, host="127.0.0.1", port=get_free_port())
+    for port in run_server(server):
+        connection = HTTPConnection("127.0.0.1", port, timeout=5)
+        connection.request("GET", "/")
+        response = connection.getresponse()
+        assert response.getheader("Transfer-Encoding") == "chunked"
+        assert response.read() == b"Written body and iterable"
+        connection.close()
+
+
+def test_event_loop_pipelining(event_loop_port: int) -> None:
+    with socket.create_connection(("127.0.0.1", event_loop_port), timeout=5) as sock:
+        sock.sendall(
+            b"POST /echo HTTP/1.1\r\nHost: test\r\nContent-Length: 5\r\n\r\nFirst"
+            b"GET /missing HTTP/1.1\r\nHost: test\r\n\r\n"
+            b"POST /echo HTTP/1.1\r\nHost: test\r\nContent-Length: 6\r\nConnection: close\r\n\r\nSecond"
+        )
+        data = b""
+        while chunk := sock.recv(65536):
+            data += chunk
+
+    responses = data.split(b"HTTP/1.1 ")[1:]
+    assert [response[:3] for response in responses] == [b"200", b"404", b"200"]
+    assert responses[0].endswith(b"First")
+    assert responses[2].endswith(b"Second")
+
+
+def test_event_loop_keep_alive_and_idle_timeout(event_loop_port: int) -> None:
+    connection = HTTPConnection("127.0.0.1", event_loop_port, timeout=5)
+    connection.request("POST", "/echo", body=iter([b"Chunked ", b"body"]), encode_chunked=True)
+    assert connection.getresponse().read() == b"Chunked body"
+    connection.request("GET", "/stream")
+    assert connection.getresponse().read() == b"abc"
+    connection.close()
+
+    with socket.create_connection(("127.0.0.1", event_loop_port), timeout=5) as sock:
+        started = time.monotonic()
+        assert sock.recv(1024) == b""
+        assert time.monotonic() - started < 3
+
+
+def test_event_loop_thread_pool(event_loop_port: int) -> None:
+    connections = [HTTPConnection("127.0.0.1", event_loop_port, timeout=5) for _ in range(4)]
+    started = time.monotonic()
+    for connection in connections:
+        connection.request("GET", "/sleep")
+    for connection in connections:
+        assert connection.getresponse().read() == b"Slept"
+        connection.close()
+
+    assert 0.6 <= time.monotonic() - started < 1.2
+
+
+def test_event_loop_limits(event_loop_port: int) -> None:
+    for request, status in [
+        (b"GET /" + b"x" * 200 + b" HTTP/1.1\r\n\r\n", b"414"),
+        (b"GET / HTTP/1.1\r\n" + b"X-Header: value\r\n" * 20 + b"\r\n", b"431"),
+        (b"GET / HTTP/1.1\r\nContent-Length: 1\r\nTransfer-Encoding: chunked\r\n\r\n", b"400"),
+    ]:
+        with socket.create_connection(("127.0.0.1", event_loop_port), timeout=5) as sock:
+            sock.sendall(request)
+            assert sock.recv(1024)[9:12] == status
@@ -0,0 +1,110 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+from httpx import ASGITransport, AsyncClient, Client
+
+from jetweb import HTTPException, JetWeb, Request, Response
+from jetweb.middlewares import SingleFlightMiddleware, single_flight
+
+
+def request_concurrently(client: Client, endpoints: list[str]) -> list:
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        return list(executor.map(client.get, endpoints))
+
+
+def test_coalescing_requests(app: JetWeb, client: Client) -> None:
+    app.add_middleware(SingleFlightMiddleware())
+    calls = count(1)
+
+    @app.get("/report")
+    def get_report(request: Request) -> dict:
+        time.sleep(0.2)
+        return {"call": next(calls), "period": request.query_params.get("period")}
+
+    responses = request_concurrently(client, ["/report?period=day"] * 5 + ["/report?period=week"])
+    assert [response.json() for response in responses[:5]] == [{"call": 1, "period": "day"}] * 5
+    assert responses[5].json() == {"call": 2, "period": "week"}
+    assert client.get("/report?period=day").json()["call"] == 3
+
+
+def test_propagating_exceptions(app: JetWeb, client: Client) -> None:
+    app.add_middleware(SingleFlightMiddleware())
+    calls = count(1)
+
+    @app.get("/report")
+    def get_report() -> dict:
+        time.sleep(0.2)
+        raise HTTPException(status=409, content=f"Conflict {next(calls)}")
+
+    responses = request_concurrently(client, ["/report"] * 4)
+    assert [(response.status_code, response.text) for response in responses] == [(409, "Conflict 1")] * 4
+
+
+def test_not_sharing_private_responses(app: JetWeb, client: Client) -> None:
+    app.add_middleware(SingleFlightMiddleware())
+    calls = count(1)
+
+    @app.get("/profile")
+    def get_profile(request: Request) -> dict:
+        time.sleep(0.2)
+        return {"call": next(calls), "user": request.headers.get("Authorization")}
+
+    @app.get("/session")
+    def get_session() -> Response:
+        time.sleep(0.2)
+        return Response(content=str(next(calls)), headers={"Set-Cookie": "session=1"})
+
+    @app.get("/translated")
+    def get_translated(request: Request) -> Response:
+        time.sleep(0.2)
+        return Response(content=request.headers.get("Accept-Language"), headers={"Vary": "Accept-Language"})
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        responses = list(executor.map(
+            lambda user: client.get("/profile", headers={"Authorization": user}), ["alice", "bob", "alice"]
+        ))
+    assert sorted(response.json()["user"] for response in responses) == ["alice", "alice", "bob"]
+    assert all(response.json()["user"] == "alice" for response in responses[::2])
+
+    assert len({response.text for response in request_concurrently(client, ["/session"] * 3)}) == 3
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        responses = list(executor.map(
+            lambda language: client.get("/translated", headers={"Accept-Language": language}), ["en", "de", "en"]
+        ))
+    assert [response.text for response in responses] == ["en", "de", "en"]
+
+
+def test_timing_out_followers(app: JetWeb, client: Client) -> None:
+    app.add_middleware(SingleFlightMiddleware(timeout=0.05))
+    calls = count(1)
+
+    @app.get("/report")
+    def get_report() -> int:
+        time.sleep(0.2)
+        return next(calls)
+
+    responses = request_concurrently(client, ["/report"] * 3)
+    assert sorted(response.json() for response in responses) == [1, 2, 3]
+
+
+def test_coalescing_route_requests(app: JetWeb) -> None:
+    calls = count(1)
+
+    @app.get("/items/{item_id:int}")
+    @single_flight(key=lambda request: request.endpoint)
+    async def get_item(item_id: int) -> dict:
+        await asyncio.sleep(0.1)
+        return {"id": item_id, "call": next(calls)}
+
+    async def send_requests() -> list:
+        async with AsyncClient(transport=ASGITransport(app=app.asgi), base_url="http://test") as client:
+            return await asyncio.gather(*(client.get(f"/items/{index % 2}") for index in range(6)))
+
+    responses = asyncio.run(send_requests())
+    assert {(response.json()["id"], response.json()["call"]) for response in responses} in (
+        {(0, 1), (1, 2)},
+        {(0, 2), (1, 1)},
+    )